@@ -45,6 +45,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'users.middleware.CoherenceReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'secureapi.urls'
@@ -69,6 +70,11 @@ WSGI_APPLICATION = 'secureapi.wsgi.application'
 
 
 # Database
+# Connexions : DB_POOL=True active le pool de psycopg 3 (paquet `psycopg[binary,pool]`),
+# sinon les connexions sont persistantes pendant DB_CONN_MAX_AGE secondes
+# (0 = une connexion par requête). Les deux modes sont exclusifs.
+DB_POOL = os.getenv('DB_POOL') == 'True'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -77,9 +83,76 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        # Vérifie une connexion persistante avant de la réutiliser (coupure réseau, redémarrage)
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+        },
     }
 }
 
+if DB_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN', 2)),
+        'max_size': int(os.getenv('DB_POOL_MAX', 10)),
+        # Attente max (secondes) d'une connexion libre avant erreur
+        'timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+    }
+
+# Réplica en lecture (DB_REPLICA_HOST) : les vues de liste et de statistiques y
+# lisent, sauf pendant REPLICA_DELAI_COHERENCE secondes après une écriture de
+# l'utilisateur. Voir users/routers.py.
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['users.routers.RouteurReplica']
+REPLICA_DELAI_COHERENCE = int(os.getenv('REPLICA_DELAI_COHERENCE', 10))
+
+# Cache : Redis si CACHE_REDIS_URL est défini (partagé entre les workers,
+# nécessaire pour que l'invalidation soit vue de tous), sinon cache fichier
+# si CACHE_DOSSIER est défini, sinon mémoire locale du processus
+if os.getenv('CACHE_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_REDIS_URL'),
+            'KEY_PREFIX': 'secureapi',
+        }
+    }
+elif os.getenv('CACHE_DOSSIER'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DOSSIER'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Durée de vie (secondes) des réponses en cache par endpoint ; 0 désactive
+CACHE_TTL = {
+    'projets': int(os.getenv('CACHE_TTL_PROJETS', 30)),
+    'freelancer_accepte': int(os.getenv('CACHE_TTL_FREELANCER_ACCEPTE', 120)),
+    'statistiques': int(os.getenv('CACHE_TTL_STATISTIQUES', 300)),
+}
+# Durée max (secondes) pendant laquelle un seul worker recalcule une entrée expirée
+CACHE_DUREE_VERROU = int(os.getenv('CACHE_DUREE_VERROU', 5))
+
+# Totaux du tableau de bord lus dans la table CompteurStatistique (O(1)) plutôt
+# que recomptés ; STATISTIQUES_COMPTEURS=False revient à une requête d'agrégat
+STATISTIQUES_COMPTEURS = os.getenv('STATISTIQUES_COMPTEURS', 'True') == 'True'
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -99,6 +172,20 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Coût du hachage des mots de passe : 0 garde la valeur par défaut de Django.
+# Une valeur plus faible accélère la connexion ; les empreintes existantes sont
+# recalculées avec ce coût à la connexion suivante.
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', 0))
+
+PASSWORD_HASHERS = [
+    'users.hashers.PBKDF2PasswordHasherConfigurable',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -137,11 +224,23 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL')
 
+# File d'attente des emails (commande envoyer_emails)
+EMAIL_TENTATIVES_MAX = int(os.getenv('EMAIL_TENTATIVES_MAX', 5))
+EMAIL_DELAI_NOUVELLE_TENTATIVE = int(os.getenv('EMAIL_DELAI_NOUVELLE_TENTATIVE', 60))  # secondes
+EMAIL_DELAI_NOUVELLE_TENTATIVE_MAX = int(os.getenv('EMAIL_DELAI_NOUVELLE_TENTATIVE_MAX', 3600))
+EMAIL_DUREE_BAIL = int(os.getenv('EMAIL_DUREE_BAIL', 600))  # secondes de réservation d'un lot par un worker
+
 AUTH_USER_MODEL = 'users.Utilisateur'
 
 #JWT
+# JWT_SANS_ETAT=True : l'utilisateur est construit à partir des claims du jeton
+# et la ligne Utilisateur n'est chargée que si un autre attribut est lu
+JWT_SANS_ETAT = os.getenv('JWT_SANS_ETAT') == 'True'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
+        'users.authentication.JWTUtilisateurJetonAuthentication'
+        if JWT_SANS_ETAT else
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
@@ -149,6 +248,46 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Pagination par curseur (utilisée quand le client envoie `cursor` ou `page_size`)
+PAGINATION_PAGE_SIZE = int(os.getenv('PAGINATION_PAGE_SIZE', 20))
+PAGINATION_MAX_PAGE_SIZE = int(os.getenv('PAGINATION_MAX_PAGE_SIZE', 100))
+# Décalage maximal des résultats triés par pertinence (recherche)
+PAGINATION_MAX_DECALAGE = int(os.getenv('PAGINATION_MAX_DECALAGE', 1000))
+
+# Configuration de texte PostgreSQL de la recherche plein texte
+RECHERCHE_CONFIGURATION = os.getenv('RECHERCHE_CONFIGURATION', 'french')
+
+# Intervalle minimal (secondes) entre deux reconstructions des index de
+# correspondance des compétences (users/correspondance.py)
+CORRESPONDANCE_DELAI_RECONSTRUCTION = int(os.getenv('CORRESPONDANCE_DELAI_RECONSTRUCTION', 30))
+
+# Vignettes des photos de profil (users/images.py) : formats (largeur, hauteur),
+# encodage WEBP ou JPEG. Sans génération à l'envoi, la commande
+# generer_derives_photos les produit en arrière-plan.
+PHOTO_DERIVES = {
+    'avatar': (64, 64),
+    'carte': (320, 320),
+}
+PHOTO_DERIVES_FORMAT = os.getenv('PHOTO_DERIVES_FORMAT', 'WEBP')
+PHOTO_DERIVES_QUALITE = int(os.getenv('PHOTO_DERIVES_QUALITE', 80))
+PHOTO_DERIVES_A_L_ENVOI = os.getenv('PHOTO_DERIVES_A_L_ENVOI', 'True') == 'True'
+
+# Envoi des CV par blocs (users/televersements.py) : fichiers partiels hors des
+# médias, tailles en octets, durée de validité d'un envoi en secondes
+CV_TELEVERSEMENTS_DOSSIER = os.getenv('CV_TELEVERSEMENTS_DOSSIER', os.path.join(BASE_DIR, 'televersements'))
+CV_TAILLE_MAX = int(os.getenv('CV_TAILLE_MAX', 20 * 1024 * 1024))
+CV_TAILLE_BLOC_MAX = int(os.getenv('CV_TAILLE_BLOC_MAX', 2 * 1024 * 1024))
+CV_TELEVERSEMENT_DUREE = int(os.getenv('CV_TELEVERSEMENT_DUREE', 24 * 3600))
+CV_DUREE_RESERVATION_BLOC = int(os.getenv('CV_DUREE_RESERVATION_BLOC', 120))  # secondes pour recevoir un bloc
+
+# Service des médias (users/medias.py) : 'django', 'x-accel' (nginx, location
+# interne MEDIA_ACCEL_PREFIXE -> MEDIA_ROOT) ou 'x-sendfile' ; validité des URL
+# signées des CV et durée de cache des photos originales, en secondes
+MEDIA_ENVOI = os.getenv('MEDIA_ENVOI', 'django')
+MEDIA_ACCEL_PREFIXE = os.getenv('MEDIA_ACCEL_PREFIXE', '/media-interne/')
+MEDIA_CV_DUREE_URL = int(os.getenv('MEDIA_CV_DUREE_URL', 3600))
+MEDIA_DUREE_CACHE = int(os.getenv('MEDIA_DUREE_CACHE', 24 * 3600))
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -156,11 +295,26 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': True,
+    # Mise à jour de last_login à chaque connexion (un UPDATE ciblé)
+    'UPDATE_LAST_LOGIN': os.getenv('JWT_UPDATE_LAST_LOGIN') == 'True',
 }
 
 FRONTEND_URL = 'http://localhost:5173'
 
+# Schéma OpenAPI généré au déploiement (manage.py generer_schema_openapi, voir
+# users/schema.py), une fois par VERSION_APPLICATION ; SCHEMA_OPENAPI_URL : URL
+# de base de l'API écrite dans le schéma (sinon celle de la page de documentation)
+VERSION_APPLICATION = os.getenv('VERSION_APPLICATION', 'dev')
+SCHEMA_OPENAPI_DOSSIER = os.getenv('SCHEMA_OPENAPI_DOSSIER', os.path.join(BASE_DIR, 'schema_openapi'))
+SCHEMA_OPENAPI_URL = os.getenv('SCHEMA_OPENAPI_URL') or None
+
 SWAGGER_SETTINGS = {
     'LOGIN_URL':'/admin/login/',
-    'LOGOUT_URL':'/admin/logout/'
+    'LOGOUT_URL':'/admin/logout/',
+    # Swagger UI et ReDoc chargent le schéma pré-généré
+    'SPEC_URL': ('schema-json', {'format': 'json'}),
+}
+
+REDOC_SETTINGS = {
+    'SPEC_URL': ('schema-json', {'format': 'json'}),
 }
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""
+Configuration locale à deux bases SQLite pour vérifier le routage vers le réplica :
+
+    python manage.py test users.tests.RoutageReplicaTests --settings=secureapi.settings_test_replica
+
+Le réplica de test est un miroir de la base principale (connexion distincte) :
+il ne voit que les données validées, d'où l'usage de TransactionTestCase.
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_principale.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+# Le coût de hachage de production ralentirait inutilement les tests
+PASSWORD_PBKDF2_ITERATIONS = 1000
@@ -1,13 +1,16 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from users.medias import servir_cv, servir_media_public
+
+# Médias servis par users/medias.py en développement comme en production :
+# CV par URL signée uniquement, photos avec Range/ETag et cache long
+prefixe_media = settings.MEDIA_URL.strip('/')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('users.urls')),
+    path(f'{prefixe_media}/cv/<str:jeton>/', servir_cv, name='media-cv'),
+    path(f'{prefixe_media}/<path:chemin>', servir_media_public, name='media'),
 ]
-
-# Configuration pour servir les fichiers média pendant le développement
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import Utilisateur, Client, Freelancer, Administrateur, Projet, Postulation, Evaluation, Notification
+from .models import Utilisateur, Client, Freelancer, Administrateur, Projet, Postulation, Evaluation, Notification, FreelancerRatingStats, EmailSortant, JetonUtilisateur, CompteurStatistique, StatistiqueQuotidienne, Competence, TeleversementCV
 
 class UtilisateurAdmin(UserAdmin):
     list_display = ('email', 'nom_complet', 'type_utilisateur', 'is_active', 'is_staff', 'date_creation')
@@ -15,11 +15,6 @@ class UtilisateurAdmin(UserAdmin):
             'fields': ('is_active', 'is_staff', 'is_superuser', 'type_utilisateur', 'groups', 'user_permissions'),
         }),
         ('Dates importantes', {'fields': ('last_login', 'date_creation')}),
-        ('Jetons', {
-            'fields': ('jeton_verification', 'expiration_jeton_verification', 
-                      'jeton_reinitialisation', 'expiration_jeton_reinitialisation'),
-            'classes': ('collapse',)
-        }),
     )
     
     add_fieldsets = (
@@ -90,6 +85,25 @@ class EvaluationAdmin(admin.ModelAdmin):
     date_hierarchy = 'date_creation'
     ordering = ('-date_creation',)
 
+class FreelancerRatingStatsAdmin(admin.ModelAdmin):
+    list_display = ('freelancer', 'nombre_evaluations', 'moyenne_notes', 'date_mise_a_jour')
+    search_fields = ('freelancer__nom_complet',)
+    raw_id_fields = ('freelancer',)
+    readonly_fields = ('nombre_evaluations', 'somme_notes', 'moyenne_notes', 'date_mise_a_jour')
+    ordering = ('-moyenne_notes',)
+
+class CompteurStatistiqueAdmin(admin.ModelAdmin):
+    list_display = ('cle', 'valeur')
+    readonly_fields = ('valeur',)
+    ordering = ('cle',)
+
+class StatistiqueQuotidienneAdmin(admin.ModelAdmin):
+    list_display = ('jour', 'indicateur', 'valeur')
+    list_filter = ('indicateur',)
+    readonly_fields = ('valeur',)
+    date_hierarchy = 'jour'
+    ordering = ('-jour', 'indicateur')
+
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ('utilisateur', 'type_notification', 'date_creation')
     list_filter = ('type_notification', 'date_creation')
@@ -98,6 +112,33 @@ class NotificationAdmin(admin.ModelAdmin):
     date_hierarchy = 'date_creation'
     ordering = ('-date_creation',)
 
+class EmailSortantAdmin(admin.ModelAdmin):
+    list_display = ('sujet', 'statut', 'tentatives', 'prochaine_tentative', 'date_creation', 'date_envoi')
+    list_filter = ('statut',)
+    search_fields = ('sujet', 'destinataires')
+    date_hierarchy = 'date_creation'
+    ordering = ('-date_creation',)
+
+class JetonUtilisateurAdmin(admin.ModelAdmin):
+    list_display = ('utilisateur', 'objet', 'date_expiration', 'date_creation')
+    list_filter = ('objet',)
+    search_fields = ('utilisateur__email',)
+    raw_id_fields = ('utilisateur',)
+    readonly_fields = ('empreinte',)
+    ordering = ('-date_creation',)
+
+class CompetenceAdmin(admin.ModelAdmin):
+    list_display = ('nom',)
+    search_fields = ('nom',)
+    ordering = ('nom',)
+
+class TeleversementCVAdmin(admin.ModelAdmin):
+    list_display = ('nom_fichier', 'statut', 'recu', 'taille', 'date_creation', 'date_expiration')
+    list_filter = ('statut',)
+    search_fields = ('nom_fichier', 'empreinte')
+    readonly_fields = ('empreinte', 'fichier', 'recu')
+    ordering = ('-date_creation',)
+
 # Enregistrement des modèles
 admin.site.register(Utilisateur, UtilisateurAdmin)
 admin.site.register(Client, ClientAdmin)
@@ -106,4 +147,9 @@ admin.site.register(Administrateur, AdministrateurAdmin)
 admin.site.register(Projet, ProjetAdmin)
 admin.site.register(Postulation, PostulationAdmin)
 admin.site.register(Evaluation, EvaluationAdmin)
-admin.site.register(Notification, NotificationAdmin)
\ No newline at end of file
+admin.site.register(FreelancerRatingStats, FreelancerRatingStatsAdmin)
+admin.site.register(CompteurStatistique, CompteurStatistiqueAdmin)
+admin.site.register(StatistiqueQuotidienne, StatistiqueQuotidienneAdmin)
+admin.site.register(Notification, NotificationAdmin)
+admin.site.register(EmailSortant, EmailSortantAdmin)
+admin.site.register(JetonUtilisateur, JetonUtilisateurAdmin)
\ No newline at end of file
@@ -1,32 +1,51 @@
+import logging
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework import serializers
 from .models import Utilisateur
-from django.core.validators import validate_email
-from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject, empty
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+logger = logging.getLogger(__name__)
+
 class CustomTokenObtainPairSerializer(serializers.Serializer):
     email = serializers.CharField()
     password = serializers.CharField(write_only=True)
 
+    # Seules les colonnes utiles à la connexion sont chargées
+    CHAMPS_CONNEXION = ('id', 'email', 'password', 'is_active', 'type_utilisateur')
+
     def validate(self, attrs):
         email = attrs.get('email', '').strip().lower()
         password = attrs.get('password', '')
 
-        print(f"=== DEBUG BACKEND ===\nEmail reçu: {email}\nPassword reçu: {bool(password)}")  # Debug
-
-        user = Utilisateur.objects.filter(email=email).first()
-        if not user:
-            print("Utilisateur non trouvé")  # Debug
+        try:
+            user = Utilisateur.objects.only(*self.CHAMPS_CONNEXION).get(email=email)
+        except Utilisateur.DoesNotExist:
+            # Hachage factice pour que la durée de réponse ne révèle pas l'existence du compte
+            Utilisateur().set_password(password)
+            logger.info("Échec de connexion : compte inconnu")
             raise serializers.ValidationError("Identifiants incorrects")
         
+        # check_password recalcule et enregistre l'empreinte si le hasher a changé
         if not user.check_password(password):
+            logger.info("Échec de connexion : mot de passe incorrect (utilisateur %s)", user.pk)
             raise serializers.ValidationError("Identifiants incorrects")
             
         if not user.is_active:
+            logger.info("Échec de connexion : compte non activé (utilisateur %s)", user.pk)
             raise serializers.ValidationError("Compte non activé")
 
+        if api_settings.UPDATE_LAST_LOGIN:
+            Utilisateur.objects.filter(pk=user.pk).update(last_login=timezone.now())
+
         refresh = self.get_token(user)
+        logger.debug("Connexion réussie (utilisateur %s)", user.pk)
         return {
             'refresh': str(refresh),
             'access': str(refresh.access_token),
@@ -43,4 +62,82 @@ class CustomTokenObtainPairSerializer(serializers.Serializer):
         return token
       
 class CustomTokenObtainPairView(TokenObtainPairView):
-    serializer_class = CustomTokenObtainPairSerializer
\ No newline at end of file
+    serializer_class = CustomTokenObtainPairSerializer
+
+
+def charger_utilisateur(pk):
+    # Compte supprimé alors que son jeton est encore valide : 401 comme
+    # JWTAuthentication.get_user, plutôt qu'une erreur 500
+    try:
+        return Utilisateur.objects.get(pk=pk)
+    except Utilisateur.DoesNotExist:
+        raise AuthenticationFailed("Utilisateur introuvable", code='user_not_found')
+
+
+class UtilisateurJeton(SimpleLazyObject):
+    """
+    Utilisateur construit à partir des claims du jeton d'accès.
+
+    `id`, `pk` et `type_utilisateur` sont lus dans le jeton ; tout autre
+    attribut charge la ligne Utilisateur complète (une seule fois), comme
+    le request.user paresseux de Django.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        pk = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: charger_utilisateur(pk))
+        self.__dict__['_claims'] = {
+            'pk': pk,
+            'type_utilisateur': token.get('type_utilisateur'),
+        }
+
+    @property
+    def pk(self):
+        return self.__dict__['_claims']['pk']
+
+    id = pk
+
+    @property
+    def type_utilisateur(self):
+        type_utilisateur = self.__dict__['_claims']['type_utilisateur']
+        if type_utilisateur is None:
+            # Jeton émis sans le claim : on se rabat sur la ligne complète
+            return self._charger().type_utilisateur
+        return type_utilisateur
+
+    def _charger(self):
+        if self._wrapped is empty:
+            self._setup()
+        return self._wrapped
+
+    def __eq__(self, other):
+        if isinstance(other, models.Model):
+            # Même règle que Model.__eq__ : un Projet de même pk n'est pas cet utilisateur
+            return other._meta.concrete_model is Utilisateur and self.pk == other.pk
+        if isinstance(other, UtilisateurJeton):
+            return self.pk == other.pk
+        return self._charger() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __bool__(self):
+        # IsAuthenticated teste `request.user and ...` : inutile de charger la ligne
+        return True
+
+class JWTUtilisateurJetonAuthentication(JWTAuthentication):
+    """
+    Authentification JWT sans requête par appel : l'utilisateur est construit à
+    partir du jeton. Comme JWTStatelessUserAuthentication, un compte désactivé
+    reste accepté jusqu'à l'expiration de son jeton d'accès.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Le jeton ne contient pas d'identifiant utilisateur reconnaissable")
+        return UtilisateurJeton(validated_token)
@@ -0,0 +1,115 @@
+"""
+Cache des réponses des endpoints de lecture les plus sollicités.
+
+Chaque endpoint appartient à un espace de noms ('projets', 'statistiques', ...)
+dont le numéro de version fait partie de la clé : invalider un espace revient
+à incrémenter sa version (voir users/signals.py), sans parcourir les clés.
+
+Avec un réplica (users/routers.py), une lecture faite juste après une
+invalidation peut encore voir les anciennes données : pendant
+REPLICA_DELAI_COHERENCE secondes, les réponses lues sur le réplica ne sont pas
+mises en cache, sans quoi elles seraient servies sous la nouvelle version, y
+compris à l'utilisateur qui vient d'écrire.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from .routers import lecture_replica, replica_configure
+
+
+def version_espace(espace):
+    cle = f'version:{espace}'
+    version = cache.get(cle)
+    if version is None:
+        # Version initiale horodatée : un espace évincé du cache ne retombe
+        # jamais sur une ancienne version encore présente
+        cache.add(cle, time.time_ns(), timeout=None)
+        version = cache.get(cle)
+    return version
+
+
+def invalider(*espaces):
+    replica = replica_configure()
+    for espace in espaces:
+        try:
+            cache.incr(f'version:{espace}')
+        except ValueError:
+            cache.add(f'version:{espace}', time.time_ns(), timeout=None)
+        if replica:
+            cache.set(f'invalidation:{espace}', 1, getattr(settings, 'REPLICA_DELAI_COHERENCE', 10))
+
+
+def invalidation_recente(espace):
+    return cache.get(f'invalidation:{espace}') is not None
+
+
+def cle_reponse(request, espace, portee):
+    empreinte = hashlib.sha256(request.build_absolute_uri().encode()).hexdigest()[:32]
+    return f'reponse:{espace}:{version_espace(espace)}:{portee}:{empreinte}'
+
+
+def calculer_une_fois(cle, ttl, calcul):
+    """
+    Lit `cle` dans le cache ou la recalcule. Un seul processus recalcule à la
+    fois (verrou posé par cache.add, atomique) ; les autres attendent
+    brièvement le résultat au lieu de tous frapper la base en même temps.
+    """
+    valeur = cache.get(cle)
+    if valeur is not None:
+        return valeur
+
+    cle_verrou = f'{cle}:verrou'
+    verrou_pose = cache.add(cle_verrou, 1, timeout=getattr(settings, 'CACHE_DUREE_VERROU', 5))
+    if not verrou_pose:
+        echeance = time.monotonic() + getattr(settings, 'CACHE_DUREE_VERROU', 5)
+        while time.monotonic() < echeance:
+            time.sleep(0.02)
+            valeur = cache.get(cle)
+            if valeur is not None:
+                return valeur
+
+    try:
+        valeur = calcul()
+        if valeur is not None:
+            cache.set(cle, valeur, ttl)
+        return valeur
+    finally:
+        # Après une attente vaine, le verrou appartient toujours à l'autre processus
+        if verrou_pose:
+            cache.delete(cle_verrou)
+
+
+def reponse_en_cache(request, espace, calcul, par_utilisateur=False):
+    """
+    Retourne la réponse de `calcul()` (une Response DRF) en la mettant en cache.
+    La clé varie selon le rôle, ou selon l'utilisateur si `par_utilisateur`.
+    Seules les réponses 200 sont conservées.
+    """
+    ttl = getattr(settings, 'CACHE_TTL', {}).get(espace, 0)
+    if not ttl:
+        return calcul()
+    if lecture_replica.get() and invalidation_recente(espace):
+        # Le réplica n'a peut-être pas encore reçu les écritures invalidantes
+        return calcul()
+
+    if par_utilisateur:
+        portee = f'utilisateur-{request.user.pk}'
+    else:
+        portee = f'role-{request.user.type_utilisateur}'
+
+    reponse_calculee = []
+
+    def calculer_donnees():
+        reponse = calcul()
+        reponse_calculee.append(reponse)
+        return reponse.data if reponse.status_code == status.HTTP_200_OK else None
+
+    donnees = calculer_une_fois(cle_reponse(request, espace, portee), ttl, calculer_donnees)
+    if reponse_calculee:
+        return reponse_calculee[0]
+    return Response(donnees, status=status.HTTP_200_OK)
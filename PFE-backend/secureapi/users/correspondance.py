@@ -0,0 +1,196 @@
+"""
+Correspondance entre compétences des freelancers et compétences requises des projets.
+
+Les compétences sont normalisées (casse, accents, synonymes). L'index stocke,
+pour chaque compétence, un ensemble de bits sur les entités (bit i = i-ème
+entité par id croissant) : les opérations ensemblistes portent sur des entiers
+Python, calculées en C par mots de 64 bits, sans boucle par entité. Le nombre
+de compétences communes de chaque entité avec la requête est obtenu par un
+additionneur bit à bit sur ces colonnes ; les groupes (communes, taille) sont
+ensuite parcourus par score décroissant jusqu'à remplir la page.
+
+Les index sont construits à la demande et gardés en mémoire du processus ; ils
+sont reconstruits quand la version de leur espace de cache change (voir
+users/signals.py), au plus une fois par CORRESPONDANCE_DELAI_RECONSTRUCTION
+secondes : une recommandation peut donc ignorer brièvement les dernières
+modifications.
+"""
+import re
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+
+from django.conf import settings
+
+from .cache import version_espace
+
+# Longueur de Competence.nom : au-delà, la compétence est ignorée (ni liaison ni
+# correspondance) plutôt que de faire échouer l'enregistrement du profil ou du projet
+LONGUEUR_MAX_COMPETENCE = 100
+
+# Variantes courantes ramenées à une forme canonique
+SYNONYMES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'node': 'nodejs',
+    'node.js': 'nodejs',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'py': 'python',
+    'python3': 'python',
+    'drf': 'django rest framework',
+    'k8s': 'kubernetes',
+    'ml': 'machine learning',
+    'ia': 'intelligence artificielle',
+    'ai': 'intelligence artificielle',
+}
+
+
+@lru_cache(maxsize=10000)
+def normaliser_competence(nom):
+    """'  React.JS ' -> 'react', 'Développement' -> 'developpement'."""
+    nom = unicodedata.normalize('NFKD', nom).encode('ascii', 'ignore').decode()
+    nom = re.sub(r'\s+', ' ', nom).strip().lower()
+    return SYNONYMES.get(nom, nom)
+
+
+def normaliser_competences(competences):
+    """Ensemble normalisé d'une liste JSON (ou d'une chaîne séparée par des virgules)."""
+    if isinstance(competences, str):
+        competences = competences.split(',')
+    if not isinstance(competences, (list, tuple, set)):
+        return set()
+    return {
+        c for c in map(normaliser_competence, map(str, competences))
+        if c and len(c) <= LONGUEUR_MAX_COMPETENCE
+    }
+
+
+class IndexCompetences:
+    """Colonnes de bits compétence -> entités pour un ensemble d'entités (id, compétences)."""
+
+    def __init__(self, entites):
+        self.ids = []
+        self.competences_entites = []
+        membres = {}
+        tailles = {}
+        for pk, competences in sorted(entites, key=lambda entite: entite[0]):
+            competences = frozenset(normaliser_competences(competences))
+            if not competences:
+                continue
+            position = len(self.ids)
+            self.ids.append(pk)
+            self.competences_entites.append(competences)
+            for competence in competences:
+                membres.setdefault(competence, []).append(position)
+            tailles.setdefault(len(competences), []).append(position)
+
+        self.colonnes = {competence: self.bits(positions) for competence, positions in membres.items()}
+        self.par_taille = {taille: self.bits(positions) for taille, positions in tailles.items()}
+        self.positions = {pk: position for position, pk in enumerate(self.ids)}
+        self.tous = (1 << len(self.ids)) - 1
+
+    def bits(self, positions):
+        # Un OR par position recopierait l'entier à chaque fois : on passe par des octets
+        octets = bytearray(len(self.ids) // 8 + 1)
+        for position in positions:
+            octets[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(octets, 'little')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def compter(self, colonnes):
+        """Additionneur bit à bit : chiffres binaires du nombre de colonnes à 1 pour chaque entité."""
+        chiffres = []
+        for retenue in colonnes:
+            for rang, chiffre in enumerate(chiffres):
+                chiffres[rang], retenue = chiffre ^ retenue, chiffre & retenue
+                if not retenue:
+                    break
+            if retenue:
+                chiffres.append(retenue)
+        return chiffres
+
+    def egal(self, chiffres, valeur):
+        """Entités dont le compte vaut exactement `valeur`."""
+        if valeur >> len(chiffres):
+            return 0
+        masque = self.tous
+        for rang, chiffre in enumerate(chiffres):
+            masque &= chiffre if valeur >> rang & 1 else self.tous ^ chiffre
+        return masque
+
+    def meilleurs(self, competences, limite, cle, exclure=()):
+        """
+        Les `limite` entités de meilleure clé pour `competences`, les plus récentes
+        d'abord à clé égale. `cle(communes, taille_requete, taille_entite)` est un
+        tuple dont le premier élément sert de score. Retourne (pk, score, communes).
+        """
+        requete = normaliser_competences(competences)
+        colonnes = [self.colonnes[competence] for competence in requete if competence in self.colonnes]
+        taille_requete = len(requete)
+        if not colonnes:
+            return []
+
+        chiffres = self.compter(colonnes)
+        exclusion = 0
+        for pk in exclure:
+            if pk in self.positions:
+                exclusion |= 1 << self.positions[pk]
+
+        groupes = sorted(
+            (
+                (communes, taille)
+                for communes in range(1, len(colonnes) + 1)
+                for taille in self.par_taille if taille >= communes
+            ),
+            key=lambda groupe: cle(groupe[0], taille_requete, groupe[1]),
+            reverse=True,
+        )
+        egaux = {}
+        resultats = []
+        for communes, taille in groupes:
+            if communes not in egaux:
+                egaux[communes] = self.egal(chiffres, communes) & ~exclusion
+            masque = egaux[communes] & self.par_taille[taille]
+            score = cle(communes, taille_requete, taille)[0]
+            while masque and len(resultats) < limite:
+                position = masque.bit_length() - 1
+                masque ^= 1 << position
+                resultats.append((
+                    self.ids[position],
+                    score,
+                    sorted(self.competences_entites[position] & requete),
+                ))
+            if len(resultats) >= limite:
+                break
+        return resultats
+
+
+_index = {}
+_verrou = threading.Lock()
+
+
+def obtenir_index(espace, charger):
+    """
+    Index de l'espace ('correspondance_projets'...), reconstruit quand sa version
+    a changé, au plus une fois par CORRESPONDANCE_DELAI_RECONSTRUCTION secondes.
+    """
+    version = version_espace(espace)
+    delai = getattr(settings, 'CORRESPONDANCE_DELAI_RECONSTRUCTION', 30)
+    entree = _index.get(espace)
+    if entree and (entree[0] == version or time.monotonic() - entree[2] < delai):
+        return entree[1]
+    with _verrou:
+        entree = _index.get(espace)
+        if entree and (entree[0] == version or time.monotonic() - entree[2] < delai):
+            return entree[1]
+        index = IndexCompetences(charger())
+        _index[espace] = (version, index, time.monotonic())
+        return index
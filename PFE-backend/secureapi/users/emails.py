@@ -0,0 +1,117 @@
+import logging
+from datetime import timedelta
+from smtplib import SMTPDataError, SMTPRecipientsRefused, SMTPSenderRefused
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailSortant
+
+logger = logging.getLogger(__name__)
+
+
+def mettre_en_file(sujet, message, destinataires, expediteur=None):
+    """Enregistre un email dans la file d'attente au lieu de l'envoyer pendant la requête."""
+    return EmailSortant.objects.create(
+        sujet=sujet,
+        message=message,
+        destinataires=list(destinataires),
+        expediteur=expediteur if expediteur is not None else (settings.EMAIL_HOST_USER or ''),
+    )
+
+
+def delai_nouvelle_tentative(tentatives):
+    """Attente exponentielle plafonnée avant la tentative suivante."""
+    delai = settings.EMAIL_DELAI_NOUVELLE_TENTATIVE * (2 ** (tentatives - 1))
+    return timedelta(seconds=min(delai, settings.EMAIL_DELAI_NOUVELLE_TENTATIVE_MAX))
+
+
+def connexion_a_rouvrir(erreur):
+    """
+    Vrai si l'erreur laisse la connexion SMTP dans un état inconnu (coupure,
+    erreur de socket). Un refus propre à un message (destinataire, expéditeur,
+    contenu) la laisse utilisable pour les messages suivants.
+    """
+    if isinstance(erreur, (SMTPRecipientsRefused, SMTPSenderRefused, SMTPDataError)):
+        return False
+    # SMTPException dérive d'OSError
+    return isinstance(erreur, OSError)
+
+
+def reserver_lot(taille_lot):
+    """
+    Réserve un lot de messages à envoyer dans une transaction courte.
+
+    Les lignes sont verrouillées (SKIP LOCKED) le temps de les passer
+    'en_cours' avec un bail de EMAIL_DUREE_BAIL secondes : plusieurs workers
+    peuvent tourner en parallèle sans envoyer deux fois le même message, et
+    aucun verrou n'est tenu pendant les échanges SMTP.
+    """
+    maintenant = timezone.now()
+    with transaction.atomic():
+        lot = list(
+            EmailSortant.objects.select_for_update(skip_locked=True)
+            .filter(statut__in=['en_attente', 'en_cours'], prochaine_tentative__lte=maintenant)
+            .order_by('prochaine_tentative')[:taille_lot]
+        )
+        if lot:
+            EmailSortant.objects.filter(pk__in=[email.pk for email in lot]).update(
+                statut='en_cours',
+                prochaine_tentative=maintenant + timedelta(seconds=settings.EMAIL_DUREE_BAIL),
+            )
+    return lot
+
+
+def envoyer_lot(taille_lot=100):
+    """
+    Envoie un lot d'emails en attente sur une seule connexion SMTP réutilisée.
+
+    Le lot est réservé (reserver_lot), envoyé hors transaction, puis les
+    résultats sont enregistrés en une mise à jour groupée.
+    Retourne le nombre d'emails envoyés et le nombre d'échecs.
+    """
+    envoyes = echecs = 0
+    lot = reserver_lot(taille_lot)
+    if not lot:
+        return envoyes, echecs
+
+    connexion = get_connection(fail_silently=False)
+    try:
+        for email in lot:
+            message = EmailMessage(
+                email.sujet,
+                email.message,
+                email.expediteur or None,
+                email.destinataires,
+                connection=connexion,
+            )
+            try:
+                message.send()
+            except Exception as e:
+                logger.warning("Échec d'envoi de l'email %s : %s", email.pk, e)
+                if connexion_a_rouvrir(e):
+                    # Connexion inutilisable : rouverte au prochain envoi
+                    connexion.close()
+                email.tentatives += 1
+                email.derniere_erreur = str(e)
+                if email.tentatives >= settings.EMAIL_TENTATIVES_MAX:
+                    email.statut = 'echec'
+                else:
+                    email.statut = 'en_attente'
+                    email.prochaine_tentative = timezone.now() + delai_nouvelle_tentative(email.tentatives)
+                echecs += 1
+            else:
+                email.statut = 'envoye'
+                email.date_envoi = timezone.now()
+                email.derniere_erreur = ''
+                envoyes += 1
+    finally:
+        connexion.close()
+
+    EmailSortant.objects.bulk_update(
+        lot,
+        ['statut', 'tentatives', 'prochaine_tentative', 'derniere_erreur', 'date_envoi']
+    )
+    return envoyes, echecs
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class PBKDF2PasswordHasherConfigurable(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 dont le nombre d'itérations vient de PASSWORD_PBKDF2_ITERATIONS.
+
+    Même algorithme que le hasher par défaut de Django : les empreintes
+    existantes restent valides et sont recalculées de façon transparente
+    à la connexion suivante (must_update compare le nombre d'itérations).
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
@@ -0,0 +1,88 @@
+"""
+Dérivés de taille fixe des photos de profil.
+
+Les listes n'affichent que des vignettes : servir l'original (plusieurs Mo
+parfois) pour chaque ligne multiplie le volume transféré. À l'envoi (ou par la
+commande generer_derives_photos), chaque format de PHOTO_DERIVES est produit,
+recadré au centre, en WebP ou JPEG. Les fichiers sont nommés d'après
+l'empreinte de leur contenu : un même dérivé n'est stocké qu'une fois, et son
+URL peut être mise en cache sans limite côté navigateur ou CDN.
+
+Utilisateur.photo_derives mémorise {'source': <nom de l'original>, <format>: <chemin>}.
+"""
+import hashlib
+import logging
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+DOSSIER = 'photos_profil/derives'
+EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+
+
+def formats():
+    return getattr(settings, 'PHOTO_DERIVES', {'avatar': (64, 64), 'carte': (320, 320)})
+
+
+def format_image():
+    return getattr(settings, 'PHOTO_DERIVES_FORMAT', 'WEBP')
+
+
+def encoder(image, taille, format_sortie):
+    from PIL import Image, ImageOps
+
+    derive = ImageOps.fit(image, taille, Image.Resampling.LANCZOS)
+    tampon = BytesIO()
+    derive.save(tampon, format_sortie, quality=getattr(settings, 'PHOTO_DERIVES_QUALITE', 80), optimize=True)
+    return tampon.getvalue()
+
+
+def enregistrer(stockage, contenu, extension):
+    """Stocke `contenu` sous un nom dérivé de son empreinte, s'il n'existe pas déjà."""
+    empreinte = hashlib.sha256(contenu).hexdigest()
+    nom = f"{DOSSIER}/{empreinte[:2]}/{empreinte}.{extension}"
+    if not stockage.exists(nom):
+        nom = stockage.save(nom, ContentFile(contenu))
+    return nom
+
+
+def generer_derives(fichier):
+    """
+    Dérivés de l'image `fichier` (FieldFile enregistré). Si elle est illisible,
+    seule la source est notée : pas de nouvel essai, les URL restent celles de l'original.
+    """
+    # Pillow n'est chargé qu'au premier traitement d'image, pas au démarrage des workers
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    format_sortie = format_image()
+    try:
+        fichier.open('rb')
+        with Image.open(fichier) as image:
+            # Orientation EXIF des photos de téléphone, puis sans transparence pour le JPEG
+            image = ImageOps.exif_transpose(image).convert('RGB')
+            contenus = {nom: encoder(image, taille, format_sortie) for nom, taille in formats().items()}
+    except (OSError, UnidentifiedImageError, ValueError) as erreur:
+        logger.warning("Dérivés impossibles pour %s : %s", fichier.name, erreur)
+        return {'source': fichier.name}
+    finally:
+        fichier.close()
+
+    derives = {'source': fichier.name}
+    for nom, contenu in contenus.items():
+        derives[nom] = enregistrer(fichier.storage, contenu, EXTENSIONS[format_sortie])
+    return derives
+
+
+def urls_derives(photo, derives, construire_url):
+    """
+    {format: URL} pour la photo `photo` (nom de fichier). Tant que les dérivés ne
+    sont pas à jour (traitement en arrière-plan), chaque format pointe vers l'original.
+    """
+    if not photo:
+        return None
+    if derives.get('source') != photo:
+        return {nom: construire_url(photo) for nom in formats()}
+    return {nom: construire_url(derives.get(nom) or photo) for nom in formats()}
@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from users.authentication import CustomTokenObtainPairSerializer, JWTUtilisateurJetonAuthentication
+from users.models import Utilisateur
+from users.views import NotificationNonVuesCountView
+
+
+class AnnulerBenchmark(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le débit (requêtes/s) de GET /api/notifications/unread-count/ avec "
+        "l'authentification JWT classique et l'authentification sans état."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requetes', type=int, default=2000, help="Nombre de requêtes par mode")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.executer(options['requetes'])
+                raise AnnulerBenchmark()
+        except AnnulerBenchmark:
+            pass
+
+    def executer(self, nombre):
+        utilisateur = Utilisateur.objects.create_user(
+            email='benchmark-authentification@example.com',
+            password='MotDePasse123!',
+            nom_complet='Benchmark',
+            numero_telephone='44076356',
+            is_active=True,
+        )
+        jeton = CustomTokenObtainPairSerializer().get_token(utilisateur).access_token
+        factory = APIRequestFactory(SERVER_NAME='localhost')
+
+        modes = (
+            ('JWTAuthentication', JWTAuthentication),
+            ('JWTUtilisateurJetonAuthentication', JWTUtilisateurJetonAuthentication),
+        )
+        self.stdout.write(f"{'mode':<36} {'requêtes/s':>12} {'SQL/requête':>12}")
+        for nom, authentification in modes:
+            vue = NotificationNonVuesCountView.as_view(authentication_classes=[authentification])
+
+            def appeler():
+                requete = factory.get(
+                    '/api/notifications/unread-count/',
+                    HTTP_AUTHORIZATION=f'Bearer {jeton}',
+                )
+                reponse = vue(requete)
+                assert reponse.status_code == 200, reponse.data
+
+            with CaptureQueriesContext(connection) as requetes_sql:
+                appeler()
+            nombre_sql = len(requetes_sql)
+            debut = time.perf_counter()
+            for _ in range(nombre):
+                appeler()
+                # Avec DEBUG, le journal des requêtes SQL grossirait à chaque appel
+                reset_queries()
+            duree = time.perf_counter() - debut
+            self.stdout.write(f"{nom:<36} {nombre / duree:>12.0f} {nombre_sql:>12}")
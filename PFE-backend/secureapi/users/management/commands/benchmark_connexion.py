@@ -0,0 +1,64 @@
+import time
+
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from users.authentication import CustomTokenObtainPairSerializer
+from users.models import Utilisateur
+
+
+class AnnulerBenchmark(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le débit de connexion (connexions/s sur un cœur) du sérializer "
+        "CustomTokenObtainPairSerializer. L'utilisateur de test est annulé à la fin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connexions', type=int, default=20, help="Nombre de connexions mesurées")
+        parser.add_argument(
+            '--iterations-pbkdf2',
+            type=int,
+            nargs='*',
+            default=[],
+            help="Coûts PBKDF2 à comparer (par défaut : configuration courante)",
+        )
+
+    def handle(self, *args, **options):
+        configurations = options['iterations_pbkdf2'] or [None]
+        self.stdout.write(f"{'itérations':>12} {'connexions/s':>14} {'ms/connexion':>14}")
+        for iterations in configurations:
+            if iterations is None:
+                debit, duree = self.mesurer(options['connexions'])
+                iterations = get_hasher().iterations
+            else:
+                with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+                    debit, duree = self.mesurer(options['connexions'])
+            self.stdout.write(f"{iterations:>12} {debit:>14.1f} {duree * 1000:>14.1f}")
+
+    def mesurer(self, nombre):
+        try:
+            with transaction.atomic():
+                Utilisateur.objects.create_user(
+                    email='benchmark-connexion@example.com',
+                    password='MotDePasse123!',
+                    nom_complet='Benchmark',
+                    numero_telephone='44076356',
+                    is_active=True,
+                )
+                donnees = {'email': 'benchmark-connexion@example.com', 'password': 'MotDePasse123!'}
+
+                debut = time.perf_counter()
+                for _ in range(nombre):
+                    serializer = CustomTokenObtainPairSerializer(data=donnees)
+                    serializer.is_valid(raise_exception=True)
+                duree = (time.perf_counter() - debut) / nombre
+                raise AnnulerBenchmark(duree)
+        except AnnulerBenchmark as resultat:
+            duree = resultat.args[0]
+        return 1 / duree, duree
@@ -0,0 +1,134 @@
+import copy
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import RequestFactory, override_settings
+
+from users.authentication import CustomTokenObtainPairSerializer
+from users.models import Utilisateur
+
+MODES = {
+    # Une connexion ouverte puis fermée à chaque requête
+    'sans': {'CONN_MAX_AGE': 0, 'pool': None},
+    # Connexion conservée par thread entre les requêtes
+    'persistant': {'CONN_MAX_AGE': 600, 'pool': None},
+    # Pool psycopg 3 partagé entre les threads
+    'pool': {'CONN_MAX_AGE': 0, 'pool': True},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure la latence (p50/p99) de GET /api/projets/ sous charge concurrente selon la "
+        "gestion des connexions : une connexion par requête, connexions persistantes, pool "
+        "psycopg. À lancer contre un PostgreSQL local contenant des projets ; aucune donnée "
+        "n'est écrite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrence', type=int, default=8, help="Nombre de threads clients")
+        parser.add_argument('--requetes', type=int, default=200, help="Requêtes par thread et par mode")
+        parser.add_argument('--modes', default='sans,persistant,pool', help="Modes à mesurer, séparés par des virgules")
+        parser.add_argument('--email', help="Utilisateur authentifié (par défaut : le premier compte actif)")
+
+    def handle(self, *args, **options):
+        modes = options['modes'].split(',')
+        inconnus = set(modes) - set(MODES)
+        if inconnus:
+            raise CommandError(f"Modes inconnus : {', '.join(sorted(inconnus))}")
+
+        utilisateurs = Utilisateur.objects.filter(is_active=True)
+        if options['email']:
+            utilisateurs = utilisateurs.filter(email=options['email'])
+        utilisateur = utilisateurs.order_by('pk').first()
+        if utilisateur is None:
+            raise CommandError("Aucun utilisateur actif pour authentifier les requêtes.")
+        jeton = CustomTokenObtainPairSerializer().get_token(utilisateur).access_token
+        connections.close_all()
+
+        configuration = connections.settings[DEFAULT_DB_ALIAS]
+        origine = copy.deepcopy({cle: configuration.get(cle) for cle in ('CONN_MAX_AGE', 'OPTIONS')})
+
+        self.stdout.write(f"{'mode':<12} {'requêtes':>9} {'p50 (ms)':>10} {'p99 (ms)':>10} {'requêtes/s':>11}")
+        # Le cache mesurerait le cache, pas la base
+        with override_settings(CACHE_TTL={**settings.CACHE_TTL, 'projets': 0}):
+            try:
+                for mode in modes:
+                    if not self.configurer(configuration, origine, mode, options['concurrence']):
+                        continue
+                    latences, duree = self.mesurer(jeton, options['concurrence'], options['requetes'])
+                    self.stdout.write(
+                        f"{mode:<12} {len(latences):>9} {statistics.median(latences):>10.2f} "
+                        f"{statistics.quantiles(latences, n=100)[98]:>10.2f} {len(latences) / duree:>11.0f}"
+                    )
+                    self.fermer_pool()
+            finally:
+                configuration.update(origine)
+
+    def configurer(self, configuration, origine, mode, concurrence):
+        parametres = MODES[mode]
+        options = copy.deepcopy(origine['OPTIONS'] or {})
+        options.pop('pool', None)
+        if parametres['pool']:
+            if connections[DEFAULT_DB_ALIAS].vendor != 'postgresql':
+                self.stdout.write(f"{mode:<12} ignoré : le pool n'existe que pour PostgreSQL")
+                return False
+            try:
+                import psycopg_pool  # noqa: F401
+            except ImportError:
+                self.stdout.write(f"{mode:<12} ignoré : installer psycopg[binary,pool]")
+                return False
+            options['pool'] = {'min_size': concurrence, 'max_size': concurrence}
+        configuration['CONN_MAX_AGE'] = parametres['CONN_MAX_AGE']
+        configuration['OPTIONS'] = options
+        return True
+
+    def fermer_pool(self):
+        connexion = connections[DEFAULT_DB_ALIAS]
+        if hasattr(connexion, 'close_pool'):
+            connexion.close_pool()
+
+    def mesurer(self, jeton, concurrence, nombre):
+        # Le WSGIHandler émet request_started/request_finished : l'ouverture et la
+        # fermeture des connexions se passent comme sous gunicorn
+        handler = WSGIHandler()
+        factory = RequestFactory(SERVER_NAME='localhost')
+        latences = []
+        erreurs = []
+        verrou = threading.Lock()
+
+        def demarrer_reponse(statut, entetes):
+            if not statut.startswith('200'):
+                raise CommandError(f"GET /api/projets/ a répondu {statut}")
+
+        def client():
+            mesures = []
+            try:
+                for _ in range(nombre):
+                    environ = factory.get('/api/projets/', HTTP_AUTHORIZATION=f'Bearer {jeton}').environ
+                    debut = time.perf_counter()
+                    reponse = handler(environ, demarrer_reponse)
+                    b''.join(reponse)
+                    reponse.close()
+                    mesures.append((time.perf_counter() - debut) * 1000)
+            except Exception as erreur:
+                erreurs.append(erreur)
+            finally:
+                connections.close_all()
+            with verrou:
+                latences.extend(mesures)
+
+        threads = [threading.Thread(target=client) for _ in range(concurrence)]
+        debut = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if erreurs:
+            raise erreurs[0]
+        return latences, time.perf_counter() - debut
@@ -0,0 +1,64 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.correspondance import IndexCompetences, normaliser_competences
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure la construction de l'index de compétences et la latence (p50/p99) des "
+        "recommandations sur des profils synthétiques, comparées à un parcours ensembliste naïf."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entites', type=int, default=100000, help="Nombre de profils indexés")
+        parser.add_argument('--vocabulaire', type=int, default=500, help="Nombre de compétences distinctes")
+        parser.add_argument('--requetes', type=int, default=200, help="Nombre de recommandations mesurées")
+        parser.add_argument('--graine', type=int, default=0)
+
+    def handle(self, *args, **options):
+        aleatoire = random.Random(options['graine'])
+        vocabulaire = [f'competence {i}' for i in range(options['vocabulaire'])]
+        # Quelques compétences très répandues, comme dans les vraies données
+        poids = [1 / (rang + 1) for rang in range(len(vocabulaire))]
+        entites = [
+            (pk, set(aleatoire.choices(vocabulaire, poids, k=aleatoire.randint(1, 12))))
+            for pk in range(1, options['entites'] + 1)
+        ]
+        requetes = [
+            aleatoire.choices(vocabulaire, poids, k=aleatoire.randint(2, 8))
+            for _ in range(options['requetes'])
+        ]
+
+        def cle(communes, taille_requete, taille_entite):
+            return communes / taille_requete, communes / (taille_requete + taille_entite - communes)
+
+        debut = time.perf_counter()
+        index = IndexCompetences(entites)
+        self.stdout.write(f"Construction de l'index ({len(index)} profils) : {time.perf_counter() - debut:.2f} s")
+
+        def naif(competences):
+            requete = normaliser_competences(competences)
+            scores = []
+            for pk, profil in entites:
+                communes = len(requete & profil)
+                if communes:
+                    scores.append((cle(communes, len(requete), len(profil)), pk))
+            scores.sort(reverse=True)
+            return scores[:20]
+
+        self.stdout.write(f"{'méthode':<12} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+        for nom, recommander, nombre in (
+            ('bitsets', lambda competences: index.meilleurs(competences, 20, cle), len(requetes)),
+            ('naïf', naif, min(len(requetes), 20)),
+        ):
+            latences = []
+            for competences in requetes[:nombre]:
+                debut = time.perf_counter()
+                recommander(competences)
+                latences.append((time.perf_counter() - debut) * 1000)
+            p99 = statistics.quantiles(latences, n=100)[98] if len(latences) > 1 else latences[0]
+            self.stdout.write(f"{nom:<12} {statistics.median(latences):>10.2f} {p99:>10.2f}")
@@ -0,0 +1,103 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from users.models import Client, Postulation, Projet
+from users.views import ProjetListCreateView
+
+
+class AnnulerBenchmark(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure la latence de GET /api/projets/ paginé par curseur, de la première "
+        "page jusqu'à une page profonde. Les données générées sont annulées à la fin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projets', type=int, default=20000, help="Nombre de projets générés")
+        parser.add_argument('--taille-page', type=int, default=20, help="Taille de page demandée")
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100, 1000],
+                            help="Numéros de page à mesurer")
+        parser.add_argument('--repetitions', type=int, default=5, help="Mesures par page")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.executer(options)
+                raise AnnulerBenchmark()
+        except AnnulerBenchmark:
+            pass
+
+    def executer(self, options):
+        taille_page = options['taille_page']
+        pages = sorted(options['pages'])
+        nb_projets = max(options['projets'], taille_page * pages[-1] + 1)
+
+        client = Client.objects.create_user(
+            email='benchmark-pagination@example.com',
+            password='benchmark',
+            nom_complet='Benchmark',
+            numero_telephone='44076356',
+            type_utilisateur='client',
+            is_active=True,
+        )
+        self.stdout.write(f"Création de {nb_projets} projets...")
+        maintenant = timezone.now()
+        Projet.objects.bulk_create(
+            [
+                Projet(
+                    client=client,
+                    titre=f"Projet {i}",
+                    description="Benchmark",
+                    budget_min=100,
+                    budget_max=200,
+                    deadline=maintenant.date(),
+                    competences_requises=[],
+                )
+                for i in range(nb_projets)
+            ],
+            batch_size=1000,
+        )
+        # auto_now_add fixe la même date partout : on étale les dates pour
+        # reproduire un flux réel, en gardant des égalités sur une partie des lignes
+        projets = list(Projet.objects.filter(client=client).only('id'))
+        for projet in projets:
+            projet.date_creation = maintenant - timedelta(seconds=projet.pk // 2)
+        Projet.objects.bulk_update(projets, ['date_creation'], batch_size=1000)
+
+        factory = APIRequestFactory(SERVER_NAME='localhost')
+        vue = ProjetListCreateView.as_view()
+
+        def appeler(curseur):
+            parametres = {'page_size': taille_page}
+            if curseur:
+                parametres['cursor'] = curseur
+            requete = factory.get('/api/projets/', parametres)
+            force_authenticate(requete, user=client)
+            debut = time.perf_counter()
+            reponse = vue(requete)
+            duree = time.perf_counter() - debut
+            suivant = reponse.data['next']
+            curseur_suivant = suivant.split('cursor=')[1].split('&')[0] if suivant else None
+            return duree, curseur_suivant
+
+        # Parcours du flux pour récupérer le curseur de chaque page mesurée
+        curseurs = {}
+        curseur = None
+        for numero in range(1, pages[-1] + 1):
+            if numero in pages:
+                curseurs[numero] = curseur
+            _, curseur = appeler(curseur)
+
+        self.stdout.write(f"{'page':>8} {'médiane (ms)':>14} {'max (ms)':>10}")
+        for numero in pages:
+            durees = [appeler(curseurs[numero])[0] * 1000 for _ in range(options['repetitions'])]
+            self.stdout.write(f"{numero:>8} {statistics.median(durees):>14.2f} {max(durees):>10.2f}")
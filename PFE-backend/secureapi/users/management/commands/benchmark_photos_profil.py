@@ -0,0 +1,119 @@
+import json
+import random
+import tempfile
+import time
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from users.images import formats, generer_derives
+from users.models import Administrateur, Utilisateur
+from users.views import ListeUtilisateursNonAdminView
+
+
+class AnnulerBenchmark(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure les octets transférés pour afficher une page de la liste des utilisateurs "
+        "(GET /api/users/) selon l'image chargée par ligne : photo originale ou vignette "
+        "(PHOTO_DERIVES). Les utilisateurs sont annulés à la fin et les fichiers écrits "
+        "dans un dossier temporaire."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--utilisateurs', type=int, default=500, help="Nombre d'utilisateurs de la page")
+        parser.add_argument('--photos', type=int, default=50, help="Nombre de photos distinctes")
+        parser.add_argument('--largeur', type=int, default=3000, help="Largeur des photos (pixels, format 4:3)")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as dossier, override_settings(MEDIA_ROOT=dossier):
+            try:
+                with transaction.atomic():
+                    self.executer(options)
+                    raise AnnulerBenchmark()
+            except AnnulerBenchmark:
+                pass
+
+    def photo(self, largeur, graine):
+        # Bruit agrandi : se compresse comme une vraie photo, pas comme un aplat
+        hauteur = largeur * 3 // 4
+        petite = Image.frombytes('RGB', (largeur // 8, hauteur // 8), random.Random(graine).randbytes(largeur * hauteur * 3 // 64))
+        tampon = BytesIO()
+        petite.resize((largeur, hauteur), Image.Resampling.BILINEAR).save(tampon, 'JPEG', quality=90)
+        return tampon.getvalue()
+
+    def executer(self, options):
+        champ = Utilisateur._meta.get_field('photo_profil')
+        stockage = champ.storage
+
+        self.stdout.write(f"Génération de {options['photos']} photos et de leurs dérivés...")
+        sources = []
+        duree = 0
+        for i in range(options['photos']):
+            nom = stockage.save(f"{champ.upload_to}benchmark-{i}.jpg", ContentFile(self.photo(options['largeur'], i)))
+            fichier = champ.attr_class(None, champ, nom)
+            debut = time.perf_counter()
+            sources.append((nom, generer_derives(fichier)))
+            duree += time.perf_counter() - debut
+        self.stdout.write(f"Dérivés : {duree / options['photos'] * 1000:.1f} ms par photo")
+
+        # La liste est réservée aux administrateurs, et ne les inclut pas
+        administrateur = Administrateur.objects.create_user(
+            email='benchmark-photos@example.com',
+            password='benchmark',
+            nom_complet='Benchmark',
+            numero_telephone='44076356',
+            type_utilisateur='administrateur',
+            is_active=True,
+            is_staff=True,
+        )
+        Utilisateur.objects.bulk_create(
+            [
+                Utilisateur(
+                    email=f'benchmark-photos-{i}@example.com',
+                    nom_complet=f'Utilisateur {i}',
+                    numero_telephone='44076356',
+                    photo_profil=sources[i % len(sources)][0],
+                    photo_derives=sources[i % len(sources)][1],
+                )
+                for i in range(options['utilisateurs'])
+            ],
+            batch_size=1000,
+        )
+
+        requete = APIRequestFactory(SERVER_NAME='localhost').get('/api/users/')
+        force_authenticate(requete, user=administrateur)
+        reponse = ListeUtilisateursNonAdminView.as_view()(requete)
+        reponse.render()
+        lignes = json.loads(reponse.content)
+
+        tailles = {}
+
+        def octets(urls):
+            # Photos réutilisées entre utilisateurs pour abréger la génération : chaque
+            # ligne compte comme une image distincte, comme en production
+            total = 0
+            for url in filter(None, urls):
+                nom = urlsplit(url).path[len(settings.MEDIA_URL):]
+                if nom not in tailles:
+                    tailles[nom] = stockage.size(nom)
+                total += tailles[nom]
+            return total
+
+        self.stdout.write(f"{len(lignes)} utilisateurs, JSON : {len(reponse.content) / 1024:.0f} Kio")
+        self.stdout.write(f"{'images':<12} {'octets (Mio)':>13} {'par ligne (Kio)':>16}")
+        mesures = [('originales', octets(ligne['photo_profil'] for ligne in lignes))]
+        for nom in formats():
+            mesures.append((nom, octets(ligne['photo_derives'][nom] for ligne in lignes if ligne['photo_derives'])))
+        for nom, total in mesures:
+            self.stdout.write(f"{nom:<12} {total / 2 ** 20:>13.2f} {total / 1024 / len(lignes):>16.1f}")
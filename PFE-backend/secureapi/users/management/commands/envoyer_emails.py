@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.emails import envoyer_lot
+
+
+class Command(BaseCommand):
+    help = "Envoie les emails en attente de la file EmailSortant, par lots."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=100, help="Nombre d'emails par lot")
+        parser.add_argument(
+            '--boucle',
+            action='store_true',
+            help="Tourne en continu (worker) au lieu de vider la file puis s'arrêter",
+        )
+        parser.add_argument('--intervalle', type=float, default=5, help="Pause en secondes quand la file est vide")
+
+    def handle(self, *args, **options):
+        total_envoyes = total_echecs = 0
+        while True:
+            envoyes, echecs = envoyer_lot(options['taille_lot'])
+            total_envoyes += envoyes
+            total_echecs += echecs
+            if envoyes or echecs:
+                self.stdout.write(f"{envoyes} email(s) envoyé(s), {echecs} échec(s).")
+                continue
+            if not options['boucle']:
+                break
+            time.sleep(options['intervalle'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Terminé : {total_envoyes} email(s) envoyé(s), {total_echecs} échec(s)."
+        ))
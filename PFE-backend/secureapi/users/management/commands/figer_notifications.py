@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from users.models import Notification
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcule l'instantané (titre et message) des anciennes notifications qui "
+        "n'en ont pas, pour que leur lecture ne touche plus les tables ciblées."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=1000, help="Nombre de notifications par lot")
+
+    def handle(self, *args, **options):
+        taille_lot = options['taille_lot']
+        total = 0
+        dernier_id = 0
+        while True:
+            lot = list(
+                Notification.objects.filter(message_rendu='', id__gt=dernier_id)
+                .order_by('id')[:taille_lot]
+            )
+            if not lot:
+                break
+            dernier_id = lot[-1].id
+            Notification.precharger_cibles(lot)
+            for notification in lot:
+                notification.figer()
+            a_figer = [n for n in lot if n.message_rendu]
+            Notification.objects.bulk_update(a_figer, ['titre_projet', 'message_rendu'])
+            total += len(a_figer)
+
+        self.stdout.write(self.style.SUCCESS(f"{total} notification(s) figée(s)."))
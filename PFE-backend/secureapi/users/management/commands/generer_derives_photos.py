@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.models import Utilisateur
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère les vignettes (PHOTO_DERIVES) des photos de profil qui n'en ont pas encore "
+        "ou dont la photo a changé. Sert de worker quand PHOTO_DERIVES_A_L_ENVOI est désactivé, "
+        "et de rattrapage après un changement de formats."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=500, help="Nombre d'utilisateurs lus par requête")
+        parser.add_argument('--tous', action='store_true', help="Régénère aussi les dérivés à jour (nouveaux formats)")
+        parser.add_argument(
+            '--boucle',
+            action='store_true',
+            help="Tourne en continu (worker) au lieu de traiter les photos en attente puis s'arrêter",
+        )
+        parser.add_argument('--intervalle', type=float, default=30, help="Pause en secondes entre deux passes")
+
+    def handle(self, *args, **options):
+        while True:
+            traites = self.passe(options['taille_lot'], options['tous'])
+            if traites:
+                self.stdout.write(f"{traites} photo(s) traitée(s).")
+            if not options['boucle']:
+                break
+            time.sleep(options['intervalle'])
+        self.stdout.write(self.style.SUCCESS("Dérivés à jour."))
+
+    def passe(self, taille, forcer):
+        utilisateurs = (
+            Utilisateur.objects.exclude(photo_profil='').exclude(photo_profil__isnull=True)
+            .only('pk', 'photo_profil', 'photo_derives').order_by('pk')
+        )
+        traites = 0
+        for utilisateur in utilisateurs.iterator(chunk_size=taille):
+            if utilisateur.mettre_a_jour_derives(forcer=forcer):
+                traites += 1
+        return traites
@@ -0,0 +1,32 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.schema import FORMATS, chemin, ecrire, generer
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère le schéma OpenAPI (JSON et YAML) de la version VERSION_APPLICATION dans "
+        "SCHEMA_OPENAPI_DOSSIER. À lancer au déploiement : rien n'est fait si le schéma de "
+        "cette version existe déjà."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--forcer', action='store_true', help="Régénère même si le schéma de la version existe")
+
+    def handle(self, *args, **options):
+        version = settings.VERSION_APPLICATION
+        if not options['forcer'] and all(os.path.exists(chemin(format_schema)) for format_schema in FORMATS):
+            self.stdout.write(f"Schéma OpenAPI de la version {version} déjà généré.")
+            return
+
+        debut = time.perf_counter()
+        contenus = generer()
+        duree = time.perf_counter() - debut
+        ecrire(contenus)
+        for format_schema, contenu in contenus.items():
+            self.stdout.write(f"{chemin(format_schema)} : {len(contenu) / 1024:.0f} Kio")
+        self.stdout.write(self.style.SUCCESS(f"Schéma OpenAPI de la version {version} généré en {duree * 1000:.0f} ms."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import JetonUtilisateur
+
+
+class Command(BaseCommand):
+    help = "Supprime par lots les jetons de vérification et de réinitialisation expirés."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=5000, help="Nombre de jetons supprimés par requête")
+
+    def handle(self, *args, **options):
+        maintenant = timezone.now()
+        expires = JetonUtilisateur.objects.filter(date_expiration__lte=maintenant)
+        total = 0
+        # Suppression par lots de clés primaires pour ne pas verrouiller la table d'un coup
+        while True:
+            ids = list(expires.values_list('pk', flat=True)[:options['taille_lot']])
+            if not ids:
+                break
+            supprimes, _ = JetonUtilisateur.objects.filter(pk__in=ids).delete()
+            total += supprimes
+
+        self.stdout.write(self.style.SUCCESS(f"{total} jeton(s) expiré(s) supprimé(s)."))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import Freelancer, TeleversementCV
+from users.televersements import supprimer_partiel
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime les envois de CV expirés : fichiers partiels des envois inachevés, et "
+        "fichiers des envois terminés jamais utilisés s'ils ne sont référencés nulle part."
+    )
+
+    def handle(self, *args, **options):
+        maintenant = timezone.now()
+        expires = TeleversementCV.objects.filter(date_expiration__lte=maintenant)
+        stockage = TeleversementCV._meta.get_field('fichier').storage
+        fichiers = 0
+        for televersement in expires.iterator():
+            supprimer_partiel(televersement)
+            nom = televersement.fichier.name
+            # Stockage dédoublonné : le fichier peut être partagé avec un profil ou un autre envoi
+            if nom and not (
+                Freelancer.objects.filter(cv=nom).exists()
+                or TeleversementCV.objects.filter(fichier=nom, date_expiration__gt=maintenant).exists()
+            ):
+                stockage.delete(nom)
+                fichiers += 1
+        supprimes, _ = expires.delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{supprimes} envoi(s) expiré(s) supprimé(s), {fichiers} fichier(s) libéré(s)."
+        ))
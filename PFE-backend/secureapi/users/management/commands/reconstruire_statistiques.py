@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from users.models import CompteurStatistique, Postulation, Projet, StatistiqueQuotidienne, Utilisateur
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruit les compteurs du tableau de bord et les cumuls quotidiens à partir "
+        "des tables sources. Les acceptations sont datées par la date de postulation."
+    )
+
+    def handle(self, *args, **options):
+        compteurs = [
+            CompteurStatistique(cle=f"utilisateurs:{ligne['type_utilisateur']}", valeur=ligne['n'])
+            for ligne in Utilisateur.objects.order_by().values('type_utilisateur').annotate(n=Count('pk'))
+        ]
+        compteurs.append(CompteurStatistique(cle='projets', valeur=Projet.objects.count()))
+
+        sources = (
+            ('inscriptions', Utilisateur.objects.all(), 'date_creation'),
+            ('projets', Projet.objects.all(), 'date_creation'),
+            ('postulations', Postulation.objects.all(), 'date_postulation'),
+            ('acceptations', Postulation.objects.filter(statut='accepte'), 'date_postulation'),
+        )
+        cumuls = []
+        for indicateur, queryset, champ_date in sources:
+            lignes = queryset.order_by().annotate(jour=TruncDate(champ_date)).values('jour').annotate(n=Count('pk'))
+            cumuls.extend(
+                StatistiqueQuotidienne(indicateur=indicateur, jour=ligne['jour'], valeur=ligne['n'])
+                for ligne in lignes
+            )
+
+        with transaction.atomic():
+            CompteurStatistique.objects.all().delete()
+            CompteurStatistique.objects.bulk_create(compteurs)
+            StatistiqueQuotidienne.objects.all().delete()
+            StatistiqueQuotidienne.objects.bulk_create(cumuls, batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(compteurs)} compteur(s) et {len(cumuls)} cumul(s) quotidien(s) reconstruits."
+        ))
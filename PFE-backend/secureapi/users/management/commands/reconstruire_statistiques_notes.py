@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Avg, Count, Sum
+
+from users.models import Evaluation, FreelancerRatingStats
+
+
+class Command(BaseCommand):
+    help = "Reconstruit en masse la table FreelancerRatingStats à partir des évaluations."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=1000, help="Taille des lots d'insertion")
+
+    def handle(self, *args, **options):
+        agregats = Evaluation.objects.order_by().values('freelancer').annotate(
+            nombre=Count('id'),
+            somme=Sum('note'),
+            moyenne=Avg('note'),
+        )
+
+        total = 0
+        with transaction.atomic():
+            FreelancerRatingStats.objects.all().delete()
+            lot = []
+            for ligne in agregats.iterator(chunk_size=options['taille_lot']):
+                lot.append(FreelancerRatingStats(
+                    freelancer_id=ligne['freelancer'],
+                    nombre_evaluations=ligne['nombre'],
+                    somme_notes=ligne['somme'],
+                    moyenne_notes=ligne['moyenne'],
+                ))
+                if len(lot) >= options['taille_lot']:
+                    FreelancerRatingStats.objects.bulk_create(lot)
+                    total += len(lot)
+                    lot = []
+            FreelancerRatingStats.objects.bulk_create(lot)
+            total += len(lot)
+
+        self.stdout.write(self.style.SUCCESS(f"{total} statistique(s) reconstruite(s)."))
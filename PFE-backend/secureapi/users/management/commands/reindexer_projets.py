@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from users.models import Projet
+from users.recherche import vecteur_recherche_projet
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule par lots le vecteur de recherche plein texte des projets "
+        "(après un changement de RECHERCHE_CONFIGURATION ou des mises à jour en masse)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=5000, help="Nombre de projets par UPDATE")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("La recherche plein texte n'est indexée que sous PostgreSQL.")
+
+        taille = options['taille_lot']
+        dernier_id = 0
+        total = 0
+        while True:
+            ids = list(
+                Projet.objects.filter(pk__gt=dernier_id).order_by('pk').values_list('pk', flat=True)[:taille]
+            )
+            if not ids:
+                break
+            total += Projet.objects.filter(pk__in=ids).update(vecteur_recherche=vecteur_recherche_projet())
+            dernier_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"{total} projet(s) réindexé(s)."))
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.correspondance import normaliser_competences
+from users.models import Competence, Freelancer, FreelancerCompetence, Projet, ProjetCompetence
+
+# (modèle, champ JSON, table de liaison, champ de l'entité dans la liaison)
+CIBLES = (
+    (Projet, 'competences_requises', ProjetCompetence, 'projet'),
+    (Freelancer, 'competences', FreelancerCompetence, 'freelancer'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruit par lots les liaisons compétences normalisées des projets et des "
+        "freelancers à partir des listes JSON (après un import en masse, un update() qui "
+        "contourne save() ou une modification des synonymes)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=2000, help="Nombre d'entités par transaction")
+        parser.add_argument(
+            '--purger', action='store_true',
+            help="Supprimer ensuite les compétences qui ne sont plus liées à rien (hors trafic d'écriture)"
+        )
+
+    def handle(self, *args, **options):
+        taille = options['taille_lot']
+        for modele, champ_json, liaison, champ_entite in CIBLES:
+            total = self.synchroniser(modele, champ_json, liaison, champ_entite, taille)
+            self.stdout.write(f"{modele._meta.verbose_name_plural} : {total} liaison(s)")
+
+        if options['purger']:
+            orphelines, _ = Competence.objects.filter(projets__isnull=True, freelancers__isnull=True).delete()
+            self.stdout.write(f"{orphelines} compétence(s) orpheline(s) supprimée(s)")
+        self.stdout.write(self.style.SUCCESS("Synchronisation terminée."))
+
+    def synchroniser(self, modele, champ_json, liaison, champ_entite, taille):
+        dernier_id = 0
+        total = 0
+        while True:
+            lot = list(
+                modele.objects.filter(pk__gt=dernier_id).order_by('pk').values_list('pk', champ_json)[:taille]
+            )
+            if not lot:
+                return total
+            noms = {pk: normaliser_competences(competences) for pk, competences in lot}
+            ids = dict(
+                Competence.objects.obtenir(set().union(*noms.values())).values_list('nom', 'pk')
+            )
+            liaisons = [
+                liaison(**{f'{champ_entite}_id': pk, 'competence_id': ids[nom]})
+                for pk, competences in noms.items()
+                for nom in competences
+            ]
+            with transaction.atomic():
+                liaison.objects.filter(**{f'{champ_entite}_id__in': noms}).delete()
+                liaison.objects.bulk_create(liaisons)
+            total += len(liaisons)
+            dernier_id = lot[-1][0]
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery
+
+from users.models import Postulation, Projet
+
+
+class Command(BaseCommand):
+    help = (
+        "Remplit Projet.postulation_acceptee à partir des postulations au statut "
+        "'accepte', ou vérifie seulement la cohérence avec --verifier."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verifier',
+            action='store_true',
+            help="N'écrit rien : signale les projets incohérents et échoue s'il y en a",
+        )
+
+    def handle(self, *args, **options):
+        # Postulation acceptée de référence : la plus ancienne si plusieurs existent
+        postulation_acceptee = Postulation.objects.filter(
+            projet=OuterRef('pk'),
+            statut='accepte'
+        ).order_by('date_postulation', 'pk').values('pk')[:1]
+
+        incoherents = Projet.objects.annotate(
+            attendue=Subquery(postulation_acceptee)
+        ).filter(
+            Q(attendue__isnull=True, postulation_acceptee__isnull=False)
+            | Q(attendue__isnull=False, postulation_acceptee__isnull=True)
+            | ~Q(attendue=F('postulation_acceptee'))
+        )
+
+        if options['verifier']:
+            ids = list(incoherents.values_list('pk', flat=True)[:20])
+            total = incoherents.count()
+            if total:
+                raise CommandError(
+                    f"{total} projet(s) incohérent(s), par exemple : {', '.join(map(str, ids))}"
+                )
+            self.stdout.write(self.style.SUCCESS("Tous les projets sont cohérents."))
+            return
+
+        with transaction.atomic():
+            total = Projet.objects.filter(
+                pk__in=incoherents.values('pk')
+            ).update(postulation_acceptee=Subquery(postulation_acceptee))
+        self.stdout.write(self.style.SUCCESS(f"{total} projet(s) mis à jour."))
@@ -0,0 +1,186 @@
+"""
+Service des fichiers médias (photos et CV), en développement comme en production.
+
+- Photos (photos_profil/) : publiques, servies avec ETag, Last-Modified et
+  requêtes partielles (Range). Les dérivés adressés par contenu
+  (photos_profil/derives/, voir users/images.py) ne changent jamais : ils sont
+  marqués `immutable` pour un an.
+- CV (cvs_freelancers/) : jamais servis par leur chemin. Les vues autorisées
+  (client qui reçoit la candidature, freelancer lui-même) renvoient une URL
+  signée qui expire après MEDIA_CV_DUREE_URL secondes.
+
+MEDIA_ENVOI choisit qui envoie les octets : 'django' (FileResponse, que
+gunicorn transmet par sendfile), 'x-accel' (nginx : location interne
+MEDIA_ACCEL_PREFIXE pointant sur MEDIA_ROOT) ou 'x-sendfile' (Apache,
+lighttpd). Dans les deux derniers cas, Django ne fait qu'autoriser la requête,
+et le serveur web gère lui-même Range et les requêtes conditionnelles.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+from django.utils.http import http_date, parse_etags
+
+SEL_CV = 'users.medias.cv'
+DOSSIER_CV = 'cvs_freelancers/'
+DOSSIERS_PUBLICS = ('photos_profil/',)
+DOSSIER_IMMUABLE = 'photos_profil/derives/'
+EMPREINTE = re.compile(r'([0-9a-f]{64})\.\w+$')
+PLAGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def url_cv_signee(nom, request=None):
+    """URL temporaire du CV `nom`, à ne remettre qu'aux utilisateurs autorisés à le lire."""
+    if not nom:
+        return None
+    url = reverse('media-cv', kwargs={'jeton': signing.dumps(nom, salt=SEL_CV, compress=True)})
+    return request.build_absolute_uri(url) if request else url
+
+
+def lire_jeton_cv(jeton):
+    try:
+        return signing.loads(jeton, salt=SEL_CV, max_age=settings.MEDIA_CV_DUREE_URL)
+    except signing.BadSignature:
+        # SignatureExpired en dérive : lien expiré ou falsifié, même réponse
+        raise Http404
+
+
+class Tranche:
+    """
+    Fichier limité à `longueur` octets depuis la position courante. Garde
+    fileno() : le file_wrapper de gunicorn l'envoie par sendfile en s'arrêtant
+    au Content-Length.
+    """
+
+    def __init__(self, fichier, longueur):
+        self.fichier = fichier
+        self.restant = longueur
+        self.name = fichier.name
+
+    def read(self, taille=-1):
+        if taille < 0 or taille > self.restant:
+            taille = self.restant
+        donnees = self.fichier.read(taille)
+        self.restant -= len(donnees)
+        return donnees
+
+    def fileno(self):
+        return self.fichier.fileno()
+
+    def close(self):
+        self.fichier.close()
+
+
+def plage_demandee(entete, taille):
+    """(début, fin incluse) d'un en-tête Range à plage unique ; None pour tout le fichier, False si insatisfiable."""
+    correspondance = PLAGE.match(entete or '')
+    if not correspondance or correspondance.groups() == ('', ''):
+        return None
+    debut, fin = correspondance.groups()
+    if debut == '':
+        # bytes=-N : les N derniers octets
+        debut, fin = max(taille - int(fin), 0), taille - 1
+    else:
+        debut, fin = int(debut), min(int(fin), taille - 1) if fin else taille - 1
+    if debut >= taille or debut > fin:
+        return False
+    return debut, fin
+
+
+def etag(nom, etat):
+    # Le nom des fichiers adressés par contenu est déjà leur empreinte
+    correspondance = EMPREINTE.search(nom)
+    if correspondance:
+        return f'"{correspondance.group(1)}"'
+    return f'"{etat.st_size:x}-{etat.st_mtime_ns:x}"'
+
+
+def ajouter_entetes(reponse, entetes):
+    for cle, valeur in entetes.items():
+        reponse[cle] = valeur
+    return reponse
+
+
+def servir(request, nom, cache_control):
+    """Réponse pour le fichier `nom` du stockage des médias (chemin déjà autorisé)."""
+    try:
+        chemin = default_storage.path(nom)
+        etat = os.stat(chemin)
+    except (OSError, ValueError, NotImplementedError):
+        # ValueError : chemin hors de MEDIA_ROOT (../)
+        raise Http404
+
+    entetes = {
+        'ETag': etag(nom, etat),
+        'Last-Modified': http_date(etat.st_mtime),
+        'Cache-Control': cache_control,
+        'Accept-Ranges': 'bytes',
+    }
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (entetes['ETag'] in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        reponse = HttpResponseNotModified()
+        ajouter_entetes(reponse, entetes)
+        return reponse
+
+    envoi = getattr(settings, 'MEDIA_ENVOI', 'django')
+    if envoi in ('x-accel', 'x-sendfile'):
+        # Le serveur web lit le fichier, gère Range et If-Modified-Since
+        reponse = HttpResponse(content_type=mimetypes.guess_type(nom)[0] or 'application/octet-stream')
+        if envoi == 'x-accel':
+            reponse['X-Accel-Redirect'] = quote(settings.MEDIA_ACCEL_PREFIXE + nom)
+        else:
+            reponse['X-Sendfile'] = chemin
+        ajouter_entetes(reponse, entetes)
+        return reponse
+
+    plage = None
+    if request.method == 'GET' and (
+        'If-Range' not in request.headers or request.headers['If-Range'] == entetes['ETag']
+    ):
+        plage = plage_demandee(request.headers.get('Range'), etat.st_size)
+    if plage is False:
+        reponse = HttpResponse(status=416)
+        reponse['Content-Range'] = f'bytes */{etat.st_size}'
+        return reponse
+
+    fichier = open(chemin, 'rb')
+    if plage is None:
+        reponse = FileResponse(fichier)
+    else:
+        debut, fin = plage
+        fichier.seek(debut)
+        reponse = FileResponse(Tranche(fichier, fin - debut + 1), status=206)
+        reponse['Content-Length'] = fin - debut + 1
+        reponse['Content-Range'] = f'bytes {debut}-{fin}/{etat.st_size}'
+    ajouter_entetes(reponse, entetes)
+    return reponse
+
+
+@require_safe
+def servir_media_public(request, chemin):
+    # photos_profil/../cvs_freelancers/... ne doit pas contourner la signature des CV
+    chemin = posixpath.normpath(chemin)
+    if not chemin.startswith(DOSSIERS_PUBLICS):
+        raise Http404
+    if chemin.startswith(DOSSIER_IMMUABLE):
+        cache_control = 'public, max-age=31536000, immutable'
+    else:
+        cache_control = f'public, max-age={settings.MEDIA_DUREE_CACHE}'
+    return servir(request, chemin, cache_control)
+
+
+@require_safe
+def servir_cv(request, jeton):
+    nom = lire_jeton_cv(jeton)
+    if not nom.startswith(DOSSIER_CV):
+        raise Http404
+    # Navigateur seulement, jamais un cache partagé, et pas au-delà de la validité du lien
+    return servir(request, nom, f'private, max-age={settings.MEDIA_CV_DUREE_URL}')
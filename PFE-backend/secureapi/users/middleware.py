@@ -0,0 +1,22 @@
+from rest_framework import permissions
+
+from .routers import marquer_ecriture, replica_configure
+
+
+class CoherenceReplicaMiddleware:
+    """
+    Après une écriture réussie, les lectures de l'utilisateur restent sur la base
+    principale le temps que le réplica rattrape son retard (voir users/routers.py).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reponse = self.get_response(request)
+        if request.method not in permissions.SAFE_METHODS and reponse.status_code < 400 and replica_configure():
+            # DRF recopie l'utilisateur authentifié par JWT sur la requête Django
+            utilisateur = getattr(request, 'user', None)
+            if utilisateur is not None and utilisateur.is_authenticated:
+                marquer_ecriture(utilisateur)
+        return reponse
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-18 10:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def remplir_postulation_acceptee(apps, schema_editor):
+    """Renseigne le projet des postulations déjà acceptées (la plus ancienne si plusieurs)."""
+    Projet = apps.get_model('users', 'Projet')
+    Postulation = apps.get_model('users', 'Postulation')
+
+    postulation_acceptee = Postulation.objects.filter(
+        projet=OuterRef('pk'),
+        statut='accepte'
+    ).order_by('date_postulation', 'pk').values('pk')[:1]
+    Projet.objects.filter(
+        postulations__statut='accepte'
+    ).update(postulation_acceptee=Subquery(postulation_acceptee))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0017_projet_projet_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projet',
+            name='postulation_acceptee',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.postulation', verbose_name='Postulation acceptée'),
+        ),
+        migrations.AddIndex(
+            model_name='projet',
+            index=models.Index(condition=models.Q(('postulation_acceptee__isnull', True)), fields=['-date_creation', '-id'], name='projet_ouvert_date_id_idx'),
+        ),
+        migrations.RunPython(remplir_postulation_acceptee, migrations.RunPython.noop),
+    ]
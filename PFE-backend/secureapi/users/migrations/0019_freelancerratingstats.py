@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 11:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def initialiser_statistiques_notes(apps, schema_editor):
+    """Calcule les statistiques des freelancers déjà évalués."""
+    Evaluation = apps.get_model('users', 'Evaluation')
+    FreelancerRatingStats = apps.get_model('users', 'FreelancerRatingStats')
+
+    agregats = Evaluation.objects.order_by().values('freelancer').annotate(
+        nombre=Count('id'),
+        somme=Sum('note'),
+        moyenne=Avg('note'),
+    )
+    FreelancerRatingStats.objects.bulk_create(
+        [
+            FreelancerRatingStats(
+                freelancer_id=ligne['freelancer'],
+                nombre_evaluations=ligne['nombre'],
+                somme_notes=ligne['somme'],
+                moyenne_notes=ligne['moyenne'],
+            )
+            for ligne in agregats
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0018_projet_postulation_acceptee'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FreelancerRatingStats',
+            fields=[
+                ('freelancer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistiques_notes', serialize=False, to='users.freelancer')),
+                ('nombre_evaluations', models.PositiveIntegerField(default=0)),
+                ('somme_notes', models.PositiveIntegerField(default=0)),
+                ('moyenne_notes', models.FloatField(default=0)),
+                ('date_mise_a_jour', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Statistiques des notes',
+                'verbose_name_plural': 'Statistiques des notes',
+            },
+        ),
+        migrations.RunPython(initialiser_statistiques_notes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0019_freelancerratingstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='message_rendu',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='titre_projet',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
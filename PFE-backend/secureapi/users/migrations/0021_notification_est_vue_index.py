@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('users', '0020_notification_instantane'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='est_vue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['utilisateur', '-date_creation', '-id'], name='notif_utilisateur_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('est_vue', False)), fields=['utilisateur'], name='notif_non_vue_idx'),
+        ),
+    ]
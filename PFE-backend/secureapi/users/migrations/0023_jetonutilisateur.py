@@ -0,0 +1,76 @@
+# Generated by Django 5.2 on 2026-10-18 16:15
+
+import hashlib
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def migrer_jetons(apps, schema_editor):
+    """Reprend les jetons encore valides sous forme d'empreinte avant de supprimer les colonnes."""
+    Utilisateur = apps.get_model('users', 'Utilisateur')
+    JetonUtilisateur = apps.get_model('users', 'JetonUtilisateur')
+    correspondances = (
+        ('verification', 'jeton_verification', 'expiration_jeton_verification'),
+        ('reinitialisation', 'jeton_reinitialisation', 'expiration_jeton_reinitialisation'),
+    )
+    for objet, champ_jeton, champ_expiration in correspondances:
+        lignes = Utilisateur.objects.filter(
+            **{f'{champ_jeton}__isnull': False, f'{champ_expiration}__isnull': False}
+        ).exclude(**{champ_jeton: ''}).values_list('pk', champ_jeton, champ_expiration)
+        JetonUtilisateur.objects.bulk_create(
+            [
+                JetonUtilisateur(
+                    utilisateur_id=pk,
+                    objet=objet,
+                    empreinte=hashlib.sha256(jeton.encode()).hexdigest(),
+                    date_expiration=expiration,
+                )
+                for pk, jeton, expiration in lignes.iterator()
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0022_emailsortant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JetonUtilisateur',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('objet', models.CharField(choices=[('verification', "Vérification de l'email"), ('reinitialisation', 'Réinitialisation du mot de passe')], max_length=20)),
+                ('empreinte', models.CharField(max_length=64, unique=True)),
+                ('date_expiration', models.DateTimeField(db_index=True)),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('utilisateur', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jetons', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Jeton',
+                'verbose_name_plural': 'Jetons',
+            },
+        ),
+        migrations.RunPython(migrer_jetons, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='utilisateur',
+            name='expiration_jeton_reinitialisation',
+        ),
+        migrations.RemoveField(
+            model_name='utilisateur',
+            name='expiration_jeton_verification',
+        ),
+        migrations.RemoveField(
+            model_name='utilisateur',
+            name='jeton_reinitialisation',
+        ),
+        migrations.RemoveField(
+            model_name='utilisateur',
+            name='jeton_verification',
+        ),
+    ]
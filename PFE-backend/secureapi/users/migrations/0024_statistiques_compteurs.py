@@ -0,0 +1,70 @@
+# Generated by Django 5.2 on 2026-10-18 16:22
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def initialiser_statistiques(apps, schema_editor):
+    """Calcule les compteurs et les cumuls quotidiens à partir des données existantes."""
+    Utilisateur = apps.get_model('users', 'Utilisateur')
+    Projet = apps.get_model('users', 'Projet')
+    Postulation = apps.get_model('users', 'Postulation')
+    CompteurStatistique = apps.get_model('users', 'CompteurStatistique')
+    StatistiqueQuotidienne = apps.get_model('users', 'StatistiqueQuotidienne')
+
+    compteurs = [
+        CompteurStatistique(cle=f"utilisateurs:{ligne['type_utilisateur']}", valeur=ligne['n'])
+        for ligne in Utilisateur.objects.order_by().values('type_utilisateur').annotate(n=Count('pk'))
+    ]
+    compteurs.append(CompteurStatistique(cle='projets', valeur=Projet.objects.count()))
+    CompteurStatistique.objects.bulk_create(compteurs)
+
+    sources = (
+        ('inscriptions', Utilisateur.objects.all(), 'date_creation'),
+        ('projets', Projet.objects.all(), 'date_creation'),
+        ('postulations', Postulation.objects.all(), 'date_postulation'),
+        ('acceptations', Postulation.objects.filter(statut='accepte'), 'date_postulation'),
+    )
+    for indicateur, queryset, champ_date in sources:
+        lignes = queryset.order_by().annotate(jour=TruncDate(champ_date)).values('jour').annotate(n=Count('pk'))
+        StatistiqueQuotidienne.objects.bulk_create(
+            [StatistiqueQuotidienne(indicateur=indicateur, jour=ligne['jour'], valeur=ligne['n']) for ligne in lignes],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0023_jetonutilisateur'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompteurStatistique',
+            fields=[
+                ('cle', models.CharField(max_length=30, primary_key=True, serialize=False)),
+                ('valeur', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Compteur statistique',
+                'verbose_name_plural': 'Compteurs statistiques',
+            },
+        ),
+        migrations.CreateModel(
+            name='StatistiqueQuotidienne',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('indicateur', models.CharField(choices=[('inscriptions', 'Inscriptions'), ('projets', 'Projets publiés'), ('postulations', 'Postulations'), ('acceptations', 'Postulations acceptées')], max_length=20)),
+                ('jour', models.DateField()),
+                ('valeur', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Statistique quotidienne',
+                'verbose_name_plural': 'Statistiques quotidiennes',
+                'constraints': [models.UniqueConstraint(fields=('indicateur', 'jour'), name='statistique_indicateur_jour_unique')],
+            },
+        ),
+        migrations.RunPython(initialiser_statistiques, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 16:23
+
+from django.db import migrations, models
+
+
+# Recherche par préfixe d'email (email__istartswith => UPPER(email) LIKE 'X%') :
+# l'index fonctionnel avec varchar_pattern_ops n'existe que sous PostgreSQL
+def creer_index_prefixe_email(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS utilisateur_email_prefixe_idx '
+            'ON users_utilisateur (UPPER(email) varchar_pattern_ops)'
+        )
+
+
+def supprimer_index_prefixe_email(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS utilisateur_email_prefixe_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0024_statistiques_compteurs'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='utilisateur',
+            index=models.Index(fields=['-date_creation', '-id'], name='utilisateur_date_id_idx'),
+        ),
+        migrations.RunPython(creer_index_prefixe_email, supprimer_index_prefixe_email),
+    ]
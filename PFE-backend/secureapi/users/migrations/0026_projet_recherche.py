@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 16:31
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+# Copie figée de users.recherche.configuration : une migration ne dépend pas du code courant
+def configuration():
+    return getattr(settings, 'RECHERCHE_CONFIGURATION', 'french')
+
+
+# Index GIN et remplissage du tsvector : PostgreSQL uniquement
+def creer_index_recherche(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS projet_recherche_gin_idx ON users_projet '
+        'USING gin (vecteur_recherche) WHERE postulation_acceptee_id IS NULL'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS projet_competences_gin_idx ON users_projet '
+        'USING gin (competences_requises jsonb_path_ops)'
+    )
+    schema_editor.execute(
+        "UPDATE users_projet SET vecteur_recherche = "
+        "setweight(to_tsvector(%(config)s::regconfig, COALESCE(titre, '')), 'A') || "
+        "setweight(to_tsvector(%(config)s::regconfig, COALESCE(description, '')), 'B') || "
+        "setweight(to_tsvector(%(config)s::regconfig, competences_requises::text), 'C')",
+        {'config': configuration()},
+    )
+
+
+def supprimer_index_recherche(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS projet_recherche_gin_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS projet_competences_gin_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0025_utilisateur_index_liste'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projet',
+            name='vecteur_recherche',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(creer_index_recherche, supprimer_index_recherche),
+    ]
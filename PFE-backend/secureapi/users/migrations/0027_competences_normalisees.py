@@ -0,0 +1,148 @@
+# Generated by Django 5.2 on 2026-10-18 16:36
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TAILLE_LOT = 2000
+
+# Copie figée de la normalisation de users/correspondance.py à la date de la
+# migration : modifier SYNONYMES ensuite ne change pas ce que cette migration remplit
+LONGUEUR_MAX_COMPETENCE = 100
+
+SYNONYMES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'node': 'nodejs',
+    'node.js': 'nodejs',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'py': 'python',
+    'python3': 'python',
+    'drf': 'django rest framework',
+    'k8s': 'kubernetes',
+    'ml': 'machine learning',
+    'ia': 'intelligence artificielle',
+    'ai': 'intelligence artificielle',
+}
+
+
+def normaliser_competence(nom):
+    nom = unicodedata.normalize('NFKD', nom).encode('ascii', 'ignore').decode()
+    nom = re.sub(r'\s+', ' ', nom).strip().lower()
+    return SYNONYMES.get(nom, nom)
+
+
+def normaliser_competences(competences):
+    if isinstance(competences, str):
+        competences = competences.split(',')
+    if not isinstance(competences, (list, tuple, set)):
+        return set()
+    return {
+        c for c in map(normaliser_competence, map(str, competences))
+        if c and len(c) <= LONGUEUR_MAX_COMPETENCE
+    }
+
+
+def lier(apps, modele, champ_json, liaison, champ_entite):
+    Competence = apps.get_model('users', 'Competence')
+    Modele = apps.get_model('users', modele)
+    Liaison = apps.get_model('users', liaison)
+    ids = {}
+    lot = []
+    for pk, competences in Modele.objects.values_list('pk', champ_json).iterator(chunk_size=TAILLE_LOT):
+        for nom in normaliser_competences(competences):
+            if nom not in ids:
+                ids[nom] = Competence.objects.get_or_create(nom=nom)[0].pk
+            lot.append(Liaison(**{f'{champ_entite}_id': pk, 'competence_id': ids[nom]}))
+        if len(lot) >= TAILLE_LOT:
+            Liaison.objects.bulk_create(lot, ignore_conflicts=True)
+            lot = []
+    Liaison.objects.bulk_create(lot, ignore_conflicts=True)
+
+
+def remplir_liaisons(apps, schema_editor):
+    lier(apps, 'Projet', 'competences_requises', 'ProjetCompetence', 'projet')
+    lier(apps, 'Freelancer', 'competences', 'FreelancerCompetence', 'freelancer')
+    # La contenance JSON n'est plus interrogée : l'index GIN de 0026 ne sert plus
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS projet_competences_gin_idx')
+
+
+def recreer_index_json(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS projet_competences_gin_idx ON users_projet '
+            'USING gin (competences_requises jsonb_path_ops)'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0026_projet_recherche'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Competence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nom', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Compétence',
+                'verbose_name_plural': 'Compétences',
+                'ordering': ['nom'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FreelancerCompetence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('competence', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.competence')),
+                ('freelancer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.freelancer')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='freelancer',
+            name='competences_normalisees',
+            field=models.ManyToManyField(blank=True, related_name='freelancers', through='users.FreelancerCompetence', to='users.competence'),
+        ),
+        migrations.CreateModel(
+            name='ProjetCompetence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('competence', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.competence')),
+                ('projet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.projet')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='projet',
+            name='competences_normalisees',
+            field=models.ManyToManyField(blank=True, related_name='projets', through='users.ProjetCompetence', to='users.competence'),
+        ),
+        migrations.AddIndex(
+            model_name='freelancercompetence',
+            index=models.Index(fields=['competence', 'freelancer'], name='competence_freelancer_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='freelancercompetence',
+            constraint=models.UniqueConstraint(fields=('freelancer', 'competence'), name='freelancer_competence_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='projetcompetence',
+            index=models.Index(fields=['competence', 'projet'], name='competence_projet_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='projetcompetence',
+            constraint=models.UniqueConstraint(fields=('projet', 'competence'), name='projet_competence_unique'),
+        ),
+        migrations.RunPython(remplir_liaisons, recreer_index_json),
+    ]
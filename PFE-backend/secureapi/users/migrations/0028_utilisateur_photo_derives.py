@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0027_competences_normalisees'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='utilisateur',
+            name='photo_derives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
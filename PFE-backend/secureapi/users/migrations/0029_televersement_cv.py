@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 16:45
+
+import django.core.validators
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0028_utilisateur_photo_derives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeleversementCV',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('nom_fichier', models.CharField(max_length=255, validators=[django.core.validators.RegexValidator(message='Extensions autorisées : pdf, doc, docx.', regex='(?i)\\.(pdf|docx?)$')])),
+                ('taille', models.PositiveBigIntegerField()),
+                ('recu', models.PositiveBigIntegerField(default=0)),
+                ('statut', models.CharField(choices=[('en_cours', 'En cours'), ('termine', 'Terminé')], default='en_cours', max_length=20)),
+                ('empreinte', models.CharField(blank=True, default='', max_length=64)),
+                ('fichier', models.FileField(blank=True, upload_to='cvs_freelancers/')),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('date_expiration', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Téléversement de CV',
+                'verbose_name_plural': 'Téléversements de CV',
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0029_televersement_cv'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emailsortant',
+            name='email_en_attente_idx',
+        ),
+        migrations.AlterField(
+            model_name='emailsortant',
+            name='statut',
+            field=models.CharField(choices=[('en_attente', 'En attente'), ('en_cours', "En cours d'envoi"), ('envoye', 'Envoyé'), ('echec', 'Échec définitif')], default='en_attente', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='emailsortant',
+            index=models.Index(condition=models.Q(('statut__in', ['en_attente', 'en_cours'])), fields=['prochaine_tentative'], name='email_a_envoyer_idx'),
+        ),
+    ]
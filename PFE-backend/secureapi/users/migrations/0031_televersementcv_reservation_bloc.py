@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0030_emailsortant_bail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='televersementcv',
+            name='reservation_bloc',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,4 +1,10 @@
-from django.db import models
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.db.models import Case, F, Value, When, prefetch_related_objects
+from django.db.models.functions import Cast
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.core.validators import FileExtensionValidator, RegexValidator
 from django.core.exceptions import ValidationError
@@ -7,9 +13,16 @@ from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth import get_user_model
 
+from .cache import invalider
+from .correspondance import normaliser_competences
+from .images import generer_derives
+from .recherche import vecteur_recherche_projet
+
 class GestionnaireUtilisateur(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
@@ -18,15 +31,10 @@ class GestionnaireUtilisateur(BaseUserManager):
 
         # Déplacer is_active dans extra_fields pour éviter le conflit
         extra_fields.setdefault('is_active', False)
-        
-        # Générer le jeton avant la création de l'utilisateur
-        jeton = get_random_string(64)
-        expiration = timezone.now() + timedelta(hours=24)
 
+        # Le jeton de vérification est émis séparément (JetonUtilisateur)
         utilisateur = self.model(
             email=email,
-            jeton_verification=jeton,
-            expiration_jeton_verification=expiration,
             **extra_fields
         )
         utilisateur.set_password(password)
@@ -82,17 +90,8 @@ class Utilisateur(AbstractBaseUser, PermissionsMixin):
         blank=True,
         verbose_name="Photo de profil"
     )
-    jeton_verification = models.CharField(
-        max_length=64,
-        blank=True,
-        null=True,
-        verbose_name="Jeton de vérification"
-    )
-    expiration_jeton_verification = models.DateTimeField(
-        blank=True,
-        null=True,
-        verbose_name="Expiration du jeton"
-    )
+    # Vignettes de la photo (voir users/images.py), tenues à jour par save()
+    photo_derives = models.JSONField(default=dict, blank=True, editable=False)
     type_utilisateur = models.CharField(
         max_length=20,
         choices=TYPE_UTILISATEUR_CHOICES,
@@ -108,24 +107,12 @@ class Utilisateur(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False, verbose_name="Équipe admin")
 
     date_creation = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
-    
-    jeton_reinitialisation = models.CharField(
-        max_length=64,
-        blank=True,
-        null=True,
-        verbose_name="Jeton de réinitialisation"
-    )
-    expiration_jeton_reinitialisation = models.DateTimeField(
-        blank=True,
-        null=True,
-        verbose_name="Expiration du jeton de réinitialisation"
-    )
+
+    def generer_jeton_verification(self):
+        return JetonUtilisateur.objects.emettre(self, 'verification', timedelta(hours=24))
 
     def generer_jeton_reinitialisation(self):
-        self.jeton_reinitialisation = get_random_string(64)
-        self.expiration_jeton_reinitialisation = timezone.now() + timedelta(hours=1)
-        self.save()
-        return self.jeton_reinitialisation
+        return JetonUtilisateur.objects.emettre(self, 'reinitialisation', timedelta(hours=1))
     
     objects = GestionnaireUtilisateur()
     
@@ -135,10 +122,114 @@ class Utilisateur(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = "Utilisateur"
         verbose_name_plural = "Utilisateurs"
+        indexes = [
+            # Sert la pagination par curseur de la liste des utilisateurs (admin)
+            models.Index(fields=['-date_creation', '-id'], name='utilisateur_date_id_idx'),
+        ]
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'photo_profil' in update_fields:
+            if getattr(settings, 'PHOTO_DERIVES_A_L_ENVOI', True):
+                self.mettre_a_jour_derives()
+
+    def mettre_a_jour_derives(self, forcer=False):
+        """Génère les dérivés si la photo a changé depuis le dernier calcul."""
+        photo = self.photo_profil.name or ''
+        if not forcer and self.photo_derives.get('source', '') == photo:
+            return False
+        self.photo_derives = generer_derives(self.photo_profil) if photo else {}
+        Utilisateur.objects.filter(pk=self.pk).update(photo_derives=self.photo_derives)
+        return True
+
     def __str__(self):
         return f"{self.nom_complet} ({self.email})"
 
+class GestionnaireJeton(models.Manager):
+    @staticmethod
+    def empreinte(jeton):
+        return hashlib.sha256(jeton.encode()).hexdigest()
+
+    def emettre(self, utilisateur, objet, duree):
+        """
+        Crée un nouveau jeton pour cet objet (en remplaçant le précédent) et
+        retourne sa valeur en clair ; seule son empreinte est enregistrée.
+        """
+        jeton = get_random_string(64)
+        with transaction.atomic():
+            self.filter(utilisateur=utilisateur, objet=objet).delete()
+            self.create(
+                utilisateur=utilisateur,
+                objet=objet,
+                empreinte=self.empreinte(jeton),
+                date_expiration=timezone.now() + duree
+            )
+        return jeton
+
+    def trouver(self, jeton, objet):
+        """Retrouve un jeton (expiré ou non) par son empreinte, avec son utilisateur."""
+        return self.select_related('utilisateur').filter(
+            empreinte=self.empreinte(jeton),
+            objet=objet
+        ).first()
+
+class JetonUtilisateur(models.Model):
+    """
+    Jetons de vérification d'email et de réinitialisation de mot de passe.
+    Seule l'empreinte SHA-256 est stockée, sous un index unique.
+    """
+    OBJET_CHOICES = [
+        ('verification', 'Vérification de l\'email'),
+        ('reinitialisation', 'Réinitialisation du mot de passe'),
+    ]
+
+    utilisateur = models.ForeignKey(Utilisateur, on_delete=models.CASCADE, related_name='jetons')
+    objet = models.CharField(max_length=20, choices=OBJET_CHOICES)
+    empreinte = models.CharField(max_length=64, unique=True)
+    date_expiration = models.DateTimeField(db_index=True)
+    date_creation = models.DateTimeField(auto_now_add=True)
+
+    objects = GestionnaireJeton()
+
+    class Meta:
+        verbose_name = "Jeton"
+        verbose_name_plural = "Jetons"
+
+    @property
+    def est_expire(self):
+        return self.date_expiration <= timezone.now()
+
+    def __str__(self):
+        return f"{self.get_objet_display()} - {self.utilisateur_id}"
+
+class GestionnaireCompetence(models.Manager):
+    def obtenir(self, noms):
+        """Compétences (déjà normalisées) `noms`, créées au besoin."""
+        noms = set(noms)
+        if not noms:
+            return self.none()
+        self.bulk_create([Competence(nom=nom) for nom in noms], ignore_conflicts=True)
+        return self.filter(nom__in=noms)
+
+class Competence(models.Model):
+    """
+    Vocabulaire normalisé des compétences (voir users/correspondance.py), relié aux
+    projets et aux freelancers par des tables de liaison indexées. Les listes JSON
+    restent la source affichée ; les liaisons sont synchronisées par save().
+    """
+    nom = models.CharField(max_length=100, unique=True)
+
+    objects = GestionnaireCompetence()
+
+    class Meta:
+        verbose_name = "Compétence"
+        verbose_name_plural = "Compétences"
+        ordering = ['nom']
+
+    def __str__(self):
+        return self.nom
+
 class Client(Utilisateur):
     class Meta:
         proxy = True
@@ -176,10 +267,24 @@ class Freelancer(Utilisateur):
         blank=True,
         verbose_name="Liste des compétences"
     )
+    # Copie normalisée de `competences`, maintenue par save()
+    competences_normalisees = models.ManyToManyField(
+        Competence,
+        through='FreelancerCompetence',
+        related_name='freelancers',
+        blank=True
+    )
     
     class Meta:
         verbose_name = "Freelancer"
         verbose_name_plural = "Freelancers"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if update_fields is None or 'competences' in update_fields:
+                self.competences_normalisees.set(Competence.objects.obtenir(normaliser_competences(self.competences)))
     
     def enregistrer_compte(self):
         self.type_utilisateur = 'freelancer'
@@ -189,6 +294,61 @@ class Freelancer(Utilisateur):
         # Implémentation spécifique au freelancer
         pass
 
+class TeleversementCV(models.Model):
+    """
+    Envoi d'un CV par blocs, reprenable après coupure (voir users/televersements.py).
+    Une fois complet, le fichier est stocké sous l'empreinte SHA-256 de son contenu :
+    un CV déjà connu n'est pas stocké une seconde fois. L'inscription le référence
+    ensuite par son identifiant.
+    """
+    STATUT_CHOICES = [
+        ('en_cours', 'En cours'),
+        ('termine', 'Terminé'),
+    ]
+
+    # Identifiant non devinable : l'envoi se fait avant toute authentification
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    nom_fichier = models.CharField(
+        max_length=255,
+        validators=[RegexValidator(
+            regex=r'(?i)\.(pdf|docx?)$',
+            message="Extensions autorisées : pdf, doc, docx."
+        )]
+    )
+    taille = models.PositiveBigIntegerField()
+    recu = models.PositiveBigIntegerField(default=0)
+    statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default='en_cours')
+    empreinte = models.CharField(max_length=64, blank=True, default='')
+    fichier = models.FileField(upload_to='cvs_freelancers/', blank=True)
+    date_creation = models.DateTimeField(auto_now_add=True)
+    date_expiration = models.DateTimeField(db_index=True)
+    # Fin de la réservation du bloc en cours de réception (un seul à la fois)
+    reservation_bloc = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        verbose_name = "Téléversement de CV"
+        verbose_name_plural = "Téléversements de CV"
+
+    @property
+    def est_expire(self):
+        return self.date_expiration <= timezone.now()
+
+    def __str__(self):
+        return f"{self.nom_fichier} ({self.recu}/{self.taille})"
+
+class FreelancerCompetence(models.Model):
+    freelancer = models.ForeignKey(Freelancer, on_delete=models.CASCADE)
+    competence = models.ForeignKey(Competence, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['freelancer', 'competence'], name='freelancer_competence_unique'),
+        ]
+        indexes = [
+            # « Freelancers ayant la compétence X » : parcours de cet index seul
+            models.Index(fields=['competence', 'freelancer'], name='competence_freelancer_idx'),
+        ]
+
 class Administrateur(Utilisateur):
     class Meta:
         proxy = True
@@ -213,13 +373,77 @@ class Projet(models.Model):
     deadline = models.DateField()
     competences_requises = models.JSONField(default=list)
     date_creation = models.DateTimeField(auto_now_add=True)
+    # Dénormalisation de la postulation acceptée, maintenue par Postulation.accepter/refuser
+    postulation_acceptee = models.OneToOneField(
+        'Postulation',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Postulation acceptée"
+    )
+    # tsvector de la recherche plein texte (PostgreSQL uniquement), maintenu par save()
+    vecteur_recherche = SearchVectorField(null=True, editable=False)
+    # Copie normalisée de `competences_requises`, maintenue par save()
+    competences_normalisees = models.ManyToManyField(
+        Competence,
+        through='ProjetCompetence',
+        related_name='projets',
+        blank=True
+    )
+
+    CHAMPS_RECHERCHE = {'titre', 'description', 'competences_requises'}
 
     class Meta:
         ordering = ['-date_creation']
+        indexes = [
+            # Sert la pagination par curseur (date_creation, id) du flux des projets
+            models.Index(fields=['-date_creation', '-id'], name='projet_date_id_idx'),
+            # Index partiel limité aux projets encore ouverts (flux des freelancers)
+            models.Index(
+                fields=['-date_creation', '-id'],
+                condition=models.Q(postulation_acceptee__isnull=True),
+                name='projet_ouvert_date_id_idx'
+            ),
+        ]
+
+    @property
+    def est_attribue(self):
+        return self.postulation_acceptee_id is not None
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if update_fields is None or self.CHAMPS_RECHERCHE & set(update_fields):
+                self.mettre_a_jour_vecteur()
+            if update_fields is None or 'competences_requises' in update_fields:
+                self.competences_normalisees.set(
+                    Competence.objects.obtenir(normaliser_competences(self.competences_requises))
+                )
+
+    def mettre_a_jour_vecteur(self):
+        if connections[self._state.db].vendor == 'postgresql':
+            Projet.objects.using(self._state.db).filter(pk=self.pk).update(
+                vecteur_recherche=vecteur_recherche_projet()
+            )
 
     def __str__(self):
         return self.titre
 
+class ProjetCompetence(models.Model):
+    projet = models.ForeignKey(Projet, on_delete=models.CASCADE)
+    competence = models.ForeignKey(Competence, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['projet', 'competence'], name='projet_competence_unique'),
+        ]
+        indexes = [
+            # « Projets demandant la compétence X » : parcours de cet index seul
+            models.Index(fields=['competence', 'projet'], name='competence_projet_idx'),
+        ]
+
 class Postulation(models.Model):
     STATUT_CHOICES = [
         ('en_attente', 'En attente'),
@@ -237,6 +461,76 @@ class Postulation(models.Model):
         unique_together = ('projet', 'freelancer')
         ordering = ['-date_postulation']
 
+    def accepter(self):
+        """Accepte la postulation et refuse les autres candidatures en attente, comme PostulationAcceptView."""
+        self.projet, _ = Postulation.decider(self.projet_id, acceptee=self.pk, refuser_autres=True)
+        self.statut = 'accepte'
+
+    def refuser(self):
+        """Refuse la postulation et libère le projet si elle était acceptée."""
+        self.projet, _ = Postulation.decider(self.projet_id, refusees=[self.pk])
+        self.statut = 'refuse'
+
+    @classmethod
+    def decider(cls, projet_id, acceptee=None, refusees=(), refuser_autres=False, taille_lot=1000):
+        """
+        Accepte la candidature `acceptee` et refuse les candidatures `refusees`
+        (identifiants) d'un projet en une transaction, par mises à jour groupées
+        plutôt qu'un save() par ligne. Avec `refuser_autres`, toutes les autres
+        candidatures en attente du projet sont refusées.
+
+        Retourne (projet, candidatures dont le statut a changé) ; la relation
+        `projet` de ces dernières est renseignée, sans requête supplémentaire.
+        """
+        refusees = set(refusees)
+        demandees = refusees | ({acceptee} if acceptee is not None else set())
+        if acceptee in refusees:
+            raise ValidationError("Une candidature ne peut pas être à la fois acceptée et refusée.")
+
+        with transaction.atomic():
+            projet = Projet.objects.select_for_update().get(pk=projet_id)
+            cibles = models.Q(pk__in=demandees)
+            if refuser_autres:
+                cibles |= models.Q(statut='en_attente')
+            postulations = list(
+                cls.objects.filter(cibles, projet_id=projet_id)
+                .only('id', 'projet_id', 'freelancer_id', 'statut')
+                .order_by('pk')
+            )
+
+            introuvables = demandees - {postulation.pk for postulation in postulations}
+            if introuvables:
+                raise ValidationError(
+                    f"Candidatures introuvables pour ce projet : {', '.join(map(str, sorted(introuvables)))}"
+                )
+            ancienne = projet.postulation_acceptee_id
+            if acceptee is not None and ancienne not in (None, acceptee) and ancienne not in refusees:
+                raise ValidationError("Un freelancer a déjà été sélectionné pour ce projet.")
+
+            modifiees = []
+            for postulation in postulations:
+                statut = 'accepte' if postulation.pk == acceptee else 'refuse'
+                if postulation.statut != statut:
+                    postulation.statut = statut
+                    postulation.projet = projet
+                    modifiees.append(postulation)
+            cls.objects.bulk_update(modifiees, ['statut'], batch_size=taille_lot)
+
+            if acceptee is not None:
+                nouvelle = acceptee
+            else:
+                nouvelle = None if ancienne in refusees else ancienne
+            if nouvelle != ancienne:
+                if nouvelle is not None:
+                    StatistiqueQuotidienne.incrementer('acceptations')
+                projet.postulation_acceptee_id = nouvelle
+                projet.save(update_fields=['postulation_acceptee'])
+
+            # bulk_update n'émet pas post_save : invalidation explicite (voir users/signals.py)
+            if modifiees:
+                transaction.on_commit(lambda: invalider('projets', 'freelancer_accepte', 'correspondance_projets'))
+        return projet, modifiees
+
     def __str__(self):
         return f"{self.freelancer} -> {self.projet}"
 
@@ -253,16 +547,130 @@ class Evaluation(models.Model):
         verbose_name = "Évaluation"
         verbose_name_plural = "Évaluations"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Note telle qu'enregistrée, pour éviter de relire la ligne dans save()
+        instance._note_enregistree = instance.__dict__.get('note')
+        return instance
+
     def save(self, *args, **kwargs):
+        creation = self._state.adding
+        ancienne_note = None
         # Calcul de la moyenne si évaluation existante
-        if self.pk:
-            ancienne_note = Evaluation.objects.get(pk=self.pk).note
-            self.note = (ancienne_note + self.note) / 2
-        super().save(*args, **kwargs)
+        if not creation:
+            ancienne_note = getattr(self, '_note_enregistree', None)
+            if ancienne_note is None:
+                ancienne_note = Evaluation.objects.get(pk=self.pk).note
+            self.note = (ancienne_note + int(self.note)) // 2
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            FreelancerRatingStats.appliquer(
+                self.freelancer_id,
+                delta_nombre=1 if creation else 0,
+                delta_somme=int(self.note) - (ancienne_note or 0)
+            )
+        self._note_enregistree = int(self.note)
 
     def __str__(self):
         return f"{self.note}/5 - {self.freelancer}"
 
+class FreelancerRatingStats(models.Model):
+    """
+    Agrégats des évaluations d'un freelancer, tenus à jour de manière incrémentale
+    par Evaluation.save() et le signal post_delete des évaluations
+    (users/signals.py), et reconstruits par la commande
+    reconstruire_statistiques_notes.
+    """
+    freelancer = models.OneToOneField(
+        Freelancer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='statistiques_notes'
+    )
+    nombre_evaluations = models.PositiveIntegerField(default=0)
+    somme_notes = models.PositiveIntegerField(default=0)
+    moyenne_notes = models.FloatField(default=0)
+    date_mise_a_jour = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Statistiques des notes"
+        verbose_name_plural = "Statistiques des notes"
+
+    @classmethod
+    def appliquer(cls, freelancer_id, delta_nombre, delta_somme, creer=True):
+        """Applique une variation en O(1) par un UPDATE atomique sur la ligne du freelancer."""
+        if creer:
+            cls.objects.get_or_create(freelancer_id=freelancer_id)
+        nombre = F('nombre_evaluations') + delta_nombre
+        somme = F('somme_notes') + delta_somme
+        cls.objects.filter(freelancer_id=freelancer_id).update(
+            nombre_evaluations=nombre,
+            somme_notes=somme,
+            moyenne_notes=Case(
+                When(nombre_evaluations__gt=-delta_nombre, then=Cast(somme, models.FloatField()) / nombre),
+                default=Value(0.0),
+                output_field=models.FloatField()
+            ),
+            date_mise_a_jour=timezone.now()
+        )
+
+    def __str__(self):
+        return f"{self.moyenne_notes:.1f}/5 ({self.nombre_evaluations}) - {self.freelancer_id}"
+
+class CompteurStatistique(models.Model):
+    """
+    Totaux du tableau de bord administrateur, tenus à jour par les signaux de
+    création/suppression (users/signals.py) et reconstruits par la commande
+    reconstruire_statistiques.
+    """
+    cle = models.CharField(max_length=30, primary_key=True)
+    valeur = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Compteur statistique"
+        verbose_name_plural = "Compteurs statistiques"
+
+    @classmethod
+    def incrementer(cls, cle, delta=1):
+        cls.objects.get_or_create(cle=cle)
+        cls.objects.filter(cle=cle).update(valeur=F('valeur') + delta)
+
+    def __str__(self):
+        return f"{self.cle} = {self.valeur}"
+
+class StatistiqueQuotidienne(models.Model):
+    """
+    Nombre d'événements par jour et par indicateur. Les courbes du tableau de
+    bord sont calculées sur cette table plutôt que sur les tables sources.
+    """
+    INDICATEUR_CHOICES = [
+        ('inscriptions', 'Inscriptions'),
+        ('projets', 'Projets publiés'),
+        ('postulations', 'Postulations'),
+        ('acceptations', 'Postulations acceptées'),
+    ]
+
+    indicateur = models.CharField(max_length=20, choices=INDICATEUR_CHOICES)
+    jour = models.DateField()
+    valeur = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Statistique quotidienne"
+        verbose_name_plural = "Statistiques quotidiennes"
+        constraints = [
+            models.UniqueConstraint(fields=['indicateur', 'jour'], name='statistique_indicateur_jour_unique'),
+        ]
+
+    @classmethod
+    def incrementer(cls, indicateur, jour=None):
+        jour = jour or timezone.localdate()
+        cls.objects.get_or_create(indicateur=indicateur, jour=jour)
+        cls.objects.filter(indicateur=indicateur, jour=jour).update(valeur=F('valeur') + 1)
+
+    def __str__(self):
+        return f"{self.indicateur} {self.jour} : {self.valeur}"
+
 Utilisateur = get_user_model()
 
 class Notification(models.Model):
@@ -272,41 +680,141 @@ class Notification(models.Model):
         ('freelancer_selectionne', 'Freelancer sélectionné'),
         ('postulation_acceptee', 'Postulation acceptée'),
         ('postulation_refusee', 'Postulation refusée'),
+        ('evaluation_recue', 'Évaluation reçue'),
     ]
 
+    MESSAGES = {
+        'projet_publie': "Votre projet {titre} a été publié avec succès",
+        'nouvelle_candidature': "Nouvelle candidature reçue pour votre projet {titre}",
+        'freelancer_selectionne': "Vous avez été sélectionné pour le projet {titre}",
+        'postulation_acceptee': "Votre candidature au projet {titre} a été acceptée",
+        'postulation_refusee': "Votre candidature au projet {titre} a été refusée",
+        'evaluation_recue': "Vous avez reçu une nouvelle évaluation",
+    }
+    MESSAGE_INDISPONIBLE = "Ce contenu ne peut pas être récupéré car il est lié à un projet qui a été annulé ou terminé."
+
     utilisateur = models.ForeignKey(Utilisateur, on_delete=models.CASCADE, related_name='notifications')
     type_notification = models.CharField(max_length=30, choices=TYPE_CHOICES)
     date_creation = models.DateTimeField(auto_now_add=True)
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
     object_id = models.PositiveIntegerField(null=True, blank=True)
     content_object = GenericForeignKey('content_type', 'object_id')
+    # Instantané figé à la création : la lecture ne touche plus les tables cibles
+    titre_projet = models.CharField(max_length=100, blank=True, default='')
+    message_rendu = models.TextField(blank=True, default='')
+    est_vue = models.BooleanField(default=False)
 
     class Meta:
         ordering = ['-date_creation']
         verbose_name = "Notification"
         verbose_name_plural = "Notifications"
+        indexes = [
+            # Boîte de réception paginée par curseur pour un utilisateur
+            models.Index(fields=['utilisateur', '-date_creation', '-id'], name='notif_utilisateur_date_idx'),
+            # Index partiel : le compteur de non vues ne parcourt que les lignes non lues
+            models.Index(fields=['utilisateur'], condition=models.Q(est_vue=False), name='notif_non_vue_idx'),
+        ]
+
+    @staticmethod
+    def titre_cible(cible):
+        if isinstance(cible, Projet):
+            return cible.titre
+        projet = getattr(cible, 'projet', None)
+        return projet.titre if projet else ''
+
+    def rendre_message(self, cible):
+        gabarit = self.MESSAGES.get(self.type_notification)
+        if not cible or gabarit is None:
+            return self.MESSAGE_INDISPONIBLE
+        return gabarit.format(titre=self.titre_cible(cible))
 
     @property
     def message(self):
-        if not self.content_object:
-            return "Ce contenu ne peut pas être récupéré car il est lié à un projet qui a été annulé ou terminé."
-            
-        if self.type_notification == 'projet_publie':
-            return f"Votre projet {self.content_object.titre} a été publié avec succès"
-            
-        elif self.type_notification == 'nouvelle_candidature':
-            return f"Nouvelle candidature reçue pour votre projet {self.content_object.projet.titre}"
-            
-        elif self.type_notification == 'freelancer_selectionne':
-            return f"Vous avez été sélectionné pour le projet {self.content_object.projet.titre}"
-            
-        elif self.type_notification == 'postulation_acceptee':
-            return f"Votre candidature au projet {self.content_object.projet.titre} a été acceptée"
-            
-        elif self.type_notification == 'postulation_refusee':
-            return f"Votre candidature au projet {self.content_object.projet.titre} a été refusée"
-            
-        return "Ce contenu ne peut pas être récupéré car il est lié à un projet qui a été annulé ou terminé."
+        if self.message_rendu:
+            return self.message_rendu
+        return self.rendre_message(self.content_object)
+
+    @classmethod
+    def precharger_cibles(cls, notifications):
+        """
+        Charge en lot les objets ciblés des notifications sans instantané :
+        une requête par content_type, avec le projet joint pour les postulations.
+        """
+        sans_instantane = [n for n in notifications if not n.message_rendu and n.content_type_id]
+        if sans_instantane:
+            prefetch_related_objects(
+                sans_instantane,
+                GenericPrefetch('content_object', [
+                    Projet.objects.all(),
+                    Postulation.objects.select_related('projet'),
+                    Evaluation.objects.all(),
+                ])
+            )
+        return notifications
+
+    def figer(self):
+        """Calcule l'instantané (titre et message) à partir de l'objet ciblé."""
+        cible = self.content_object
+        if cible:
+            self.titre_projet = self.titre_cible(cible)[:100]
+            self.message_rendu = self.rendre_message(cible)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.message_rendu:
+            self.figer()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def creer_en_lot(cls, notifications, taille_lot=1000):
+        """bulk_create n'appelle pas save() : les instantanés sont figés ici."""
+        for notification in notifications:
+            if not notification.message_rendu:
+                notification.figer()
+        return cls.objects.bulk_create(notifications, batch_size=taille_lot)
+
+    def __str__(self):
+        return f"{self.get_type_notification_display()} - {self.utilisateur.nom_complet}"
+
+
+class EmailSortant(models.Model):
+    """
+    File d'attente persistante des emails sortants. Les vues y déposent les
+    messages ; la commande envoyer_emails les expédie par lots.
+
+    Un message réservé par un worker passe 'en_cours' jusqu'à
+    prochaine_tentative (fin du bail) : si le worker s'arrête sans rendre
+    compte, le message redevient éligible à l'expiration du bail.
+    """
+    STATUT_CHOICES = [
+        ('en_attente', 'En attente'),
+        ('en_cours', "En cours d'envoi"),
+        ('envoye', 'Envoyé'),
+        ('echec', 'Échec définitif'),
+    ]
+
+    sujet = models.CharField(max_length=255)
+    message = models.TextField()
+    expediteur = models.CharField(max_length=254, blank=True, default='')
+    destinataires = models.JSONField(default=list)
+    statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default='en_attente')
+    tentatives = models.PositiveSmallIntegerField(default=0)
+    prochaine_tentative = models.DateTimeField(default=timezone.now)
+    derniere_erreur = models.TextField(blank=True, default='')
+    date_creation = models.DateTimeField(auto_now_add=True)
+    date_envoi = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['prochaine_tentative']
+        verbose_name = "Email sortant"
+        verbose_name_plural = "Emails sortants"
+        indexes = [
+            # Sélection des messages à envoyer (ou dont le bail a expiré) par le worker
+            models.Index(
+                fields=['prochaine_tentative'],
+                condition=models.Q(statut__in=['en_attente', 'en_cours']),
+                name='email_a_envoyer_idx'
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.get_type_notification_display()} - {self.utilisateur.nom_complet}"
\ No newline at end of file
+        return f"{self.sujet} -> {', '.join(self.destinataires)} ({self.get_statut_display()})"
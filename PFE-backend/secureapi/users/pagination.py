@@ -0,0 +1,215 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CurseurPagination(BasePagination):
+    """
+    Pagination par curseur (keyset) sur le couple (date, id) en ordre décroissant.
+
+    Le curseur est opaque pour le client : il encode la date et l'id du dernier
+    élément de la page. La page suivante est obtenue par un simple parcours
+    d'index à partir de cette position, sans OFFSET, donc la page 1000 coûte
+    autant que la première.
+
+    La pagination n'est active que si `cursor` ou `page_size` est fourni, afin
+    de garder la réponse en liste pour les clients existants.
+    """
+    champ_date = 'date_creation'
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Curseur invalide'
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'PAGINATION_PAGE_SIZE', 20)
+        self.max_page_size = getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 100)
+
+    def est_demandee(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
+
+    def get_page_size(self, request):
+        try:
+            taille = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if taille <= 0:
+            return self.page_size
+        return min(taille, self.max_page_size)
+
+    def encoder_curseur(self, element):
+        position = [getattr(element, self.champ_date).isoformat(), element.pk]
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+
+    def decoder_curseur(self, request):
+        brut = request.query_params.get(self.cursor_query_param)
+        if not brut:
+            return None
+        try:
+            brut += '=' * (-len(brut) % 4)
+            date_iso, pk = json.loads(base64.urlsafe_b64decode(brut.encode()).decode())
+            date = parse_datetime(date_iso)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return date, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if not self.est_demandee(request):
+            return None
+
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(f'-{self.champ_date}', '-pk')
+
+        curseur = self.decoder_curseur(request)
+        if curseur:
+            date, pk = curseur
+            # La borne `<=` redondante permet à l'index (date, id) de servir de
+            # condition de parcours ; le OR ne fait que départager les égalités.
+            queryset = queryset.filter(**{f'{self.champ_date}__lte': date}).filter(
+                Q(**{f'{self.champ_date}__lt': date}) | Q(**{self.champ_date: date, 'pk__lt': pk})
+            )
+
+        elements = list(queryset[:self.page_size + 1])
+        self.a_page_suivante = len(elements) > self.page_size
+        elements = elements[:self.page_size]
+        self.dernier_element = elements[-1] if elements else None
+        return elements
+
+    def get_next_link(self):
+        if not self.a_page_suivante:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encoder_curseur(self.dernier_element))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Curseur opaque renvoyé dans le champ `next` de la page précédente.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Nombre de résultats par page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class DecalagePagination(BasePagination):
+    """
+    Pagination par décalage (LIMIT/OFFSET) pour les résultats triés par un score
+    calculé, où un curseur (date, id) ne s'applique pas. Pas de COUNT(*) : une
+    ligne de plus est lue pour savoir s'il existe une page suivante, et le
+    décalage est plafonné pour borner le coût des pages profondes.
+    """
+    offset_query_param = 'offset'
+    page_size_query_param = 'page_size'
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'PAGINATION_PAGE_SIZE', 20)
+        self.max_page_size = getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 100)
+        self.max_offset = getattr(settings, 'PAGINATION_MAX_DECALAGE', 1000)
+
+    def get_page_size(self, request):
+        try:
+            taille = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if taille <= 0:
+            return self.page_size
+        return min(taille, self.max_page_size)
+
+    def get_offset(self, request):
+        try:
+            decalage = int(request.query_params[self.offset_query_param])
+        except (KeyError, ValueError):
+            return 0
+        return max(decalage, 0)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.offset = self.get_offset(request)
+        if self.offset > self.max_offset:
+            raise NotFound(f"Décalage maximal : {self.max_offset}")
+
+        elements = list(queryset[self.offset:self.offset + self.page_size + 1])
+        self.a_page_suivante = (
+            len(elements) > self.page_size
+            and self.offset + self.page_size <= self.max_offset
+        )
+        return elements[:self.page_size]
+
+    def get_next_link(self):
+        if not self.a_page_suivante:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.offset_query_param, self.offset + self.page_size)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.offset_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Position du premier résultat (au plus {self.max_offset}).',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Nombre de résultats par page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
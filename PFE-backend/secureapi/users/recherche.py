@@ -0,0 +1,62 @@
+"""
+Recherche plein texte dans les projets.
+
+Sous PostgreSQL, Projet.vecteur_recherche (tsvector pondéré : titre > description
+> compétences, tenu à jour par Projet.save) est interrogé via un index GIN et les
+résultats sont classés par pertinence. Les autres bases (SQLite en test) se
+rabattent sur des recherches `icontains` mot par mot, triées par date.
+"""
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, FloatField, Q, TextField, Value
+from django.db.models.functions import Cast
+
+from .correspondance import normaliser_competences
+
+
+def configuration():
+    return getattr(settings, 'RECHERCHE_CONFIGURATION', 'french')
+
+
+def est_postgresql(queryset):
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def vecteur_recherche_projet():
+    """Expression du tsvector d'un projet, pour Projet.objects.update(vecteur_recherche=...)."""
+    config = configuration()
+    return (
+        SearchVector('titre', weight='A', config=config)
+        + SearchVector('description', weight='B', config=config)
+        + SearchVector(Cast('competences_requises', TextField()), weight='C', config=config)
+    )
+
+
+def rechercher_projets(queryset, texte):
+    """Filtre `queryset` sur `texte` et annote `rang` (0 hors PostgreSQL)."""
+    if est_postgresql(queryset):
+        requete = SearchQuery(texte, config=configuration(), search_type='websearch')
+        return queryset.filter(vecteur_recherche=requete).annotate(
+            rang=SearchRank(F('vecteur_recherche'), requete)
+        )
+
+    for mot in texte.split():
+        queryset = queryset.filter(
+            Q(titre__icontains=mot)
+            | Q(description__icontains=mot)
+            | Q(competences_requises__icontains=mot)
+        )
+    return queryset.annotate(rang=Value(0.0, output_field=FloatField()))
+
+
+def filtrer_competences(queryset, competences, champ='competences_normalisees'):
+    """
+    Ne garde que les entités (projets ou freelancers) ayant toutes les `competences`.
+
+    Passe par les liaisons normalisées (`champ`) : une jointure par compétence,
+    servie par les index (competence, entité), sans lire le JSON.
+    """
+    for competence in normaliser_competences(competences):
+        queryset = queryset.filter(**{f'{champ}__nom': competence})
+    return queryset
@@ -0,0 +1,66 @@
+"""
+Routage des lectures vers le réplica PostgreSQL (alias 'replica').
+
+Seules les vues marquées par LectureReplicaMixin lisent sur le réplica, et
+seulement pour un utilisateur qui n'a rien écrit depuis
+REPLICA_DELAI_COHERENCE secondes : il relit ainsi ses propres écritures
+malgré le retard de réplication.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import permissions
+
+ALIAS_REPLICA = 'replica'
+
+# Vrai pendant le traitement d'une vue autorisée à lire sur le réplica
+lecture_replica = ContextVar('lecture_replica', default=False)
+
+
+def replica_configure():
+    return ALIAS_REPLICA in settings.DATABASES
+
+
+def marquer_ecriture(utilisateur):
+    cache.set(f'replica:ecriture:{utilisateur.pk}', 1, getattr(settings, 'REPLICA_DELAI_COHERENCE', 10))
+
+
+def ecriture_recente(utilisateur):
+    return utilisateur.is_authenticated and cache.get(f'replica:ecriture:{utilisateur.pk}') is not None
+
+
+class RouteurReplica:
+    def db_for_read(self, model, **hints):
+        if lecture_replica.get() and replica_configure():
+            return ALIAS_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Les deux alias désignent les mêmes données
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Le réplica reçoit le schéma par la réplication
+        return db != ALIAS_REPLICA
+
+
+class LectureReplicaMixin:
+    """Les requêtes GET de la vue lisent sur le réplica, sauf juste après une écriture de l'utilisateur."""
+
+    def dispatch(self, request, *args, **kwargs):
+        # Restaure l'état précédent même si la vue lève une exception non gérée
+        jeton = lecture_replica.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            lecture_replica.reset(jeton)
+
+    def initial(self, request, *args, **kwargs):
+        # Après l'authentification : l'utilisateur est connu
+        super().initial(request, *args, **kwargs)
+        if request.method in permissions.SAFE_METHODS and not ecriture_recente(request.user):
+            lecture_replica.set(True)
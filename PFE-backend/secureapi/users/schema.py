@@ -0,0 +1,144 @@
+"""
+Schéma OpenAPI de l'API, généré une fois par version de l'application.
+
+Générer le schéma fait introspecter toutes les vues par drf_yasg, avec les
+décorateurs de swaggerDocumentation.py. La commande generer_schema_openapi,
+lancée au déploiement, écrit SCHEMA_OPENAPI_DOSSIER/openapi-<VERSION_APPLICATION>.json
+et .yaml, seulement si la version a changé. servir_schema renvoie ce fichier avec un ETag, et
+Swagger UI et ReDoc le chargent (SPEC_URL) au lieu de faire générer le schéma.
+
+Sans fichier pour la version courante (en développement), le schéma est généré
+au premier appel puis gardé en mémoire par le processus : runserver le
+recalcule à chaque rechargement du code.
+
+drf_yasg et swaggerDocumentation.py ne sont importés qu'ici, dans les fonctions
+qui en ont besoin : users/urls.py route les vues nues, et leur documentation
+n'est rattachée qu'au moment de générer le schéma (documenter).
+"""
+import hashlib
+import logging
+import os
+import tempfile
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_safe
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'json': 'application/json',
+    'yaml': 'application/yaml',
+}
+
+# {(format, version): (contenu, etag)} pour les schémas générés faute de fichier,
+# {chemin: (mtime, contenu, etag)} pour les fichiers lus, {interface: vue drf_yasg}
+_generes = {}
+_lus = {}
+_interfaces = {}
+
+
+def info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="API de Mise en Relation Freelancers & Clients",
+        default_version='v1',
+        description="Cette API permet la gestion des utilisateurs, des projets, des candidatures, et des interactions entre clients et freelancers.",
+        contact=openapi.Contact(email="moussamedwedouderebih@gmail.com"),
+        license=openapi.License(name="BSD License"),
+    )
+
+
+def documenter():
+    """Rattache aux vues routées par users/urls.py la documentation de swaggerDocumentation.py."""
+    from .swaggerDocumentation import VUES_DOCUMENTEES
+    from .urls import urlpatterns
+
+    for motif in urlpatterns:
+        if motif.name in VUES_DOCUMENTEES:
+            motif.callback._swagger_auto_schema = VUES_DOCUMENTEES[motif.name]._swagger_auto_schema
+
+
+def chemin(format_schema, version=None):
+    version = version or settings.VERSION_APPLICATION
+    return os.path.join(settings.SCHEMA_OPENAPI_DOSSIER, f"openapi-{version}.{format_schema}")
+
+
+def generer():
+    """{format: octets} du schéma complet, sans requête (hôte et schéma d'URL : ceux de la page)."""
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    documenter()
+    schema = OpenAPISchemaGenerator(info(), url=settings.SCHEMA_OPENAPI_URL).get_schema(request=None, public=True)
+    return {
+        'json': OpenAPICodecJson(validators=[]).encode(schema),
+        'yaml': OpenAPICodecYaml(validators=[]).encode(schema),
+    }
+
+
+def ecrire(contenus, version=None):
+    """Écrit les fichiers du schéma ; remplacement atomique, un worker ne lit jamais un fichier à moitié écrit."""
+    os.makedirs(settings.SCHEMA_OPENAPI_DOSSIER, exist_ok=True)
+    for format_schema, contenu in contenus.items():
+        descripteur, temporaire = tempfile.mkstemp(dir=settings.SCHEMA_OPENAPI_DOSSIER, suffix='.tmp')
+        with os.fdopen(descripteur, 'wb') as fichier:
+            fichier.write(contenu)
+        os.replace(temporaire, chemin(format_schema, version))
+
+
+def etag(contenu):
+    return f'"{hashlib.sha256(contenu).hexdigest()[:32]}"'
+
+
+def lire(format_schema):
+    """(contenu, etag) du schéma de la version courante."""
+    nom = chemin(format_schema)
+    try:
+        mtime = os.stat(nom).st_mtime_ns
+    except FileNotFoundError:
+        cle = (format_schema, settings.VERSION_APPLICATION)
+        if cle not in _generes:
+            logger.warning(
+                "Pas de schéma OpenAPI pour la version %s (manage.py generer_schema_openapi) : génération à la volée",
+                settings.VERSION_APPLICATION,
+            )
+            for autre, contenu in generer().items():
+                _generes[(autre, settings.VERSION_APPLICATION)] = (contenu, etag(contenu))
+        return _generes[cle]
+
+    if nom not in _lus or _lus[nom][0] != mtime:
+        with open(nom, 'rb') as fichier:
+            contenu = fichier.read()
+        _lus[nom] = (mtime, contenu, etag(contenu))
+    return _lus[nom][1:]
+
+
+@require_safe
+def servir_schema(request, format):
+    if format not in FORMATS:
+        raise Http404
+    contenu, valeur_etag = lire(format)
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and valeur_etag in parse_etags(if_none_match):
+        reponse = HttpResponseNotModified()
+    else:
+        reponse = HttpResponse(contenu, content_type=FORMATS[format])
+    reponse['ETag'] = valeur_etag
+    # L'URL ne change pas d'une version à l'autre : le navigateur revalide, 304 le plus souvent
+    reponse['Cache-Control'] = 'public, no-cache'
+    return reponse
+
+
+def documentation(request, interface):
+    """Pages Swagger UI et ReDoc (interface 'swagger' ou 'redoc') ; elles chargent le schéma depuis servir_schema."""
+    if interface not in _interfaces:
+        from drf_yasg.views import get_schema_view
+        from rest_framework import permissions
+
+        vue = get_schema_view(info(), public=True, permission_classes=(permissions.AllowAny,))
+        _interfaces[interface] = vue.with_ui(interface, cache_timeout=0)
+    return _interfaces[interface](request)
@@ -3,29 +3,68 @@ from .models import Utilisateur, Client, Freelancer, Administrateur
 from django.core.files.base import ContentFile
 import base64
 from django.db import connection
-from .models import Projet, Postulation, Evaluation, Notification
+from .models import Projet, Postulation, Evaluation, Notification, TeleversementCV
+from django.conf import settings
+from .images import urls_derives
+from .medias import url_cv_signee
+
+class PhotoDerivesField(serializers.Field):
+    """URL des vignettes de photo_profil ({'avatar': ..., 'carte': ...}), voir users/images.py."""
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, utilisateur):
+        request = self.context.get('request')
+        stockage = utilisateur.photo_profil.storage
+        def construire_url(nom):
+            url = stockage.url(nom)
+            return request.build_absolute_uri(url) if request else url
+        return urls_derives(utilisateur.photo_profil.name, utilisateur.photo_derives, construire_url)
+
+class CVSigneField(serializers.FileField):
+    """CV en écriture comme un FileField ; en lecture, URL signée et temporaire (voir users/medias.py)."""
+    def to_representation(self, valeur):
+        if not valeur:
+            return None
+        return url_cv_signee(valeur.name, self.context.get('request'))
 
 class UtilisateurSerializer(serializers.ModelSerializer):
+    photo_derives = PhotoDerivesField()
+
     class Meta:
         model = Utilisateur
         fields = [
             'id', 'email', 'nom_complet',
-            'numero_telephone', 'photo_profil',
+            'numero_telephone', 'photo_profil', 'photo_derives',
             'type_utilisateur'
         ]
         read_only_fields = ['id', 'type_utilisateur']
 
 class FreelancerSerializer(serializers.ModelSerializer):
+    photo_derives = PhotoDerivesField()
+    cv = CVSigneField(required=False, allow_null=True)
+
     class Meta:
         model = Freelancer
         fields = [
             'id', 'email', 'nom_complet',
-            'numero_telephone', 'photo_profil',
+            'numero_telephone', 'photo_profil', 'photo_derives',
             'type_utilisateur',
             'cv', 'specialisation',
             'intitule_poste', 'competences'
         ]
 
+class FreelancerRecommandeSerializer(FreelancerSerializer):
+    """Profil proposé à un client qui ne l'a pas reçu en candidature : ni CV ni téléphone."""
+
+    class Meta(FreelancerSerializer.Meta):
+        fields = [
+            'id', 'email', 'nom_complet', 'photo_profil', 'photo_derives',
+            'type_utilisateur', 'specialisation', 'intitule_poste', 'competences'
+        ]
+
 class ClientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Client
@@ -36,18 +75,40 @@ class AdministrateurSerializer(serializers.ModelSerializer):
         model = Administrateur
         fields = []
 
+class TeleversementCVSerializer(serializers.ModelSerializer):
+    empreinte = serializers.RegexField(
+        r'^[0-9a-f]{64}$', required=False,
+        help_text="SHA-256 (hexadécimal) du fichier, vérifié à la fin de l'envoi"
+    )
+
+    class Meta:
+        model = TeleversementCV
+        fields = ['id', 'nom_fichier', 'taille', 'empreinte', 'recu', 'statut', 'date_expiration']
+        read_only_fields = ['id', 'recu', 'statut', 'date_expiration']
+
+    def validate_taille(self, valeur):
+        if not 0 < valeur <= settings.CV_TAILLE_MAX:
+            raise serializers.ValidationError(f"La taille doit être comprise entre 1 et {settings.CV_TAILLE_MAX} octets")
+        return valeur
+
 class InscriptionUtilisateurSerializer(serializers.ModelSerializer):
     cv = serializers.FileField(required=False, allow_null=True)
+    # CV envoyé au préalable par blocs (cv/televersements/) : la requête d'inscription reste légère
+    cv_televersement = serializers.PrimaryKeyRelatedField(
+        queryset=TeleversementCV.objects.filter(statut='termine'),
+        required=False, allow_null=True, write_only=True
+    )
     specialisation = serializers.CharField(required=False)
     intitule_poste = serializers.CharField(required=False)
-    competences = serializers.ListField(child=serializers.CharField() , required=False)
+    competences = serializers.ListField(child=serializers.CharField(max_length=100), required=False)
+    photo_derives = PhotoDerivesField()
 
     class Meta:
         model = Utilisateur
         fields = [
             'email', 'password', 'nom_complet',
-            'numero_telephone', 'photo_profil',
-            'type_utilisateur', 'cv', 'specialisation',
+            'numero_telephone', 'photo_profil', 'photo_derives',
+            'type_utilisateur', 'cv', 'cv_televersement', 'specialisation',
             'intitule_poste', 'competences'
         ]
         extra_kwargs = {
@@ -55,9 +116,23 @@ class InscriptionUtilisateurSerializer(serializers.ModelSerializer):
             'photo_profil': {'required': False, 'allow_null': True}
         }
     
+    def validate_cv_televersement(self, televersement):
+        if televersement is not None and televersement.est_expire:
+            raise serializers.ValidationError("Cet envoi de CV a expiré")
+        return televersement
+
+    def validate(self, data):
+        if data.get('cv') and data.get('cv_televersement'):
+            raise serializers.ValidationError("Fournir `cv` ou `cv_televersement`, pas les deux")
+        return data
+
     def create(self, validated_data):
         # Extraction des données
         cv = validated_data.pop('cv', None)
+        televersement = validated_data.pop('cv_televersement', None)
+        if televersement is not None:
+            # Fichier déjà rangé sous son empreinte : seule sa référence est copiée
+            cv = televersement.fichier.name
         specialisation = validated_data.pop('specialisation', '')
         intitule_poste = validated_data.pop('intitule_poste', '')
         competences = validated_data.pop('competences', [])
@@ -84,6 +159,10 @@ class InscriptionUtilisateurSerializer(serializers.ModelSerializer):
                 is_active=False
             )
 
+        # Un envoi ne sert qu'à une inscription
+        if televersement is not None:
+            televersement.delete()
+
         # Gestion de la photo de profil
         if photo_profil:
             utilisateur.photo_profil = photo_profil
@@ -103,6 +182,45 @@ class ProjetSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'client', 'date_creation']
 
+class ProjetRechercheSerializer(ProjetSerializer):
+    rang = serializers.FloatField(read_only=True)
+
+    class Meta(ProjetSerializer.Meta):
+        fields = ProjetSerializer.Meta.fields + ['rang']
+
+class RechercheProjetsSerializer(serializers.Serializer):
+    """Paramètres de GET /api/projets/recherche/."""
+    q = serializers.CharField(required=False, max_length=200)
+    budget_min = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    budget_max = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    deadline_apres = serializers.DateField(required=False)
+    deadline_avant = serializers.DateField(required=False)
+    competences = serializers.CharField(required=False, help_text="Compétences séparées par des virgules")
+
+    def validate_competences(self, valeur):
+        return [competence.strip() for competence in valeur.split(',') if competence.strip()]
+
+    def validate(self, data):
+        if 'budget_min' in data and 'budget_max' in data and data['budget_min'] > data['budget_max']:
+            raise serializers.ValidationError("budget_min doit être inférieur ou égal à budget_max")
+        return data
+
+class DecisionsPostulationsSerializer(serializers.Serializer):
+    accepter = serializers.IntegerField(required=False, help_text="Candidature à accepter")
+    refuser = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list,
+        help_text="Candidatures à refuser"
+    )
+    refuser_autres = serializers.BooleanField(
+        required=False, default=True,
+        help_text="Avec `accepter` : refuser toutes les autres candidatures en attente"
+    )
+
+    def validate(self, data):
+        if 'accepter' not in data and not data['refuser']:
+            raise serializers.ValidationError("Indiquer une candidature à accepter ou des candidatures à refuser")
+        return data
+
 class PostulationSerializer(serializers.ModelSerializer):
     projet = ProjetSerializer(read_only=True)
     freelancer = serializers.StringRelatedField(read_only=True)
@@ -128,16 +246,24 @@ class EvaluationSerializer(serializers.ModelSerializer):
         fields = ['id', 'freelancer', 'note', 'date_creation', 'date_mise_a_jour']
         read_only_fields = ['id', 'date_creation', 'date_mise_a_jour']
 
+class NotificationListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # Résolution groupée des objets ciblés avant de rendre chaque message
+        notifications = list(data.all() if hasattr(data, 'all') else data)
+        Notification.precharger_cibles(notifications)
+        return super().to_representation(notifications)
+
 class NotificationSerializer(serializers.ModelSerializer):
     message = serializers.SerializerMethodField()
     type_display = serializers.CharField(source='get_type_notification_display', read_only=True)
     
     class Meta:
         model = Notification
+        list_serializer_class = NotificationListSerializer
         fields = [
             'id', 'type_notification', 'type_display',
             'message', 'date_creation',
-            'content_type', 'object_id'
+            'content_type', 'object_id', 'est_vue'
         ]
         read_only_fields = fields
 
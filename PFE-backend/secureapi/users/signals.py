@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalider
+from .models import (
+    Administrateur, Client, CompteurStatistique, Evaluation, Freelancer, FreelancerRatingStats,
+    Postulation, Projet, StatistiqueQuotidienne, Utilisateur,
+)
+
+# Les sous-classes et proxys émettent les signaux avec leur propre classe. Les
+# récepteurs sont connectés modèle par modèle : un récepteur sans `sender` sur
+# post_delete désactiverait la suppression rapide (fast delete) de tous les modèles.
+MODELES_UTILISATEUR = (Utilisateur, Client, Freelancer, Administrateur)
+
+
+def invalider_apres_commit(*espaces):
+    # Après le commit : un lecteur concurrent ne peut pas remettre en cache,
+    # sous la nouvelle version, des données lues avant le commit
+    transaction.on_commit(lambda: invalider(*espaces))
+
+
+@receiver(post_save, sender=Projet)
+@receiver(post_delete, sender=Projet)
+def invalider_projets(sender, **kwargs):
+    invalider_apres_commit('projets', 'freelancer_accepte', 'statistiques', 'correspondance_projets')
+
+
+@receiver(post_save, sender=Postulation)
+@receiver(post_delete, sender=Postulation)
+def invalider_postulations(sender, **kwargs):
+    # Une acceptation retire le projet du flux et change le freelancer accepté
+    invalider_apres_commit('projets', 'freelancer_accepte', 'correspondance_projets')
+
+
+# Champs modifiés à la connexion, sans effet sur les réponses en cache
+CHAMPS_SANS_EFFET = {'password', 'last_login'}
+
+
+def invalider_utilisateurs(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= CHAMPS_SANS_EFFET:
+        return
+    # Le client d'un projet est affiché par son nom dans le flux
+    espaces = ['projets', 'freelancer_accepte', 'correspondance_freelancers']
+    if kwargs.get('created', True):
+        espaces.append('statistiques')
+    invalider_apres_commit(*espaces)
+
+
+for modele in MODELES_UTILISATEUR:
+    post_save.connect(invalider_utilisateurs, sender=modele, dispatch_uid=f'invalider_utilisateurs_save_{modele.__name__}')
+    post_delete.connect(invalider_utilisateurs, sender=modele, dispatch_uid=f'invalider_utilisateurs_delete_{modele.__name__}')
+
+
+def compter(cle, delta):
+    if getattr(settings, 'STATISTIQUES_COMPTEURS', True):
+        CompteurStatistique.incrementer(cle, delta)
+
+
+def compter_creation_utilisateur(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        compter(f'utilisateurs:{instance.type_utilisateur}', 1)
+        StatistiqueQuotidienne.incrementer('inscriptions')
+
+
+def compter_suppression_utilisateur(sender, instance, **kwargs):
+    # Supprimer un Freelancer émet aussi le signal pour sa ligne parente
+    # Utilisateur : seule cette dernière est comptée
+    if instance._meta.concrete_model is Utilisateur:
+        compter(f'utilisateurs:{instance.type_utilisateur}', -1)
+
+
+for modele in MODELES_UTILISATEUR:
+    post_save.connect(compter_creation_utilisateur, sender=modele, dispatch_uid=f'compter_creation_{modele.__name__}')
+    post_delete.connect(compter_suppression_utilisateur, sender=modele, dispatch_uid=f'compter_suppression_{modele.__name__}')
+
+
+@receiver(post_save, sender=Projet)
+def compter_creation_projet(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        compter('projets', 1)
+        StatistiqueQuotidienne.incrementer('projets')
+
+
+@receiver(post_delete, sender=Projet)
+def compter_suppression_projet(sender, instance, **kwargs):
+    compter('projets', -1)
+
+
+@receiver(post_save, sender=Postulation)
+def compter_creation_postulation(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        StatistiqueQuotidienne.incrementer('postulations')
+
+
+@receiver(post_delete, sender=Evaluation)
+def retirer_evaluation(sender, instance, **kwargs):
+    # Signal plutôt que Evaluation.delete() : les suppressions par queryset
+    # (action « supprimer » de l'administration) passent aussi par ici.
+    # Sans création : quand le freelancer est supprimé, sa ligne l'est aussi.
+    FreelancerRatingStats.appliquer(
+        instance.freelancer_id,
+        delta_nombre=-1,
+        delta_somme=-getattr(instance, '_note_enregistree', instance.note),
+        creer=False
+    )
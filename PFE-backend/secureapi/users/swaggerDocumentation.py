@@ -109,6 +109,14 @@ inscription_params = [
         type=openapi.TYPE_FILE,
         required=False,
         description="Photo de profil (optionnel)"
+    ),
+    openapi.Parameter(
+        name='cv_televersement',
+        in_=openapi.IN_FORM,
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_UUID,
+        required=False,
+        description="Identifiant d'un CV envoyé au préalable par blocs via /api/cv/televersements/ (freelancer, optionnel)"
     )
 ]
 
@@ -156,7 +164,8 @@ VueInscription = swagger_auto_schema(
     - `client`: Utilisateur standard pouvant poster des projets
     - `freelancer`: Professionnel pouvant postuler aux projets
     
-    **Format des données**: multipart/form-data (pour supporter l'upload de photo)
+    **Format des données**: multipart/form-data (pour supporter l'upload de photo),
+    ou JSON quand le CV a été envoyé par blocs (`cv_televersement`)
     """,
     manual_parameters=inscription_params,
     responses=inscription_responses,
@@ -563,9 +572,23 @@ Retourne les informations de base de tous les utilisateurs sauf les administrate
 - URL de la photo de profil (si disponible)
 - Numéro de téléphone
 
+### Filtres et pagination:
+- `type` : `client` ou `freelancer`
+- `email` : préfixe de l'adresse email (insensible à la casse)
+- `cursor` / `page_size` : pagination par curseur, réponse `{next, results}`
+- `export` : `ndjson` ou `csv`, toute la sélection est renvoyée en flux
+
 ### Permissions:
-- Authentification requise
+- Réservé aux administrateurs
 """,
+    manual_parameters=[
+        openapi.Parameter('type', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['client', 'freelancer'], description="Type d'utilisateur"),
+        openapi.Parameter('email', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Préfixe de l'email"),
+        openapi.Parameter('competences', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Freelancers ayant toutes ces compétences (séparées par des virgules)"),
+        openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Curseur renvoyé dans `next`"),
+        openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Nombre de résultats par page"),
+        openapi.Parameter('export', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['ndjson', 'csv'], description="Export en flux"),
+    ],
     responses={
         200: openapi.Response(
             description="Liste des utilisateurs non administrateurs",
@@ -579,6 +602,12 @@ Retourne les informations de base de tous les utilisateurs sauf les administrate
                         'email': openapi.Schema(type=openapi.TYPE_STRING),
                         'type_utilisateur': openapi.Schema(type=openapi.TYPE_STRING),
                         'photo_profil': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_URI, nullable=True),
+                        'photo_derives': openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            nullable=True,
+                            description="Vignettes à afficher dans les listes (avatar, carte)",
+                            additional_properties=openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_URI),
+                        ),
                         'numero_telephone': openapi.Schema(type=openapi.TYPE_STRING),
                     }
                 )
@@ -586,6 +615,9 @@ Retourne les informations de base de tous les utilisateurs sauf les administrate
         ),
         401: openapi.Response(
             description="Non authentifié"
+        ),
+        403: openapi.Response(
+            description="Réservé aux administrateurs"
         )
     },
     tags=['Administration'],
@@ -657,4 +689,19 @@ Permet à un administrateur de supprimer définitivement un utilisateur (client
             required=True
         )
     ]
-)(AdminUserDeleteView.as_view())
\ No newline at end of file
+)(AdminUserDeleteView.as_view())
+swagger_auto_schema(query_serializer=RechercheProjetsSerializer)(ProjetRechercheView.get)
+
+# Documentation des routes de users/urls.py, par nom de route. Ce module n'est
+# importé qu'à la génération du schéma (users/schema.py), qui recopie la
+# documentation sur les vues réellement routées.
+VUES_DOCUMENTEES = {
+    'inscription-utilisateur': VueInscription,
+    'verifier-email': VueVerificationEmailDocumentee,
+    'renvoyer-verification': VueRenvoyerEmail,
+    'demande-reinitialisation': DocumentationPourVueDemandeReinitialisation,
+    'reinitialiser-mot-de-passe': DocumentationPourVueReinitialisationMotDePasse,
+    'admin-statistics': AdminStatisticsDocumentation,
+    'admin-users-list': ListeUtilisateursNonAdminDocumentation,
+    'admin-users-delete': AdminUserDeleteDocumentation,
+}
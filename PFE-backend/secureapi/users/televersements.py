@@ -0,0 +1,102 @@
+"""
+Envoi des CV par blocs, reprenable, avec stockage dédoublonné.
+
+1. POST cv/televersements/ {nom_fichier, taille[, empreinte]} ouvre un envoi ;
+2. PATCH cv/televersements/<id>/ (en-tête Upload-Offset = octets déjà reçus,
+   corps = octets bruts du bloc) ajoute un bloc au fichier partiel, lu en flux
+   par morceaux : ni le bloc ni le fichier ne sont gardés en mémoire. Le bloc
+   est réservé (TeleversementCV.reservation_bloc) dans une courte transaction
+   et reçu hors transaction : un client lent ne bloque ni ligne ni connexion ;
+3. GET cv/televersements/<id>/ indique l'octet où reprendre après une coupure.
+
+Au dernier bloc, le fichier partiel est haché (SHA-256, comparé à l'empreinte
+annoncée s'il y en a une) puis rangé dans le stockage sous
+cvs_freelancers/<empreinte>.<extension> ; si ce fichier existe déjà, le partiel
+est simplement supprimé. Les fichiers partiels vivent dans
+CV_TELEVERSEMENTS_DOSSIER, hors du stockage des médias : l'API Storage ne sait
+pas écrire en fin de fichier, et un envoi incomplet n'a pas à avoir d'URL.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files import File
+from django.http import UnreadablePostError
+from django.utils import timezone
+
+TAILLE_MORCEAU = 64 * 1024
+
+
+class EmpreinteIncorrecte(ValueError):
+    pass
+
+
+def dossier():
+    return settings.CV_TELEVERSEMENTS_DOSSIER
+
+
+def chemin_partiel(televersement):
+    return os.path.join(dossier(), f"{televersement.pk}.part")
+
+
+def ajouter_bloc(televersement, flux, longueur, limite=None):
+    """
+    Ajoute au fichier partiel au plus `longueur` octets lus dans `flux` ; retourne le nombre écrit.
+
+    Passé `limite` (fin de la réservation du bloc), plus rien n'est écrit : un
+    autre envoi a pu reprendre le fichier à partir de `recu`.
+    """
+    os.makedirs(dossier(), exist_ok=True)
+    ecrits = 0
+    with open(chemin_partiel(televersement), 'ab') as partiel:
+        # Un bloc interrompu avant son enregistrement a pu laisser des octets en trop
+        partiel.truncate(televersement.recu)
+        try:
+            while ecrits < longueur:
+                morceau = flux.read(min(TAILLE_MORCEAU, longueur - ecrits))
+                if not morceau or (limite is not None and timezone.now() > limite):
+                    break
+                partiel.write(morceau)
+                ecrits += len(morceau)
+        except UnreadablePostError:
+            # Connexion coupée : les octets reçus restent acquis, le client reprendra
+            pass
+    return ecrits
+
+
+def finaliser(televersement):
+    """
+    Range le fichier complet sous son empreinte et marque l'envoi comme terminé
+    (sans l'enregistrer). Lève EmpreinteIncorrecte si le contenu ne correspond
+    pas à l'empreinte annoncée ; l'envoi est alors remis à zéro.
+    """
+    chemin = chemin_partiel(televersement)
+    empreinte = hashlib.sha256()
+    with open(chemin, 'rb') as partiel:
+        for morceau in iter(lambda: partiel.read(TAILLE_MORCEAU), b''):
+            empreinte.update(morceau)
+    empreinte = empreinte.hexdigest()
+
+    if televersement.empreinte and televersement.empreinte != empreinte:
+        os.remove(chemin)
+        televersement.recu = 0
+        raise EmpreinteIncorrecte("Le contenu reçu ne correspond pas à l'empreinte annoncée.")
+
+    champ = televersement._meta.get_field('fichier')
+    extension = os.path.splitext(televersement.nom_fichier)[1].lower()
+    nom = f"{champ.upload_to}{empreinte[:2]}/{empreinte}{extension}"
+    if not champ.storage.exists(nom):
+        with open(chemin, 'rb') as partiel:
+            nom = champ.storage.save(nom, File(partiel))
+    os.remove(chemin)
+
+    televersement.empreinte = empreinte
+    televersement.fichier.name = nom
+    televersement.statut = 'termine'
+
+
+def supprimer_partiel(televersement):
+    try:
+        os.remove(chemin_partiel(televersement))
+    except FileNotFoundError:
+        pass
@@ -1,3 +1,1382 @@
-from django.test import TestCase
+import base64
+import csv
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from smtplib import SMTPException, SMTPRecipientsRefused, SMTPServerDisconnected
+from threading import Barrier, Thread, Timer
 
-# Create your tests here.
+from django.core.cache import cache
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.deletion import Collector
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient, APIRequestFactory
+
+from .authentication import CustomTokenObtainPairSerializer, JWTUtilisateurJetonAuthentication
+from .cache import calculer_une_fois
+from .correspondance import IndexCompetences, normaliser_competences
+from .emails import envoyer_lot, mettre_en_file
+from . import schema
+from .medias import url_cv_signee
+from .models import (
+    Administrateur, Client, Competence, CompteurStatistique, EmailSortant, Evaluation, Freelancer,
+    FreelancerCompetence, FreelancerRatingStats, JetonUtilisateur, Notification, Postulation, Projet,
+    ProjetCompetence, StatistiqueQuotidienne, TeleversementCV,
+)
+from .serializers import FreelancerSerializer
+from .televersements import ajouter_bloc
+from .views import AdminStatisticsView, NotificationNonVuesCountView
+
+
+def creer_client(email='client@example.com'):
+    return Client.objects.create_user(
+        email=email,
+        password='motdepasse',
+        nom_complet='Client Test',
+        numero_telephone='44076356',
+        type_utilisateur='client',
+        is_active=True,
+    )
+
+
+def creer_freelancer(email='freelancer@example.com', competences=()):
+    return Freelancer.objects.create_user(
+        email=email,
+        password='motdepasse',
+        nom_complet='Freelancer Test',
+        numero_telephone='44076356',
+        type_utilisateur='freelancer',
+        is_active=True,
+        specialisation='Développement',
+        intitule_poste='Développeur',
+        competences=list(competences),
+    )
+
+
+def creer_administrateur(email='admin@example.com'):
+    return Administrateur.objects.create_user(
+        email=email,
+        password='motdepasse',
+        nom_complet='Admin Test',
+        numero_telephone='44076356',
+        type_utilisateur='administrateur',
+        is_active=True,
+        is_staff=True,
+    )
+
+
+def creer_projet(client, titre='Projet'):
+    return Projet.objects.create(
+        client=client,
+        titre=titre,
+        description='Description',
+        budget_min=100,
+        budget_max=200,
+        deadline=timezone.now().date(),
+    )
+
+
+class ClientProjetsAvecPostulationsTests(TestCase):
+    def setUp(self):
+        self.client_proprietaire = creer_client()
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_proprietaire)
+        self.nb_freelancers = 0
+
+    def ajouter_projet(self, nb_postulations):
+        projet = creer_projet(self.client_proprietaire)
+        for _ in range(nb_postulations):
+            self.nb_freelancers += 1
+            freelancer = creer_freelancer(f'freelancer{self.nb_freelancers}@example.com')
+            Evaluation.objects.create(freelancer=freelancer, note=4)
+            Postulation.objects.create(projet=projet, freelancer=freelancer, message='Motivation')
+
+    def test_nombre_de_requetes_constant(self):
+        self.ajouter_projet(1)
+        with self.assertNumQueries(2):
+            self.api.get('/api/client/mes-projets/')
+
+        for _ in range(3):
+            self.ajouter_projet(5)
+        with self.assertNumQueries(2):
+            reponse = self.api.get('/api/client/mes-projets/')
+
+        self.assertEqual(len(reponse.data), 4)
+        self.assertEqual(sum(len(p['postulations']) for p in reponse.data), 16)
+
+    def test_moyenne_des_notes(self):
+        projet = creer_projet(self.client_proprietaire)
+        freelancer = creer_freelancer()
+        Evaluation.objects.create(freelancer=freelancer, note=3)
+        Evaluation.objects.create(freelancer=freelancer, note=4)
+        Postulation.objects.create(projet=projet, freelancer=freelancer, message='Motivation')
+        sans_note = creer_freelancer('sans-note@example.com')
+        Postulation.objects.create(projet=projet, freelancer=sans_note, message='Motivation')
+
+        reponse = self.api.get('/api/client/mes-projets/')
+
+        notes = {
+            p['freelancer']['email']: p['freelancer']['moyenne_notes']
+            for p in reponse.data[0]['postulations']
+        }
+        self.assertEqual(notes, {'freelancer@example.com': 3.5, 'sans-note@example.com': 0})
+
+
+class FreelancerRatingStatsTests(TestCase):
+    def setUp(self):
+        self.client_proprietaire = creer_client()
+        self.freelancer = creer_freelancer()
+        projet = creer_projet(self.client_proprietaire)
+        Postulation.objects.create(projet=projet, freelancer=self.freelancer, message='Motivation').accepter()
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_proprietaire)
+
+    def evaluer(self, note):
+        return self.api.post(f'/api/freelancers/{self.freelancer.pk}/evaluations/', {'note': note})
+
+    def test_mise_a_jour_incrementale(self):
+        self.assertEqual(self.evaluer(5).status_code, 201)
+        self.assertEqual(self.evaluer('2').status_code, 200)
+
+        stats = FreelancerRatingStats.objects.get(freelancer=self.freelancer)
+        evaluation = Evaluation.objects.get(freelancer=self.freelancer)
+        self.assertEqual(evaluation.note, 3)
+        self.assertEqual((stats.nombre_evaluations, stats.somme_notes, stats.moyenne_notes), (1, 3, 3.0))
+
+    def test_note_invalide(self):
+        self.assertEqual(self.evaluer('abc').status_code, 400)
+        self.assertFalse(FreelancerRatingStats.objects.exists())
+
+    def test_suppression_par_queryset(self):
+        Evaluation.objects.create(freelancer=self.freelancer, note=4)
+        Evaluation.objects.create(freelancer=self.freelancer, note=2)
+        Evaluation.objects.filter(note=4).delete()
+
+        stats = FreelancerRatingStats.objects.get(freelancer=self.freelancer)
+        self.assertEqual((stats.nombre_evaluations, stats.somme_notes, stats.moyenne_notes), (1, 2, 2.0))
+
+        self.freelancer.delete()
+        self.assertFalse(FreelancerRatingStats.objects.exists())
+
+    def test_reconstruction(self):
+        autre = creer_freelancer('autre@example.com')
+        Evaluation.objects.create(freelancer=autre, note=4)
+        Evaluation.objects.create(freelancer=autre, note=1)
+        FreelancerRatingStats.objects.update(nombre_evaluations=0, somme_notes=0, moyenne_notes=0)
+
+        call_command('reconstruire_statistiques_notes', stdout=StringIO())
+
+        stats = FreelancerRatingStats.objects.get(freelancer=autre)
+        self.assertEqual((stats.nombre_evaluations, stats.somme_notes, stats.moyenne_notes), (2, 5, 2.5))
+
+
+class NotificationMessagesTests(TestCase):
+    def setUp(self):
+        self.client_proprietaire = creer_client()
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_proprietaire)
+
+    def creer_notifications(self, nombre):
+        for i in range(nombre):
+            projet = creer_projet(self.client_proprietaire, f'Projet {i}')
+            postulation = Postulation.objects.create(
+                projet=projet,
+                freelancer=creer_freelancer(f'freelancer{i}@example.com'),
+                message='Motivation'
+            )
+            Notification.objects.create(
+                utilisateur=self.client_proprietaire,
+                type_notification='projet_publie',
+                content_object=projet
+            )
+            Notification.objects.create(
+                utilisateur=self.client_proprietaire,
+                type_notification='nouvelle_candidature',
+                content_object=postulation
+            )
+
+    def test_instantane_a_la_creation(self):
+        self.creer_notifications(1)
+        Projet.objects.all().delete()
+
+        reponse = self.api.get('/api/notifications/')
+
+        self.assertEqual(reponse.data[0]['message'], "Nouvelle candidature reçue pour votre projet Projet 0")
+        self.assertEqual(reponse.data[1]['message'], "Votre projet Projet 0 a été publié avec succès")
+
+    def test_anciennes_notifications_resolues_en_lot(self):
+        self.creer_notifications(5)
+        Notification.objects.update(titre_projet='', message_rendu='')
+
+        # Notifications, puis une requête par type ciblé (projets, postulations avec projet)
+        with self.assertNumQueries(3):
+            reponse = self.api.get('/api/notifications/')
+        self.assertEqual(len(reponse.data), 10)
+        self.assertIn("Nouvelle candidature reçue pour votre projet Projet", reponse.data[0]['message'])
+
+        call_command('figer_notifications', stdout=StringIO())
+        with self.assertNumQueries(1):
+            self.api.get('/api/notifications/')
+
+
+class NotificationsNonVuesTests(TestCase):
+    def setUp(self):
+        self.utilisateur = creer_client()
+        self.api = APIClient()
+        self.api.force_authenticate(self.utilisateur)
+        projet = creer_projet(self.utilisateur)
+        self.notifications = [
+            Notification.objects.create(
+                utilisateur=self.utilisateur,
+                type_notification='projet_publie',
+                content_object=projet
+            )
+            for _ in range(5)
+        ]
+
+    def test_compteur_et_marquage(self):
+        self.assertEqual(self.api.get('/api/notifications/unread-count/').data, {'non_vues': 5})
+
+        reponse = self.api.patch(f'/api/notifications/{self.notifications[0].pk}/vue/')
+        self.assertEqual(reponse.status_code, 200)
+        self.assertEqual(self.api.get('/api/notifications/unread-count/').data, {'non_vues': 4})
+
+        self.api.post('/api/notifications/marquer-toutes-vues/')
+        self.assertEqual(self.api.get('/api/notifications/unread-count/').data, {'non_vues': 0})
+
+    def test_marquage_reserve_au_proprietaire(self):
+        autre = APIClient()
+        autre.force_authenticate(creer_client('autre@example.com'))
+        reponse = autre.patch(f'/api/notifications/{self.notifications[0].pk}/vue/')
+        self.assertEqual(reponse.status_code, 404)
+
+    def test_pagination_par_curseur(self):
+        premiere = self.api.get('/api/notifications/', {'page_size': 3}).data
+        seconde = self.api.get(premiere['next']).data
+
+        ids = [n['id'] for n in premiere['results'] + seconde['results']]
+        self.assertEqual(ids, [n.pk for n in reversed(self.notifications)])
+        self.assertIsNone(seconde['next'])
+
+
+class CurseurPaginationTests(TestCase):
+    def setUp(self):
+        self.utilisateur = creer_client()
+        self.api = APIClient()
+        self.api.force_authenticate(self.utilisateur)
+        projet = creer_projet(self.utilisateur)
+        notifications = [
+            Notification.objects.create(
+                utilisateur=self.utilisateur,
+                type_notification='projet_publie',
+                content_object=projet
+            )
+            for _ in range(7)
+        ]
+        # Dates égales deux à deux : l'ordre est départagé par l'id
+        debut = timezone.now()
+        for i, notification in enumerate(notifications):
+            Notification.objects.filter(pk=notification.pk).update(
+                date_creation=debut - timedelta(minutes=i // 2)
+            )
+        # Ordre attendu : date décroissante, puis id décroissant
+        self.ordre = [
+            n.pk for i, n in sorted(enumerate(notifications), key=lambda paire: (paire[0] // 2, -paire[1].pk))
+        ]
+
+    def curseur(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def test_parcours_sans_doublon_ni_trou(self):
+        ids = []
+        # Pages de 3 : chaque fin de page coupe une paire de dates égales
+        reponse = self.api.get('/api/notifications/', {'page_size': 3})
+        while True:
+            self.assertLessEqual(len(reponse.data['results']), 3)
+            ids += [n['id'] for n in reponse.data['results']]
+            suivante = reponse.data['next']
+            if suivante is None:
+                break
+            self.assertIn('cursor=', suivante)
+            self.assertIn('page_size=3', suivante)
+            reponse = self.api.get(suivante)
+
+        self.assertEqual(ids, self.ordre)
+
+    def test_derniere_page_sans_lien_suivant(self):
+        reponse = self.api.get('/api/notifications/', {'page_size': 7})
+        self.assertEqual(len(reponse.data['results']), 7)
+        self.assertIsNone(reponse.data['next'])
+
+    def test_curseur_invalide(self):
+        curseurs = (
+            'pas-du-base64!',
+            self.curseur(['pas une date', 1]),
+            self.curseur([timezone.now().isoformat(), 'x']),
+            self.curseur({'a': 1}),
+        )
+        for curseur in curseurs:
+            reponse = self.api.get('/api/notifications/', {'cursor': curseur})
+            self.assertEqual(reponse.status_code, 404, curseur)
+
+    def test_liste_sans_pagination(self):
+        reponse = self.api.get('/api/notifications/')
+        self.assertEqual([n['id'] for n in reponse.data], self.ordre)
+
+
+class BackendEnEchec(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException("Serveur SMTP indisponible")
+
+
+class BackendJournalise(BaseEmailBackend):
+    """Refuse les destinataires 'refuse@…', coupe la connexion pour 'coupure@…'."""
+    journal = []
+
+    def close(self):
+        self.journal.append('fermeture')
+
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            destinataire = message.to[0]
+            self.journal.append(EmailSortant.objects.get(destinataires=[destinataire]).statut)
+            if destinataire.startswith('refuse@'):
+                raise SMTPRecipientsRefused({destinataire: (550, b'Inconnu')})
+            if destinataire.startswith('coupure@'):
+                raise SMTPServerDisconnected('Connexion perdue')
+        return len(email_messages)
+
+
+class FileEmailsTests(TestCase):
+    def test_acceptation_met_les_emails_en_file(self):
+        client_proprietaire = creer_client()
+        postulation = Postulation.objects.create(
+            projet=creer_projet(client_proprietaire),
+            freelancer=creer_freelancer(),
+            message='Motivation'
+        )
+        api = APIClient()
+        api.force_authenticate(client_proprietaire)
+
+        api.patch(f'/api/postulations/{postulation.pk}/accepter/')
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailSortant.objects.filter(statut='en_attente').count(), 2)
+
+        call_command('envoyer_emails', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox),
+            ['client@example.com', 'freelancer@example.com']
+        )
+        self.assertEqual(EmailSortant.objects.filter(statut='envoye').count(), 2)
+
+    @override_settings(
+        EMAIL_BACKEND='users.tests.BackendEnEchec',
+        EMAIL_TENTATIVES_MAX=2,
+        EMAIL_DELAI_NOUVELLE_TENTATIVE=60,
+    )
+    def test_nouvelles_tentatives_puis_echec(self):
+        email = mettre_en_file('Sujet', 'Message', ['destinataire@example.com'])
+
+        call_command('envoyer_emails', stdout=StringIO())
+        email.refresh_from_db()
+        self.assertEqual((email.statut, email.tentatives), ('en_attente', 1))
+        self.assertGreater(email.prochaine_tentative, email.date_creation)
+        self.assertIn('SMTP', email.derniere_erreur)
+
+        EmailSortant.objects.update(prochaine_tentative=email.date_creation)
+        call_command('envoyer_emails', stdout=StringIO())
+        email.refresh_from_db()
+        self.assertEqual((email.statut, email.tentatives), ('echec', 2))
+
+    @override_settings(EMAIL_BACKEND='users.tests.BackendJournalise')
+    def test_connexion_rouverte_seulement_apres_une_coupure(self):
+        BackendJournalise.journal = []
+        for destinataire in ('a@example.com', 'refuse@example.com', 'b@example.com', 'coupure@example.com'):
+            mettre_en_file('Sujet', 'Message', [destinataire])
+
+        self.assertEqual(envoyer_lot(), (2, 2))
+
+        # Messages réservés pendant l'envoi ; le refus d'un destinataire garde la connexion
+        self.assertEqual(
+            BackendJournalise.journal,
+            ['en_cours'] * 4 + ['fermeture', 'fermeture']
+        )
+        self.assertEqual(
+            dict(EmailSortant.objects.values_list('destinataires__0', 'statut')),
+            {
+                'a@example.com': 'envoye', 'b@example.com': 'envoye',
+                'refuse@example.com': 'en_attente', 'coupure@example.com': 'en_attente',
+            }
+        )
+
+    def test_bail_expire_repris(self):
+        maintenant = timezone.now()
+        expire = mettre_en_file('Sujet', 'Message', ['expire@example.com'])
+        reserve = mettre_en_file('Sujet', 'Message', ['reserve@example.com'])
+        EmailSortant.objects.filter(pk=expire.pk).update(statut='en_cours', prochaine_tentative=maintenant - timedelta(seconds=1))
+        EmailSortant.objects.filter(pk=reserve.pk).update(statut='en_cours', prochaine_tentative=maintenant + timedelta(minutes=5))
+
+        self.assertEqual(envoyer_lot(), (1, 0))
+        self.assertEqual([m.to for m in mail.outbox], [['expire@example.com']])
+        reserve.refresh_from_db()
+        self.assertEqual(reserve.statut, 'en_cours')
+
+
+class JetonsTests(TestCase):
+    def setUp(self):
+        self.utilisateur = creer_client()
+        self.api = APIClient()
+
+    def test_seule_l_empreinte_est_stockee(self):
+        jeton = self.utilisateur.generer_jeton_reinitialisation()
+
+        enregistre = JetonUtilisateur.objects.get(utilisateur=self.utilisateur)
+        self.assertNotEqual(enregistre.empreinte, jeton)
+        self.assertEqual(JetonUtilisateur.objects.trouver(jeton, 'reinitialisation'), enregistre)
+        self.assertIsNone(JetonUtilisateur.objects.trouver(jeton, 'verification'))
+
+    def test_reinitialisation_consomme_le_jeton(self):
+        jeton = self.utilisateur.generer_jeton_reinitialisation()
+        url = f'/api/mot-de-passe/reinitialiser/{jeton}/'
+
+        reponse = self.api.post(url, {'password': 'NouveauMotDePasse123!'})
+
+        self.assertEqual(reponse.status_code, 200)
+        self.utilisateur.refresh_from_db()
+        self.assertTrue(self.utilisateur.check_password('NouveauMotDePasse123!'))
+        self.assertEqual(self.api.post(url, {'password': 'Autre123!'}).status_code, 400)
+
+    def test_verification_email(self):
+        utilisateur = creer_client('inactif@example.com')
+        utilisateur.is_active = False
+        utilisateur.save()
+        jeton = utilisateur.generer_jeton_verification()
+
+        reponse = self.api.get(f'/api/utilisateur/verifier/{jeton}/')
+
+        self.assertIn('status=success', reponse['Location'])
+        utilisateur.refresh_from_db()
+        self.assertTrue(utilisateur.is_active)
+        self.assertFalse(JetonUtilisateur.objects.filter(utilisateur=utilisateur).exists())
+
+    def test_purge_des_jetons_expires(self):
+        self.utilisateur.generer_jeton_verification()
+        self.utilisateur.generer_jeton_reinitialisation()
+        JetonUtilisateur.objects.filter(objet='verification').update(
+            date_expiration=timezone.now() - timedelta(minutes=1)
+        )
+
+        call_command('purger_jetons', stdout=StringIO())
+
+        self.assertEqual(list(JetonUtilisateur.objects.values_list('objet', flat=True)), ['reinitialisation'])
+
+
+class ConnexionTests(TestCase):
+    def setUp(self):
+        self.utilisateur = creer_client()
+        self.api = APIClient()
+
+    def connecter(self, password='motdepasse'):
+        return self.api.post('/api/token/', {'email': 'CLIENT@example.com ', 'password': password})
+
+    def test_connexion(self):
+        with self.assertNumQueries(1):
+            reponse = self.connecter()
+        self.assertEqual(reponse.status_code, 200)
+        self.assertEqual(reponse.data['user_type'], 'client')
+        self.assertEqual(self.connecter('mauvais').status_code, 400)
+
+    def test_rehachage_transparent(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1234):
+            # Lecture de l'utilisateur puis réécriture de l'empreinte avec le nouveau coût
+            with self.assertNumQueries(2):
+                self.assertEqual(self.connecter().status_code, 200)
+            self.utilisateur.refresh_from_db()
+            self.assertTrue(self.utilisateur.password.startswith('pbkdf2_sha256$1234$'))
+            with self.assertNumQueries(1):
+                self.assertEqual(self.connecter().status_code, 200)
+
+
+class AuthentificationSansEtatTests(TestCase):
+    def setUp(self):
+        self.utilisateur = creer_client()
+        jeton = CustomTokenObtainPairSerializer().get_token(self.utilisateur).access_token
+        self.requete = APIRequestFactory().get(
+            '/api/notifications/unread-count/',
+            HTTP_AUTHORIZATION=f'Bearer {jeton}',
+        )
+
+    def test_aucune_requete_pour_charger_l_utilisateur(self):
+        vue = NotificationNonVuesCountView.as_view(
+            authentication_classes=[JWTUtilisateurJetonAuthentication]
+        )
+        with self.assertNumQueries(1):
+            reponse = vue(self.requete)
+        self.assertEqual(reponse.data, {'non_vues': 0})
+
+    def test_chargement_paresseux(self):
+        utilisateur, _ = JWTUtilisateurJetonAuthentication().authenticate(self.requete)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(utilisateur.pk, self.utilisateur.pk)
+            self.assertEqual(utilisateur.type_utilisateur, 'client')
+            self.assertEqual(utilisateur, self.utilisateur)
+        with self.assertNumQueries(1):
+            self.assertEqual(utilisateur.email, 'client@example.com')
+            self.assertEqual(utilisateur.nom_complet, 'Client Test')
+
+    def test_utilisateur_supprime(self):
+        # IsAdminUser lit is_staff, absent du jeton : la ligne est chargée
+        vue = AdminStatisticsView.as_view(authentication_classes=[JWTUtilisateurJetonAuthentication])
+        self.utilisateur.delete()
+
+        reponse = vue(self.requete)
+
+        self.assertEqual(reponse.status_code, 401)
+        self.assertEqual(reponse.data['code'], 'user_not_found')
+
+    def test_egalite_limitee_aux_utilisateurs(self):
+        utilisateur, _ = JWTUtilisateurJetonAuthentication().authenticate(self.requete)
+        projet = Projet(pk=self.utilisateur.pk, client=self.utilisateur, titre='Projet')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(utilisateur, self.utilisateur)
+            self.assertNotEqual(utilisateur, projet)
+
+
+class CacheReponsesTests(TestCase):
+    def setUp(self):
+        # Le cache survit au rollback de la base entre les tests
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client_proprietaire = creer_client()
+        self.projet = creer_projet(self.client_proprietaire)
+        self.freelancer = creer_freelancer()
+        self.api = APIClient()
+        self.api.force_authenticate(self.freelancer)
+
+    def test_flux_servi_depuis_le_cache_puis_invalide(self):
+        self.api.get('/api/projets/')
+        with self.assertNumQueries(0):
+            reponse = self.api.get('/api/projets/')
+        self.assertEqual(len(reponse.data), 1)
+
+        # Invalidation au commit : avant, la version en cache reste servie
+        with self.captureOnCommitCallbacks(execute=True):
+            creer_projet(self.client_proprietaire, 'Deuxième projet')
+            self.assertEqual(len(self.api.get('/api/projets/').data), 1)
+        self.assertEqual(len(self.api.get('/api/projets/').data), 2)
+
+    def test_acceptation_retire_le_projet_du_flux(self):
+        postulation = Postulation.objects.create(
+            projet=self.projet, freelancer=self.freelancer, message='Motivation'
+        )
+        self.assertEqual(len(self.api.get('/api/projets/').data), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            postulation.accepter()
+
+        self.assertEqual(self.api.get('/api/projets/').data, [])
+
+    def test_freelancer_accepte_par_utilisateur(self):
+        Postulation.objects.create(
+            projet=self.projet, freelancer=self.freelancer, message='Motivation'
+        ).accepter()
+        url = f'/api/projets/{self.projet.pk}/freelancer-accepte/'
+        proprietaire = APIClient()
+        proprietaire.force_authenticate(self.client_proprietaire)
+        self.assertEqual(proprietaire.get(url).data['email'], 'freelancer@example.com')
+
+        autre = APIClient()
+        autre.force_authenticate(creer_client('autre@example.com'))
+        self.assertEqual(autre.get(url).status_code, 403)
+
+    def test_un_seul_calcul_concurrent(self):
+        # Un autre worker détient le verrou et publie la valeur peu après
+        cache.add('cle:verrou', 1)
+        Timer(0.05, cache.set, ('cle', 'valeur')).start()
+
+        valeur = calculer_une_fois('cle', 60, lambda: self.fail('recalcul inutile'))
+
+        self.assertEqual(valeur, 'valeur')
+
+    @override_settings(CACHE_DUREE_VERROU=0.05)
+    def test_verrou_d_un_autre_processus_conserve(self):
+        # Attente vaine : la valeur est calculée, mais le verrou de l'autre worker reste en place
+        cache.add('cle:verrou', 1)
+        self.assertEqual(calculer_une_fois('cle', 60, lambda: 'calculee'), 'calculee')
+        self.assertEqual(cache.get('cle:verrou'), 1)
+
+        calculer_une_fois('autre', 60, lambda: 'calculee')
+        self.assertIsNone(cache.get('autre:verrou'))
+
+    def test_suppression_rapide_preservee(self):
+        # Aucun récepteur global de post_delete : les suppressions en masse restent des DELETE directs
+        collecteur = Collector(using='default', origin=None)
+        for modele in (JetonUtilisateur, Notification, StatistiqueQuotidienne, EmailSortant, FreelancerCompetence):
+            self.assertTrue(collecteur.can_fast_delete(modele.objects.all()), modele.__name__)
+
+
+class StatistiquesAdminTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.admin = creer_administrateur()
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+        client = creer_client()
+        creer_projet(client)
+        self.projet = creer_projet(client, 'Deuxième projet')
+        self.freelancer = creer_freelancer()
+        creer_freelancer('autre@example.com').delete()
+
+    def test_compteurs_maintenus_par_signaux(self):
+        attendu = {'clients': 1, 'freelancers': 1, 'admins': 1, 'projects': 2}
+        with self.assertNumQueries(1):
+            reponse = self.api.get('/api/admin/statistiques/')
+        self.assertEqual(reponse.data, attendu)
+        self.assertEqual(CompteurStatistique.objects.get(cle='utilisateurs:freelancer').valeur, 1)
+
+    @override_settings(STATISTIQUES_COMPTEURS=False)
+    def test_requete_d_agregat_unique(self):
+        with self.assertNumQueries(1):
+            reponse = self.api.get('/api/admin/statistiques/')
+        self.assertEqual(reponse.data, {'clients': 1, 'freelancers': 1, 'admins': 1, 'projects': 2})
+
+    def test_evolution_et_taux_d_acceptation(self):
+        Postulation.objects.create(projet=self.projet, freelancer=self.freelancer, message='Motivation').accepter()
+        Postulation.objects.create(
+            projet=Projet.objects.exclude(pk=self.projet.pk).get(),
+            freelancer=self.freelancer,
+            message='Motivation'
+        )
+
+        reponse = self.api.get('/api/admin/statistiques/evolution/', {'periode': 'semaine'})
+
+        self.assertEqual(len(reponse.data), 1)
+        semaine = reponse.data[0]
+        self.assertEqual(semaine['inscriptions'], 4)
+        self.assertEqual(semaine['projets'], 2)
+        self.assertEqual(semaine['postulations'], 2)
+        self.assertEqual(semaine['taux_acceptation'], 0.5)
+
+    def test_evolution_jours_invalides(self):
+        for jours in ('0', '-5', 'abc'):
+            reponse = self.api.get('/api/admin/statistiques/evolution/', {'jours': jours})
+            self.assertEqual(reponse.status_code, 400, jours)
+
+
+class ListeUtilisateursTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(creer_administrateur())
+        creer_client('a-client@example.com')
+        for i in range(3):
+            creer_client(f'client{i}@example.com')
+            creer_freelancer(f'freelancer{i}@example.com')
+
+    def test_filtres_type_et_prefixe_email(self):
+        reponse = self.api.get('/api/users/', {'type': 'freelancer', 'email': 'FREELANCER1'})
+        self.assertEqual([u['email'] for u in reponse.data], ['freelancer1@example.com'])
+        self.assertEqual(reponse.data[0]['type_utilisateur'], 'Freelancer')
+
+    def test_pagination_par_curseur(self):
+        emails = []
+        url, params = '/api/users/', {'type': 'client', 'page_size': 3}
+        while url:
+            reponse = self.api.get(url, params)
+            emails += [u['email'] for u in reponse.data['results']]
+            url, params = reponse.data['next'], None
+        self.assertEqual(len(emails), 4)
+        self.assertEqual(len(set(emails)), 4)
+
+    def test_export_ndjson_et_csv(self):
+        reponse = self.api.get('/api/users/', {'export': 'ndjson', 'type': 'client'})
+        lignes = b''.join(reponse.streaming_content).decode().splitlines()
+        self.assertEqual(len(lignes), 4)
+        self.assertEqual(json.loads(lignes[0])['email'], 'a-client@example.com')
+
+        reponse = self.api.get('/api/users/', {'export': 'csv'})
+        lignes = b''.join(reponse.streaming_content).decode().splitlines()
+        self.assertEqual(lignes[0], 'id,nom_complet,email,type_utilisateur,photo_profil,numero_telephone')
+        self.assertEqual(len(lignes), 8)
+
+    def test_reserve_aux_administrateurs(self):
+        client = APIClient()
+        client.force_authenticate(Client.objects.get(email='client0@example.com'))
+        self.assertEqual(client.get('/api/users/').status_code, 403)
+        self.assertEqual(client.get('/api/users/', {'export': 'csv'}).status_code, 403)
+
+    def test_export_csv_sans_formules(self):
+        Client.objects.filter(email='client0@example.com').update(nom_complet='=HYPERLINK("http://x")')
+        reponse = self.api.get('/api/users/', {'export': 'csv', 'email': 'client0'})
+        lignes = list(csv.reader(b''.join(reponse.streaming_content).decode().splitlines()))
+        self.assertEqual(lignes[1][1], '\'=HYPERLINK("http://x")')
+
+
+@skipUnless('replica' in settings.DATABASES, "Nécessite --settings=secureapi.settings_test_replica")
+@override_settings(CACHE_TTL={})
+class RoutageReplicaTests(TransactionTestCase):
+    # Base de test en miroir : seules des données validées sont visibles du réplica
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.projet = creer_projet(creer_client())
+        self.freelancer = creer_freelancer()
+        self.api = APIClient()
+        self.api.force_authenticate(self.freelancer)
+
+    def lire_projets(self, api):
+        with CaptureQueriesContext(connections['default']) as principale, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            reponse = api.get('/api/projets/')
+        self.assertEqual(reponse.status_code, 200)
+        return len(principale), len(replica)
+
+    def test_lecture_sur_le_replica(self):
+        principale, replica = self.lire_projets(self.api)
+        self.assertEqual(principale, 0)
+        self.assertGreater(replica, 0)
+
+    def test_relit_ses_propres_ecritures_sur_la_base_principale(self):
+        reponse = self.api.post(f'/api/projets/{self.projet.pk}/postuler/', {'message': 'Motivation'})
+        self.assertEqual(reponse.status_code, 201)
+
+        principale, replica = self.lire_projets(self.api)
+        self.assertGreater(principale, 0)
+        self.assertEqual(replica, 0)
+
+        # Les autres utilisateurs continuent de lire sur le réplica
+        autre = APIClient()
+        autre.force_authenticate(creer_freelancer('autre@example.com'))
+        self.assertEqual(self.lire_projets(autre)[0], 0)
+
+    @override_settings(CACHE_TTL={'projets': 60})
+    def test_cache_sans_lectures_perimees_du_replica(self):
+        autre = APIClient()
+        autre.force_authenticate(creer_freelancer('autre@example.com'))
+        # Invalidation récente (setUp) : la lecture sur le réplica n'est pas mise en cache
+        self.assertGreater(self.lire_projets(autre)[1], 0)
+        self.assertGreater(self.lire_projets(autre)[1], 0)
+
+        cache.delete('invalidation:projets')  # REPLICA_DELAI_COHERENCE écoulé
+        self.lire_projets(autre)
+        self.assertEqual(self.lire_projets(autre), (0, 0))
+
+        self.api.post(f'/api/projets/{self.projet.pk}/postuler/', {'message': 'Motivation'})
+        # L'auteur relit sur la base principale, les autres sur le réplica sans remplir le cache
+        principale, replica = self.lire_projets(self.api)
+        self.assertGreater(principale, 0)
+        self.assertEqual(replica, 0)
+        self.assertGreater(self.lire_projets(autre)[1], 0)
+        self.assertGreater(self.lire_projets(autre)[1], 0)
+
+
+class RechercheProjetsTests(TestCase):
+    def setUp(self):
+        client = creer_client()
+        self.api = APIClient()
+        self.api.force_authenticate(creer_freelancer())
+        for titre, budget, competences in (
+            ('Site vitrine Django', (100, 500), ['python', 'django']),
+            ('Application mobile', (1000, 3000), ['flutter']),
+            ('API de paiement', (400, 900), ['python']),
+        ):
+            projet = creer_projet(client, titre)
+            projet.budget_min, projet.budget_max = budget
+            projet.competences_requises = competences
+            projet.save()
+
+    def rechercher(self, **params):
+        reponse = self.api.get('/api/projets/recherche/', params)
+        self.assertEqual(reponse.status_code, 200, reponse.data)
+        return reponse
+
+    def titres(self, **params):
+        return sorted(p['titre'] for p in self.rechercher(**params).data['results'])
+
+    def test_texte_et_filtres(self):
+        self.assertEqual(self.titres(q='django'), ['Site vitrine Django'])
+        self.assertEqual(self.titres(competences='python'), ['API de paiement', 'Site vitrine Django'])
+        self.assertEqual(self.titres(competences='python,django'), ['Site vitrine Django'])
+        self.assertEqual(self.titres(budget_min=600), ['API de paiement', 'Application mobile'])
+        self.assertEqual(self.titres(budget_min=600, competences='python'), ['API de paiement'])
+
+    def test_pagination_et_validation(self):
+        reponse = self.rechercher(page_size=2)
+        self.assertEqual(len(reponse.data['results']), 2)
+        suite = self.api.get(reponse.data['next'])
+        self.assertEqual(len(suite.data['results']), 1)
+        self.assertIsNone(suite.data['next'])
+
+        reponse = self.api.get('/api/projets/recherche/', {'budget_min': 900, 'budget_max': 100})
+        self.assertEqual(reponse.status_code, 400)
+
+
+@override_settings(CORRESPONDANCE_DELAI_RECONSTRUCTION=0)
+class CorrespondanceCompetencesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client_proprietaire = creer_client()
+        self.projets = {}
+        for titre, competences in (
+            ('Site Django', ['Python', 'Django']),
+            ('Front React', ['ReactJS', 'TypeScript']),
+            ('Full stack', ['python', 'react', 'PostgreSQL', 'Docker']),
+        ):
+            projet = creer_projet(self.client_proprietaire, titre)
+            projet.competences_requises = competences
+            projet.save()
+            self.projets[titre] = projet
+
+    def test_normalisation(self):
+        self.assertEqual(
+            normaliser_competences([' React.JS ', 'Postgres', 'Développement  Web', '']),
+            {'react', 'postgresql', 'developpement web'},
+        )
+
+    def test_index_par_masques_de_bits(self):
+        index = IndexCompetences([(1, ['a', 'b']), (2, ['a']), (3, ['c']), (4, ['a', 'b', 'c'])])
+        meilleurs = index.meilleurs(['a', 'b', 'c'], 3, lambda communes, requete, entite: (communes / requete,))
+        self.assertEqual([pk for pk, _, _ in meilleurs], [4, 1, 3])
+        self.assertEqual(meilleurs[1][2], ['a', 'b'])
+        self.assertEqual(index.meilleurs(['a', 'b', 'c'], 3, lambda *_: (0,), exclure={4})[0][0], 3)
+
+    def test_projets_recommandes(self):
+        freelancer = creer_freelancer(competences=['python', 'django', 'docker'])
+        api = APIClient()
+        api.force_authenticate(freelancer)
+
+        reponse = api.get('/api/freelancers/moi/projets-recommandes/')
+
+        self.assertEqual([p['titre'] for p in reponse.data], ['Site Django', 'Full stack'])
+        self.assertEqual(reponse.data[0]['score'], 1.0)
+        self.assertEqual(reponse.data[1]['competences_communes'], ['docker', 'python'])
+
+        Postulation.objects.create(projet=self.projets['Site Django'], freelancer=freelancer, message='Motivation')
+        reponse = api.get('/api/freelancers/moi/projets-recommandes/')
+        self.assertEqual([p['titre'] for p in reponse.data], ['Full stack'])
+
+    def test_freelancers_recommandes(self):
+        creer_freelancer('specialiste@example.com', ['React', 'TypeScript'])
+        creer_freelancer('generaliste@example.com', ['react', 'ts', 'python', 'django', 'docker'])
+        creer_freelancer('autre@example.com', ['php'])
+        url = f"/api/projets/{self.projets['Front React'].pk}/freelancers-recommandes/"
+        api = APIClient()
+        api.force_authenticate(self.client_proprietaire)
+
+        reponse = api.get(url)
+
+        self.assertEqual([f['email'] for f in reponse.data], ['specialiste@example.com', 'generaliste@example.com'])
+        # Les CV (URL signées) ne sont remis qu'aux clients qui ont reçu la candidature
+        self.assertNotIn('cv', reponse.data[0])
+        self.assertNotIn('numero_telephone', reponse.data[0])
+
+        intrus = APIClient()
+        intrus.force_authenticate(creer_client('intrus@example.com'))
+        self.assertEqual(intrus.get(url).status_code, 403)
+
+
+class CompetencesNormaliseesTests(TestCase):
+    def test_liaisons_suivent_le_json(self):
+        projet = creer_projet(creer_client(), 'Site Django')
+        projet.competences_requises = ['Python', 'py', 'Django']
+        projet.save()
+        self.assertEqual(sorted(projet.competences_normalisees.values_list('nom', flat=True)), ['django', 'python'])
+
+        projet.competences_requises = ['React.js']
+        projet.save(update_fields=['competences_requises'])
+        self.assertEqual(list(projet.competences_normalisees.values_list('nom', flat=True)), ['react'])
+
+        freelancer = creer_freelancer(competences=['ReactJS', 'Docker'])
+        self.assertEqual(Competence.objects.get(nom='react').freelancers.get(), freelancer)
+        self.assertEqual(Competence.objects.filter(nom='react').count(), 1)
+
+    def test_competence_trop_longue_ignoree(self):
+        # PostgreSQL refuserait le nom (varchar(100)) et l'enregistrement finirait en 500
+        projet = creer_projet(creer_client(), 'Site Django')
+        projet.competences_requises = ['Django', 'x' * 101]
+        projet.save()
+        self.assertEqual(list(projet.competences_normalisees.values_list('nom', flat=True)), ['django'])
+        self.assertFalse(Competence.objects.filter(nom__startswith='xxx').exists())
+
+    def test_filtre_liste_utilisateurs(self):
+        creer_freelancer('react@example.com', ['React', 'Docker'])
+        creer_freelancer('python@example.com', ['Python'])
+        api = APIClient()
+        api.force_authenticate(creer_administrateur())
+
+        reponse = api.get('/api/users/', {'competences': 'reactjs,docker'})
+
+        self.assertEqual([u['email'] for u in reponse.data], ['react@example.com'])
+
+    def test_commande_de_synchronisation(self):
+        projet = creer_projet(creer_client(), 'Import')
+        # update() contourne save() : les liaisons ne suivent pas
+        Projet.objects.filter(pk=projet.pk).update(competences_requises=['Kubernetes', 'Go'])
+        self.assertFalse(ProjetCompetence.objects.filter(projet=projet).exists())
+
+        call_command('synchroniser_competences', '--purger', stdout=StringIO())
+
+        self.assertEqual(sorted(projet.competences_normalisees.values_list('nom', flat=True)), ['go', 'kubernetes'])
+
+
+class DecisionsPostulationsTests(TestCase):
+    def setUp(self):
+        self.client_proprietaire = creer_client()
+        self.projet = creer_projet(self.client_proprietaire)
+        self.postulations = [
+            Postulation.objects.create(
+                projet=self.projet,
+                freelancer=creer_freelancer(f'freelancer{i}@example.com'),
+                message='Motivation'
+            )
+            for i in range(5)
+        ]
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_proprietaire)
+        self.url = f'/api/projets/{self.projet.pk}/postulations/decisions/'
+
+    def statuts(self):
+        return list(Postulation.objects.order_by('pk').values_list('statut', flat=True))
+
+    def requetes_decision(self, nombre_candidats):
+        """Nombre de requêtes pour accepter une candidature d'un nouveau projet de `nombre_candidats`."""
+        projet = creer_projet(self.client_proprietaire, f'Projet {nombre_candidats}')
+        postulations = [
+            Postulation.objects.create(
+                projet=projet,
+                freelancer=creer_freelancer(f'candidat{nombre_candidats}-{i}@example.com'),
+                message='Motivation'
+            )
+            for i in range(nombre_candidats)
+        ]
+        with CaptureQueriesContext(connections['default']) as requetes:
+            reponse = self.api.post(
+                f'/api/projets/{projet.pk}/postulations/decisions/',
+                {'accepter': postulations[0].pk},
+                format='json'
+            )
+        self.assertEqual(reponse.status_code, 200, reponse.data)
+        self.assertEqual(len(reponse.data['refusees']), nombre_candidats - 1)
+        return len(requetes)
+
+    def test_acceptation_refuse_les_autres_en_requetes_constantes(self):
+        choisie = self.postulations[2]
+
+        reponse = self.api.post(self.url, {'accepter': choisie.pk}, format='json')
+
+        self.assertEqual(reponse.status_code, 200, reponse.data)
+        self.assertEqual(len(reponse.data['refusees']), 4)
+        self.assertEqual(self.statuts(), ['refuse', 'refuse', 'accepte', 'refuse', 'refuse'])
+        self.projet.refresh_from_db()
+        self.assertEqual(self.projet.postulation_acceptee_id, choisie.pk)
+        self.assertEqual(
+            sorted(Notification.objects.values_list('type_notification', flat=True)),
+            ['postulation_acceptee'] + ['postulation_refusee'] * 4
+        )
+        self.assertEqual(EmailSortant.objects.count(), 2)
+
+        # Indépendant du nombre de candidats (ligne de statistique du jour et
+        # cache des ContentType déjà en place : même état pour les deux mesures)
+        self.assertEqual(self.requetes_decision(5), self.requetes_decision(50))
+
+    def test_refus_en_lot_et_validation(self):
+        ids = [p.pk for p in self.postulations[:2]]
+        reponse = self.api.post(self.url, {'refuser': ids}, format='json')
+        self.assertEqual(reponse.status_code, 200, reponse.data)
+        self.assertEqual(self.statuts(), ['refuse', 'refuse', 'en_attente', 'en_attente', 'en_attente'])
+
+        autre = Postulation.objects.create(
+            projet=creer_projet(self.client_proprietaire, 'Autre'),
+            freelancer=creer_freelancer('autre@example.com'),
+            message='Motivation'
+        )
+        reponse = self.api.post(self.url, {'refuser': [autre.pk]}, format='json')
+        self.assertEqual(reponse.status_code, 400)
+        self.assertEqual(self.api.post(self.url, {}, format='json').status_code, 400)
+
+        intrus = APIClient()
+        intrus.force_authenticate(creer_client('intrus@example.com'))
+        self.assertEqual(intrus.post(self.url, {'refuser': ids}, format='json').status_code, 403)
+
+
+class SynchronisationPostulationsAccepteesTests(TestCase):
+    def test_projet_incoherent_repare(self):
+        projet = creer_projet(creer_client())
+        postulation = Postulation.objects.create(
+            projet=projet, freelancer=creer_freelancer(), message='Motivation'
+        )
+        # Acceptation écrite sans passer par decider : le projet n'est pas renseigné
+        Postulation.objects.filter(pk=postulation.pk).update(statut='accepte')
+
+        with self.assertRaises(CommandError):
+            call_command('synchroniser_postulations_acceptees', '--verifier', stdout=StringIO())
+
+        call_command('synchroniser_postulations_acceptees', stdout=StringIO())
+
+        projet.refresh_from_db()
+        self.assertEqual(projet.postulation_acceptee_id, postulation.pk)
+        call_command('synchroniser_postulations_acceptees', '--verifier', stdout=StringIO())
+
+
+class PostulationCreationTests(TestCase):
+    def setUp(self):
+        self.client_proprietaire = creer_client()
+        self.projet = creer_projet(self.client_proprietaire)
+        self.api = APIClient()
+        self.api.force_authenticate(creer_freelancer())
+        self.url = f'/api/projets/{self.projet.pk}/postuler/'
+
+    def test_reponse_sans_chargement_paresseux_et_doublon_refuse(self):
+        reponse = self.api.post(self.url, {'message': 'Motivation'})
+        self.assertEqual(reponse.status_code, 201, reponse.data)
+        self.assertEqual(reponse.data['projet']['client'], str(self.client_proprietaire))
+        self.assertEqual(Notification.objects.get().utilisateur_id, self.client_proprietaire.pk)
+
+        reponse = self.api.post(self.url, {'message': 'Encore'})
+        self.assertEqual(reponse.status_code, 400)
+        self.assertEqual(Postulation.objects.count(), 1)
+        self.assertEqual(Notification.objects.count(), 1)
+
+        self.assertEqual(self.api.post('/api/projets/0/postuler/', {'message': 'Motivation'}).status_code, 404)
+        client = APIClient()
+        client.force_authenticate(self.client_proprietaire)
+        self.assertEqual(client.post(self.url, {'message': 'Motivation'}).status_code, 403)
+
+
+class PostulationsConcurrentesTests(TransactionTestCase):
+    def setUp(self):
+        connexion = connections['default']
+        if connexion.vendor == 'sqlite' and connexion.is_in_memory_db():
+            self.skipTest("SQLite en mémoire partagée refuse les écritures concurrentes")
+
+    def test_envois_paralleles_une_seule_postulation(self):
+        projet = creer_projet(creer_client())
+        freelancer = creer_freelancer()
+        nombre = 6
+        depart = Barrier(nombre)
+        statuts = []
+
+        def postuler():
+            api = APIClient()
+            api.force_authenticate(freelancer)
+            try:
+                depart.wait()
+                statuts.append(api.post(f'/api/projets/{projet.pk}/postuler/', {'message': 'Motivation'}).status_code)
+            finally:
+                connections.close_all()
+
+        threads = [Thread(target=postuler) for _ in range(nombre)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(statuts), [201] + [400] * (nombre - 1))
+        self.assertEqual(Postulation.objects.filter(projet=projet, freelancer=freelancer).count(), 1)
+        self.assertEqual(Notification.objects.filter(type_notification='nouvelle_candidature').count(), 1)
+
+
+class PhotoDerivesTests(TestCase):
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        reglages = override_settings(MEDIA_ROOT=dossier.name)
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+
+    def photo(self, couleur='red'):
+        tampon = BytesIO()
+        Image.new('RGB', (800, 600), couleur).save(tampon, 'JPEG')
+        return SimpleUploadedFile('photo.jpg', tampon.getvalue(), content_type='image/jpeg')
+
+    def test_derives_generes_a_l_envoi_et_adresses_par_contenu(self):
+        premier = creer_freelancer('premier@example.com')
+        premier.photo_profil = self.photo()
+        premier.save()
+        second = creer_freelancer('second@example.com')
+        second.photo_profil = self.photo()
+        second.save()
+
+        self.assertEqual(premier.photo_derives['source'], premier.photo_profil.name)
+        # Même contenu, même fichier dérivé
+        self.assertEqual(premier.photo_derives['avatar'], second.photo_derives['avatar'])
+        with Image.open(premier.photo_profil.storage.open(premier.photo_derives['carte'])) as carte:
+            self.assertEqual((carte.format, carte.size), ('WEBP', (320, 320)))
+
+        api = APIClient()
+        api.force_authenticate(creer_administrateur())
+        ligne = next(u for u in api.get('/api/users/').data if u['email'] == 'premier@example.com')
+        self.assertTrue(ligne['photo_derives']['avatar'].endswith(premier.photo_derives['avatar']))
+
+    @override_settings(PHOTO_DERIVES_A_L_ENVOI=False)
+    def test_generation_differee_par_la_commande(self):
+        freelancer = creer_freelancer()
+        freelancer.photo_profil = self.photo('blue')
+        freelancer.save()
+        self.assertEqual(freelancer.photo_derives, {})
+        # En attendant le worker, les vignettes pointent vers l'original
+        self.assertTrue(FreelancerSerializer(freelancer).data['photo_derives']['avatar'].endswith(freelancer.photo_profil.name))
+
+        call_command('generer_derives_photos', stdout=StringIO())
+
+        freelancer.refresh_from_db()
+        self.assertEqual(set(freelancer.photo_derives), {'source', 'avatar', 'carte'})
+
+
+class TeleversementCVTests(TestCase):
+    CONTENU = b'%PDF-1.4\n' + b'x' * 5000
+
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        reglages = override_settings(
+            MEDIA_ROOT=os.path.join(dossier.name, 'media'),
+            CV_TELEVERSEMENTS_DOSSIER=os.path.join(dossier.name, 'partiels'),
+            CV_TAILLE_BLOC_MAX=4096,
+        )
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+        self.api = APIClient()
+
+    def ouvrir(self, **donnees):
+        reponse = self.api.post(
+            '/api/cv/televersements/',
+            {'nom_fichier': 'cv.pdf', 'taille': len(self.CONTENU), **donnees},
+            format='json'
+        )
+        self.assertEqual(reponse.status_code, 201, reponse.data)
+        return f"/api/cv/televersements/{reponse.data['id']}/"
+
+    def envoyer(self, url, debut, fin):
+        return self.api.patch(
+            url, self.CONTENU[debut:fin],
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(debut)
+        )
+
+    def televerser(self, **donnees):
+        url = self.ouvrir(**donnees)
+        self.assertEqual(self.envoyer(url, 0, 3000).status_code, 200)
+        return url, self.envoyer(url, 3000, len(self.CONTENU))
+
+    def test_envoi_reprenable_et_dedoublonne(self):
+        url = self.ouvrir()
+        self.assertEqual(self.envoyer(url, 0, 3000).data['recu'], 3000)
+
+        # Reprise après coupure : le serveur indique où reprendre
+        self.assertEqual(self.api.get(url)['Upload-Offset'], '3000')
+        self.assertEqual(self.envoyer(url, 0, 3000).status_code, 409)
+        trop_long = self.api.patch(
+            url, self.CONTENU[3000:] + b'!',
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET='3000'
+        )
+        self.assertEqual(trop_long.status_code, 413)
+
+        reponse = self.envoyer(url, 3000, len(self.CONTENU))
+        self.assertEqual(reponse.data['statut'], 'termine')
+        self.assertEqual(reponse.data['empreinte'], hashlib.sha256(self.CONTENU).hexdigest())
+
+        _, autre = self.televerser()
+        premier, second = TeleversementCV.objects.all()
+        self.assertEqual(premier.fichier.name, second.fichier.name)
+        self.assertEqual(premier.fichier.read(), self.CONTENU)
+        self.assertEqual(len(os.listdir(os.path.dirname(premier.fichier.path))), 1)
+
+    def test_bloc_recu_hors_transaction(self):
+        url = self.ouvrir()
+        profondeurs = []
+
+        def ajouter_bloc_observe(televersement, *args, **kwargs):
+            profondeurs.append(len(connections['default'].atomic_blocks))
+            # Bloc réservé : un second envoi au même décalage est refusé
+            self.assertEqual(self.envoyer(url, 0, 3000).status_code, 409)
+            return ajouter_bloc(televersement, *args, **kwargs)
+
+        profondeur_test = len(connections['default'].atomic_blocks)
+        with patch('users.views.ajouter_bloc', ajouter_bloc_observe):
+            reponse = self.envoyer(url, 0, 3000)
+
+        self.assertEqual(reponse.data['recu'], 3000)
+        self.assertEqual(profondeurs[0], profondeur_test)
+        self.assertIsNone(TeleversementCV.objects.get().reservation_bloc)
+
+    def test_reservation_expiree_reprise(self):
+        url = self.ouvrir()
+        TeleversementCV.objects.update(reservation_bloc=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(self.envoyer(url, 0, 3000).status_code, 409)
+
+        TeleversementCV.objects.update(reservation_bloc=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.envoyer(url, 0, 3000).data['recu'], 3000)
+
+    def test_empreinte_annoncee_verifiee(self):
+        url, reponse = self.televerser(empreinte='0' * 64)
+        self.assertEqual(reponse.status_code, 400)
+        self.assertEqual(self.api.get(url).data['recu'], 0)
+
+    def test_inscription_reference_l_envoi(self):
+        url, _ = self.televerser()
+        televersement = TeleversementCV.objects.get()
+
+        reponse = self.api.post('/api/utilisateur/inscription/', {
+            'email': 'cv@example.com',
+            'password': 'motdepasse123',
+            'nom_complet': 'Freelancer CV',
+            'numero_telephone': '44076356',
+            'type_utilisateur': 'freelancer',
+            'specialisation': 'Développement',
+            'intitule_poste': 'Développeur',
+            'cv_televersement': str(televersement.pk),
+        }, format='json')
+
+        self.assertEqual(reponse.status_code, 201, reponse.data)
+        self.assertEqual(Freelancer.objects.get(email='cv@example.com').cv.name, televersement.fichier.name)
+        self.assertFalse(TeleversementCV.objects.exists())
+
+
+class ServiceMediasTests(TestCase):
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        reglages = override_settings(MEDIA_ROOT=dossier.name)
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+        self.contenu = bytes(range(256)) * 40
+        self.photo = default_storage.save('photos_profil/photo.jpg', ContentFile(self.contenu))
+        self.cv = default_storage.save('cvs_freelancers/cv.pdf', ContentFile(b'%PDF-1.4 cv'))
+
+    def lire(self, reponse):
+        return b''.join(reponse.streaming_content)
+
+    def test_photo_plages_et_requetes_conditionnelles(self):
+        url = f'/media/{self.photo}'
+        reponse = self.client.get(url)
+        self.assertEqual(self.lire(reponse), self.contenu)
+        self.assertEqual(reponse['Accept-Ranges'], 'bytes')
+
+        partielle = self.client.get(url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(partielle.status_code, 206)
+        self.assertEqual(partielle['Content-Range'], f'bytes 100-199/{len(self.contenu)}')
+        self.assertEqual(self.lire(partielle), self.contenu[100:200])
+        self.assertEqual(self.lire(self.client.get(url, HTTP_RANGE='bytes=-10')), self.contenu[-10:])
+        self.assertEqual(self.client.get(url, HTTP_RANGE=f'bytes={len(self.contenu)}-').status_code, 416)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=reponse['ETag']).status_code, 304)
+
+    def test_derive_immuable(self):
+        empreinte = hashlib.sha256(b'vignette').hexdigest()
+        nom = default_storage.save(f'photos_profil/derives/{empreinte[:2]}/{empreinte}.webp', ContentFile(b'vignette'))
+        reponse = self.client.get(f'/media/{nom}')
+        self.assertIn('immutable', reponse['Cache-Control'])
+        self.assertEqual(reponse['ETag'], f'"{empreinte}"')
+
+    def test_cv_uniquement_par_url_signee(self):
+        self.assertEqual(self.client.get(f'/media/{self.cv}').status_code, 404)
+        self.assertEqual(self.client.get(f'/media/photos_profil/../{self.cv}').status_code, 404)
+
+        url = url_cv_signee(self.cv)
+        reponse = self.client.get(url)
+        self.assertEqual(self.lire(reponse), b'%PDF-1.4 cv')
+        self.assertTrue(reponse['Cache-Control'].startswith('private'))
+        self.assertEqual(self.client.get(url[:-3] + 'abc/').status_code, 404)
+        with override_settings(MEDIA_CV_DUREE_URL=-1):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    @override_settings(MEDIA_ENVOI='x-accel')
+    def test_envoi_delegue_au_serveur_web(self):
+        reponse = self.client.get(f'/media/{self.photo}')
+        self.assertEqual(reponse['X-Accel-Redirect'], f'/media-interne/{self.photo}')
+        self.assertEqual(reponse.content, b'')
+
+
+class SchemaOpenAPITests(TestCase):
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        reglages = override_settings(SCHEMA_OPENAPI_DOSSIER=dossier.name, VERSION_APPLICATION='1.4.0')
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+
+    def test_schema_genere_une_fois_par_version(self):
+        call_command('generer_schema_openapi', stdout=StringIO())
+        fichier = schema.chemin('json')
+        with open(fichier, 'rb') as f:
+            contenu = f.read()
+        self.assertIn('/projets/', json.loads(contenu)['paths'])
+        self.assertTrue(os.path.exists(schema.chemin('yaml')))
+
+        mtime = os.stat(fichier).st_mtime_ns
+        with patch('users.management.commands.generer_schema_openapi.generer') as generer:
+            call_command('generer_schema_openapi', stdout=StringIO())
+        generer.assert_not_called()
+        self.assertEqual(os.stat(fichier).st_mtime_ns, mtime)
+
+        with override_settings(VERSION_APPLICATION='1.5.0'):
+            call_command('generer_schema_openapi', stdout=StringIO())
+            self.assertTrue(os.path.exists(schema.chemin('json')))
+
+    def test_schema_servi_depuis_le_fichier_avec_etag(self):
+        schema.ecrire({'json': b'{"swagger": "2.0"}', 'yaml': b'swagger: "2.0"\n'})
+        with patch('users.schema.generer') as generer:
+            reponse = self.client.get('/api/swagger.json/')
+            self.assertEqual(reponse.content, b'{"swagger": "2.0"}')
+            self.assertEqual(reponse['Content-Type'], 'application/json')
+            self.assertEqual(self.client.get('/api/swagger.json/', HTTP_IF_NONE_MATCH=reponse['ETag']).status_code, 304)
+            self.assertEqual(self.client.get('/api/swagger.yaml/').content, b'swagger: "2.0"\n')
+            self.assertEqual(self.client.get('/api/swagger.xml/').status_code, 404)
+        generer.assert_not_called()
+
+        # Les pages de documentation chargent ce fichier au lieu de générer le schéma
+        self.assertContains(self.client.get('/api/swagger/'), '/api/swagger.json/')
+
+
+class ImportsDemarrageTests(SimpleTestCase):
+    """Modules importés au démarrage d'un worker (import de ROOT_URLCONF), dans un processus neuf."""
+
+    # Chargés seulement par les routes de documentation ou au premier traitement d'image
+    MODULES_DIFFERES = (
+        'drf_yasg.views', 'drf_yasg.generators', 'drf_yasg.inspectors',
+        'users.swaggerDocumentation', 'PIL.Image',
+    )
+
+    def test_modules_differes(self):
+        # Pas de budget en millisecondes, instable sur une machine chargée :
+        # python -X importtime -c "..." pour mesurer
+        code = (
+            "import json, sys, django; django.setup(); from django.conf import settings; "
+            "__import__(settings.ROOT_URLCONF); print(json.dumps(sorted(sys.modules)))"
+        )
+        resultat = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(resultat.returncode, 0, resultat.stderr[-2000:])
+
+        modules = set(json.loads(resultat.stdout.splitlines()[-1]))
+        self.assertIn(settings.ROOT_URLCONF, modules)
+        self.assertEqual(sorted(set(self.MODULES_DIFFERES) & modules), [])
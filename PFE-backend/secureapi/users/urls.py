@@ -1,46 +1,28 @@
 from django.urls import path
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView
 from .authentication import CustomTokenObtainPairView
-from . import views
-from django.urls import re_path
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
-from .swaggerDocumentation import *
+# Ni drf_yasg ni swaggerDocumentation ici : users/schema.py les charge au premier
+# appel des routes de documentation, pas au démarrage de chaque worker
+from .schema import documentation, servir_schema
 from .views import *
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="API de Mise en Relation Freelancers & Clients",
-        default_version='v1',
-        description="Cette API permet la gestion des utilisateurs, des projets, des candidatures, et des interactions entre clients et freelancers.",
-        contact=openapi.Contact(email="moussamedwedouderebih@gmail.com"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
 
 urlpatterns = [
-    path('utilisateur/inscription/', VueInscription, name='inscription-utilisateur'),
-    path('utilisateur/verifier/<str:jeton>/', VueVerificationEmailDocumentee, name='verifier-email'),
+    path('utilisateur/inscription/', VueInscriptionUtilisateur.as_view(), name='inscription-utilisateur'),
+    path('cv/televersements/', TeleversementCVCreateView.as_view(), name='televersement-cv'), # Ouvrir un envoi de CV par blocs => Endpoint: POST /api/cv/televersements/ {nom_fichier, taille}
+    path('cv/televersements/<uuid:pk>/', TeleversementCVView.as_view(), name='televersement-cv-detail'), # Reprendre (GET) ou ajouter un bloc (PATCH, en-tête Upload-Offset) => Endpoint: /api/cv/televersements/<id>/
+    path('utilisateur/verifier/<str:jeton>/', VueVerificationEmail.as_view(), name='verifier-email'),
     path('utilisateur/profil/', VueProfilUtilisateur.as_view(), name='profil-utilisateur'),
     path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('utilisateur/renvoyer-verification/', VueRenvoyerEmail, name='renvoyer-verification'),
-    path('mot-de-passe/demande-reinitialisation/', DocumentationPourVueDemandeReinitialisation, name='demande-reinitialisation'),
-    path('mot-de-passe/reinitialiser/<str:jeton>/', DocumentationPourVueReinitialisationMotDePasse, name='reinitialiser-mot-de-passe'),
-    path('swagger.<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('utilisateur/renvoyer-verification/', VueRenvoyerEmailVerification.as_view(), name='renvoyer-verification'),
+    path('mot-de-passe/demande-reinitialisation/', VueDemandeReinitialisation.as_view(), name='demande-reinitialisation'),
+    path('mot-de-passe/reinitialiser/<str:jeton>/', VueReinitialisationMotDePasse.as_view(), name='reinitialiser-mot-de-passe'),
+    path('swagger.<format>/', servir_schema, name='schema-json'),
+    path('swagger/', documentation, {'interface': 'swagger'}, name='schema-swagger-ui'),
+    path('redoc/', documentation, {'interface': 'redoc'}, name='schema-redoc'),
     # Projets
     path('projets/', ProjetListCreateView.as_view(), name='projet-list-create'), # Publier un projet (Client) => Endpoint: POST /api/projets/ et # Recuperer tous les projets (Freelancer) => Endpoint: GET /api/projets/
+    path('projets/recherche/', ProjetRechercheView.as_view(), name='projet-recherche'), # Rechercher des projets ouverts (texte, budget, deadline, competences) => Endpoint: GET /api/projets/recherche/?q=&competences=python,django
     path('projets/<int:pk>/', ProjetDetailView.as_view(), name='projet-detail'),
     path('utilisateurs/<int:user_id>/projets/', ProjetsUtilisateurListView.as_view(), name='projets-utilisateur'), # Consulter les projets personnel (Client) => Endpoint: GET /api/utilisateurs/<int:user_id>/projets/
     path('projets/<int:projet_id>/annuler/', AnnulerProjetView.as_view(), name='annuler-projet'), # Annuler un projet (Client) => Endpoint: DELETE /api/projets/<int:projet_id>/annuler/'
@@ -50,19 +32,26 @@ urlpatterns = [
     path('projets/<int:projet_id>/postuler/', PostulationCreateView.as_view(), name='postuler-projet'), # Postuler a un projet (freelancer) => Endpoint: POST /api/projets/<projet_id>/postuler/
     path('postulations/<int:pk>/accepter/', PostulationAcceptView.as_view(), name='postulation-accept'), #
     path('postulations/<int:pk>/refuser/', PostulationRefuseView.as_view(), name='postulation-refuse'), #
+    path('projets/<int:projet_id>/postulations/decisions/', PostulationsDecisionView.as_view(), name='postulations-decisions'), # Accepter/refuser en lot les candidatures d'un projet (client) => Endpoint: POST /api/projets/<projet_id>/postulations/decisions/
     
     # Evaluations
     path('freelancers/<int:freelancer_id>/evaluations/', EvaluationCreateUpdateView.as_view(), name='evaluation-create'),
     path('projets/<int:projet_id>/freelancer-accepte/', FreelancerAccepteView.as_view(), name='freelancer-accepte'),
+    path('projets/<int:projet_id>/freelancers-recommandes/', FreelancersRecommandesView.as_view(), name='freelancers-recommandes'), # Freelancers dont les competences couvrent le projet (client) => Endpoint: GET /api/projets/<projet_id>/freelancers-recommandes/?limite=20
+    path('freelancers/moi/projets-recommandes/', ProjetsRecommandesView.as_view(), name='projets-recommandes'), # Projets ouverts correspondant aux competences du freelancer connecte => Endpoint: GET /api/freelancers/moi/projets-recommandes/?limite=20
     
     # Notifications
     path('notifications/', NotificationListView.as_view(), name='notification-list'), # Recuperer les notifications (Utilisateur) => Endpoint: GET /api/notifications/
     path('notifications/<int:pk>/', NotificationDestroyView.as_view(), name='notification-destroy'), # Supprimer une notification (Utilisateur) => Endpoint: DELETE /api/notifications/<int:pk>/
+    path('notifications/unread-count/', NotificationNonVuesCountView.as_view(), name='notification-unread-count'), # Nombre de notifications non vues (Utilisateur) => Endpoint: GET /api/notifications/unread-count/
+    path('notifications/<int:pk>/vue/', NotificationMarquerVueView.as_view(), name='notification-vue'), # Marquer une notification comme vue (Utilisateur) => Endpoint: PATCH /api/notifications/<int:pk>/vue/
+    path('notifications/marquer-toutes-vues/', NotificationsMarquerToutesVuesView.as_view(), name='notifications-toutes-vues'), # Marquer toutes les notifications comme vues (Utilisateur) => Endpoint: POST /api/notifications/marquer-toutes-vues/
     
     #Supprimer un projet forcement en commencant par tous ces postulations utiliser dans le processus de termination d'un projet
     path('projets/<int:pk>/supprimer/', ProjetDeleteView.as_view(), name='projet-delete'),
     
-    path('admin/statistiques/', AdminStatisticsDocumentation , name='admin-statistics'), #Retourne les nombres des clients,freelancers,admins,projects
-    path('users/', ListeUtilisateursNonAdminDocumentation , name='admin-users-list'),
-    path('users/<int:user_id>/', AdminUserDeleteDocumentation, name='admin-users-delete'),
+    path('admin/statistiques/', AdminStatisticsView.as_view(), name='admin-statistics'), #Retourne les nombres des clients,freelancers,admins,projects
+    path('admin/statistiques/evolution/', AdminStatistiquesEvolutionView.as_view(), name='admin-statistiques-evolution'), # Inscriptions, projets, postulations et taux d'acceptation par jour/semaine/mois (?periode=&jours=)
+    path('users/', ListeUtilisateursNonAdminView.as_view(), name='admin-users-list'),
+    path('users/<int:user_id>/', AdminUserDeleteView.as_view(), name='admin-users-delete'),
 ]
\ No newline at end of file
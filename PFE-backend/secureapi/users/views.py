@@ -1,10 +1,9 @@
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.core.mail import send_mail
 from django.urls import reverse
 from django.conf import settings
 from django.shortcuts import get_object_or_404
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -13,42 +12,65 @@ from datetime import timedelta
 from django.utils.crypto import get_random_string
 from rest_framework.permissions import AllowAny
 from django.shortcuts import redirect
-from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import api_view , permission_classes
 from django.contrib.auth import get_user_model
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
 from rest_framework import generics, status, permissions
 from rest_framework.exceptions import PermissionDenied
-from .models import Utilisateur, Freelancer , Administrateur , Projet, Postulation, Evaluation, Notification
+from django.core.exceptions import ValidationError as DjangoValidationError
 from .serializers import *
 User = get_user_model()
-from django.db.models import Avg
-from django.db import transaction
+from django.db.models import Count, F, FloatField, Prefetch, Sum, Value
+from django.db.models.functions import Concat, TruncMonth, TruncWeek
+from django.db import IntegrityError, router, transaction
 from rest_framework.decorators import action
-from rest_framework import viewsets, permissions, status
-from django.shortcuts import get_object_or_404
+from rest_framework import viewsets
 from .models import *
+# Après l'import étoile de .models, qui exporte le ValidationError de Django
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser
+import csv
+import itertools
+import json
 import logging
+from urllib.parse import urljoin
+from django.http import StreamingHttpResponse
+from .pagination import CurseurPagination, DecalagePagination
+from .recherche import filtrer_competences, rechercher_projets
+from .correspondance import obtenir_index
+from .emails import mettre_en_file
+from .images import urls_derives
+from .medias import url_cv_signee
+from .televersements import EmpreinteIncorrecte, ajouter_bloc, finaliser
+from .cache import reponse_en_cache
+from .routers import LectureReplicaMixin
 
 class VueInscriptionUtilisateur(generics.CreateAPIView):
     queryset = Utilisateur.objects.all()
     serializer_class = InscriptionUtilisateurSerializer
-    parser_classes = [MultiPartParser, FormParser]
+    # JSON : inscription légère quand le CV a été envoyé par blocs (cv_televersement)
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
     permission_classes = [AllowAny]
-    
+
+    def post(self, request, *args, **kwargs):
+        # Méthode propre à la vue : drf_yasg recopie la documentation de VueInscription
+        # sur la fonction post, qui serait sinon celle partagée par tous les CreateAPIView
+        return self.create(request, *args, **kwargs)
+
+    def get_parsers(self):
+        if getattr(self, 'swagger_fake_view', False):
+            # drf_yasg ne décrit les champs du formulaire (inscription_params) que si
+            # la vue n'accepte que des formulaires
+            return [MultiPartParser(), FormParser()]
+        return super().get_parsers()
+
     def perform_create(self, serializer):
         utilisateur = serializer.save()
-        
-        # Vérifier que le jeton est bien généré
-        if not utilisateur.jeton_verification:
-            utilisateur.jeton_verification = get_random_string(64)
-            utilisateur.expiration_jeton_verification = timezone.now() + timedelta(hours=24)
-            utilisateur.save()
+
+        # Générer le jeton de vérification
+        jeton = utilisateur.generer_jeton_verification()
             
         lien_verification = self.request.build_absolute_uri(
-            reverse('verifier-email', kwargs={'jeton': utilisateur.jeton_verification})
+            reverse('verifier-email', kwargs={'jeton': jeton})
         )
         
         # Vérifier que le lien est correct
@@ -70,40 +92,115 @@ class VueInscriptionUtilisateur(generics.CreateAPIView):
         
         Informations sur la confidentialité : Vos données sont stockées de manière sécurisée et ne seront utilisées que pour vous fournir nos services conformément à notre politique de confidentialité.
         """
-        send_mail(
+        mettre_en_file(
             sujet,
             message,
-            settings.EMAIL_HOST_USER,
-            [utilisateur.email],
-            fail_silently=False,
+            [utilisateur.email]
         )
         
+class TeleversementCVCreateView(generics.CreateAPIView):
+    """Ouvre un envoi de CV par blocs (voir users/televersements.py)."""
+    serializer_class = TeleversementCVSerializer
+    permission_classes = [AllowAny]
+    throttle_classes = [AnonRateThrottle]
+
+    def perform_create(self, serializer):
+        serializer.save(date_expiration=timezone.now() + timedelta(seconds=settings.CV_TELEVERSEMENT_DUREE))
+
+class TeleversementCVView(APIView):
+    """
+    GET : état de l'envoi et octet où reprendre (en-tête Upload-Offset).
+    PATCH : ajoute le bloc du corps de la requête à partir de Upload-Offset.
+    """
+    permission_classes = [AllowAny]
+    # Le corps est lu en flux par ajouter_bloc, jamais chargé d'un coup
+    parser_classes = []
+
+    def reponse(self, televersement, code=status.HTTP_200_OK):
+        return Response(
+            TeleversementCVSerializer(televersement).data,
+            status=code,
+            headers={'Upload-Offset': str(televersement.recu)}
+        )
+
+    def get(self, request, pk):
+        return self.reponse(get_object_or_404(TeleversementCV, pk=pk))
+
+    def patch(self, request, pk):
+        try:
+            decalage = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            return Response({"detail": "En-tête Upload-Offset manquant ou invalide"}, status=status.HTTP_400_BAD_REQUEST)
+        longueur = int(request.META.get('CONTENT_LENGTH') or 0)
+
+        with transaction.atomic():
+            # Verrou le temps de vérifier et de réserver le bloc seulement : la
+            # réception, aussi lente que le client, se fait hors transaction
+            televersement = get_object_or_404(TeleversementCV.objects.select_for_update(), pk=pk)
+            if televersement.statut != 'en_cours' or televersement.est_expire:
+                return Response({"detail": "Envoi terminé ou expiré"}, status=status.HTTP_409_CONFLICT)
+            maintenant = timezone.now()
+            if decalage != televersement.recu or (
+                televersement.reservation_bloc and televersement.reservation_bloc > maintenant
+            ):
+                # Décalage dépassé ou autre bloc en cours : le client reprend à
+                # partir de l'en-tête Upload-Offset renvoyé
+                return self.reponse(televersement, status.HTTP_409_CONFLICT)
+            if longueur > min(settings.CV_TAILLE_BLOC_MAX, televersement.taille - televersement.recu):
+                return Response(
+                    {"detail": f"Bloc trop grand (maximum {settings.CV_TAILLE_BLOC_MAX} octets, sans dépasser la taille annoncée)"},
+                    status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+                )
+            reservation = maintenant + timedelta(seconds=settings.CV_DUREE_RESERVATION_BLOC)
+            televersement.reservation_bloc = reservation
+            televersement.save(update_fields=['reservation_bloc'])
+
+        ecrits = ajouter_bloc(televersement, request.stream, longueur, limite=reservation) if longueur else 0
+
+        with transaction.atomic():
+            televersement = get_object_or_404(TeleversementCV.objects.select_for_update(), pk=pk)
+            if televersement.reservation_bloc != reservation:
+                # Réservation expirée puis reprise par un autre envoi : bloc abandonné
+                return self.reponse(televersement, status.HTTP_409_CONFLICT)
+            televersement.recu += ecrits
+            televersement.reservation_bloc = None
+            erreur = None
+            if televersement.recu == televersement.taille:
+                try:
+                    finaliser(televersement)
+                except EmpreinteIncorrecte as e:
+                    erreur = str(e)
+            televersement.save()
+
+        if erreur:
+            return Response({"detail": erreur, "recu": televersement.recu}, status=status.HTTP_400_BAD_REQUEST)
+        return self.reponse(televersement)
+
 class VueVerificationEmail(APIView):
     permission_classes = [AllowAny]
     throttle_classes = [AnonRateThrottle]
 
     def get(self, request, jeton):
-        try:
-            utilisateur = Utilisateur.objects.get(jeton_verification=jeton)
-        except Utilisateur.DoesNotExist:
+        # Recherche par empreinte sur un index unique
+        jeton_verification = JetonUtilisateur.objects.trouver(jeton, 'verification')
+        if jeton_verification is None:
             return redirect(f"{settings.FRONTEND_URL}/verification-email?status=invalid_token")
+        utilisateur = jeton_verification.utilisateur
 
-        if utilisateur.expiration_jeton_verification < timezone.now():
-            utilisateur.jeton_verification = get_random_string(64)
-            utilisateur.expiration_jeton_verification = timezone.now() + timedelta(hours=24)
-            utilisateur.save()
+        if jeton_verification.est_expire:
+            nouveau_jeton = utilisateur.generer_jeton_verification()
             
-            self.envoyer_email_verification(utilisateur)
+            self.envoyer_email_verification(utilisateur, nouveau_jeton)
             return redirect(f"{settings.FRONTEND_URL}/verification-email?status=expired&email={utilisateur.email}")
 
         if utilisateur.is_active:
             return redirect(f"{settings.FRONTEND_URL}/verification-email?status=deja_verifie&email={utilisateur.email}")
 
         # Activer le compte
-        utilisateur.is_active = True
-        utilisateur.jeton_verification = None
-        utilisateur.expiration_jeton_verification = None
-        utilisateur.save()
+        with transaction.atomic():
+            utilisateur.is_active = True
+            utilisateur.save(update_fields=['is_active'])
+            jeton_verification.delete()
 
         # Gestion du profil freelancer
         if utilisateur.type_utilisateur == 'freelancer':
@@ -117,9 +214,9 @@ class VueVerificationEmail(APIView):
 
         return redirect(f"{settings.FRONTEND_URL}/verification-email?status=success&email={utilisateur.email}")
 
-    def envoyer_email_verification(self, utilisateur):
+    def envoyer_email_verification(self, utilisateur, jeton):
         lien_verification = (
-            f"{settings.FRONTEND_URL}/verifier-email/{utilisateur.jeton_verification}/"
+            f"{settings.FRONTEND_URL}/verifier-email/{jeton}/"
         )
         
         sujet = "Nouveau lien de vérification"
@@ -138,12 +235,10 @@ class VueVerificationEmail(APIView):
         politique de confidentialité.
         """
         
-        send_mail(
+        mettre_en_file(
             sujet,
             message,
-            settings.EMAIL_HOST_USER,
-            [utilisateur.email],
-            fail_silently=False,
+            [utilisateur.email]
         )
 
     def creer_profil_freelancer(self, utilisateur):
@@ -205,12 +300,10 @@ class VueRenvoyerEmailVerification(APIView):
             )
         
         # Générer un nouveau jeton
-        utilisateur.jeton_verification = get_random_string(64)
-        utilisateur.expiration_jeton_verification = timezone.now() + timedelta(hours=24)
-        utilisateur.save()
+        jeton = utilisateur.generer_jeton_verification()
         
         lien_verification = request.build_absolute_uri(
-            reverse('verifier-email', kwargs={'jeton': utilisateur.jeton_verification})
+            reverse('verifier-email', kwargs={'jeton': jeton})
         )
         
         sujet = "Lien de vérification"
@@ -222,12 +315,10 @@ class VueRenvoyerEmailVerification(APIView):
         
         Ce lien est valable pendant 24 heures.
         """
-        send_mail(
+        mettre_en_file(
             sujet,
             message,
-            settings.EMAIL_HOST_USER,
-            [utilisateur.email],
-            fail_silently=False,
+            [utilisateur.email]
         )
         
         return Response({
@@ -278,12 +369,10 @@ class VueDemandeReinitialisation(APIView):
         Si vous n'êtes pas à l'origine de cette demande, veuillez ignorer cet email.
         """
         
-        send_mail(
+        mettre_en_file(
             sujet,
             message,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            fail_silently=False,
+            [user.email]
         )
         
         return Response(
@@ -297,32 +386,23 @@ class VueReinitialisationMotDePasse(APIView):
 
     def get(self, request, jeton):
         """Gère la requête GET quand l'utilisateur clique sur le lien dans l'email"""
-        try:
-            # Vérifie que le jeton existe et n'est pas expiré
-            user = Utilisateur.objects.get(
-                jeton_reinitialisation=jeton,
-                expiration_jeton_reinitialisation__gt=timezone.now()
-            )
-            
-            # Redirige vers la page frontend de réinitialisation avec le jeton
-            frontend_url = f"{settings.FRONTEND_URL}/mot-de-passe/reinitialiser/{jeton}"
-            return redirect(frontend_url)
-            
-        except Utilisateur.DoesNotExist:
+        # Vérifie que le jeton existe et n'est pas expiré
+        jeton_reinitialisation = JetonUtilisateur.objects.trouver(jeton, 'reinitialisation')
+        if jeton_reinitialisation is None or jeton_reinitialisation.est_expire:
             # Redirige vers la page frontend avec un statut d'erreur
             frontend_url = f"{settings.FRONTEND_URL}/mot-de-passe/reinitialiser/{jeton}?status=invalid_token"
             return redirect(frontend_url)
 
+        # Redirige vers la page frontend de réinitialisation avec le jeton
+        frontend_url = f"{settings.FRONTEND_URL}/mot-de-passe/reinitialiser/{jeton}"
+        return redirect(frontend_url)
+
     def post(self, request, jeton):
         """Gère la soumission du nouveau mot de passe"""
         nouveau_password = request.data.get('password')
         
-        try:
-            user = Utilisateur.objects.get(
-                jeton_reinitialisation=jeton,
-                expiration_jeton_reinitialisation__gt=timezone.now()
-            )
-        except Utilisateur.DoesNotExist:
+        jeton_reinitialisation = JetonUtilisateur.objects.trouver(jeton, 'reinitialisation')
+        if jeton_reinitialisation is None or jeton_reinitialisation.est_expire:
             return Response(
                 {'detail': 'Jeton invalide ou expiré', 'status': 'invalid_token'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -334,11 +414,12 @@ class VueReinitialisationMotDePasse(APIView):
                 code='password_required'
             )
         
-        # Mettre à jour le mot de passe
-        user.set_password(nouveau_password)
-        user.jeton_reinitialisation = None
-        user.expiration_jeton_reinitialisation = None
-        user.save()
+        # Mettre à jour le mot de passe et consommer le jeton
+        user = jeton_reinitialisation.utilisateur
+        with transaction.atomic():
+            user.set_password(nouveau_password)
+            user.save(update_fields=['password'])
+            jeton_reinitialisation.delete()
         
         # Envoyer une confirmation
         sujet = "Confirmation de réinitialisation de mot de passe"
@@ -350,12 +431,10 @@ class VueReinitialisationMotDePasse(APIView):
         Si vous n'êtes pas à l'origine de cette modification, veuillez nous contacter immédiatement.
         """
         
-        send_mail(
+        mettre_en_file(
             sujet,
             message,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            fail_silently=False,
+            [user.email]
         )
         
         return Response(
@@ -372,20 +451,21 @@ def create_notification(utilisateur, type_notif, content_object=None):
     )
 
 # Projet Views
-class ProjetListCreateView(generics.ListCreateAPIView):
+class ProjetListCreateView(LectureReplicaMixin, generics.ListCreateAPIView):
     serializer_class = ProjetSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CurseurPagination
 
     def get_queryset(self):
-        # Sous-requête pour les projets avec postulation acceptée
-        projets_avec_acceptation = Projet.objects.filter(
-            postulations__statut='accepte'
-        ).distinct()
-        
-        # Retourne tous les projets sauf ceux avec acceptation
-        return Projet.objects.exclude(
-            id__in=projets_avec_acceptation
-        ).order_by('-date_creation')
+        # Retourne tous les projets sauf ceux avec acceptation : la colonne
+        # dénormalisée postulation_acceptee est couverte par un index partiel
+        return Projet.objects.filter(
+            postulation_acceptee__isnull=True
+        ).select_related('client').order_by('-date_creation', '-id')
+
+    def list(self, request, *args, **kwargs):
+        calcul = super().list
+        return reponse_en_cache(request, 'projets', lambda: calcul(request, *args, **kwargs))
 
     def perform_create(self, serializer):
         if self.request.user.type_utilisateur != 'client':
@@ -393,18 +473,58 @@ class ProjetListCreateView(generics.ListCreateAPIView):
         projet = serializer.save(client=self.request.user)
         create_notification(self.request.user, 'projet_publie', projet)
 
+class ProjetRechercheView(LectureReplicaMixin, generics.ListAPIView):
+    """
+    Recherche dans les projets ouverts : texte (classé par pertinence sous
+    PostgreSQL), fourchette de budget, échéance et compétences requises.
+    """
+    serializer_class = ProjetRechercheSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DecalagePagination
+
+    def get_queryset(self):
+        parametres = RechercheProjetsSerializer(data=self.request.query_params)
+        parametres.is_valid(raise_exception=True)
+        filtres = parametres.validated_data
+
+        projets = Projet.objects.filter(postulation_acceptee__isnull=True).select_related('client')
+        # Fourchettes qui se chevauchent avec celle demandée
+        if 'budget_min' in filtres:
+            projets = projets.filter(budget_max__gte=filtres['budget_min'])
+        if 'budget_max' in filtres:
+            projets = projets.filter(budget_min__lte=filtres['budget_max'])
+        if 'deadline_apres' in filtres:
+            projets = projets.filter(deadline__gte=filtres['deadline_apres'])
+        if 'deadline_avant' in filtres:
+            projets = projets.filter(deadline__lte=filtres['deadline_avant'])
+        if filtres.get('competences'):
+            projets = filtrer_competences(projets, filtres['competences'])
+
+        if filtres.get('q'):
+            projets = rechercher_projets(projets, filtres['q'])
+            return projets.order_by('-rang', '-date_creation', '-id')
+        return projets.annotate(rang=Value(None, output_field=FloatField())).order_by('-date_creation', '-id')
+
+    def get(self, request, *args, **kwargs):
+        # Méthode propre à la vue pour porter sa documentation (swaggerDocumentation.py)
+        return super().get(request, *args, **kwargs)
+
 class ProjetDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Projet.objects.all()
+    queryset = Projet.objects.select_related('client')
     serializer_class = ProjetSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def retrieve(self, request, *args, **kwargs):
+        calcul = super().retrieve
+        return reponse_en_cache(request, 'projets', lambda: calcul(request, *args, **kwargs))
+
     def perform_update(self, serializer):
-        if self.request.user != self.get_object().client:
+        if self.request.user.pk != self.get_object().client_id:
             raise PermissionDenied("Vous ne pouvez modifier que vos propres projets")
         serializer.save()
 
     def perform_destroy(self, instance):
-        if self.request.user != instance.client:
+        if self.request.user.pk != instance.client_id:
             raise PermissionDenied("Vous ne pouvez supprimer que vos propres projets")
         # Suppression PHYSIQUE (pas de soft delete)
         instance.delete()  # Les postulations liées seront supprimées si on_delete=CASCADE
@@ -442,14 +562,14 @@ class AnnulerProjetView(APIView):
             )
 
         # Vérifier que l'utilisateur est bien le client propriétaire du projet
-        if request.user != projet.client:
+        if request.user.pk != projet.client_id:
             return Response(
                 {"detail": "Vous n'êtes pas autorisé à annuler ce projet"},
                 status=status.HTTP_403_FORBIDDEN
             )
 
         # Vérifier si le projet a une postulation acceptée
-        if Postulation.objects.filter(projet=projet, statut='accepte').exists():
+        if projet.est_attribue:
             return Response(
                 {"detail": "Vous ne pouvez plus annuler ce projet car vous avez sélectionné un freelancer"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -473,15 +593,23 @@ class ClientProjetsAvecPostulationsView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        # Moyenne des notes lue dans FreelancerRatingStats par simple jointure,
+        # une seule fois pour toutes les postulations
+        postulations = Postulation.objects.select_related('freelancer').annotate(
+            moyenne_notes=F('freelancer__statistiques_notes__moyenne_notes')
+        )
+
         # Récupère uniquement les projets du client connecté avec les relations nécessaires
-        return Projet.objects.filter(client=self.request.user).prefetch_related(
-            'postulations',
-            'postulations__freelancer',
-            'postulations__freelancer__evaluations'
+        return Projet.objects.filter(client_id=self.request.user.pk).prefetch_related(
+            Prefetch('postulations', queryset=postulations)
         )
 
     def list(self, request, *args, **kwargs):
         projets = self.get_queryset()
+        stockage = Utilisateur._meta.get_field('photo_profil').storage
+
+        def construire_url(nom):
+            return request.build_absolute_uri(stockage.url(nom))
         
         result = []
         for projet in projets:
@@ -496,15 +624,11 @@ class ClientProjetsAvecPostulationsView(generics.ListAPIView):
             for postulation in projet.postulations.all():
                 freelancer = postulation.freelancer
                 
-                # Calcul de la moyenne des notes
-                moyenne_notes = freelancer.evaluations.aggregate(
-                    moyenne=Avg('note')
-                )['moyenne'] or 0
+                # Moyenne des notes déjà annotée par get_queryset
+                moyenne_notes = postulation.moyenne_notes or 0
 
-                # Construction de l'URL du CV si il existe
-                cv_url = None
-                if freelancer.cv:
-                    cv_url = request.build_absolute_uri(freelancer.cv.url)
+                # URL signée et temporaire : les CV ne sont pas publics
+                cv_url = url_cv_signee(freelancer.cv.name, request)
 
                 postulation_data = {
                     'id': postulation.id,
@@ -517,6 +641,7 @@ class ClientProjetsAvecPostulationsView(generics.ListAPIView):
                         'email': freelancer.email,
                         'numero_telephone': freelancer.numero_telephone,
                         'photo_profil': request.build_absolute_uri(freelancer.photo_profil.url) if freelancer.photo_profil else None,
+                        'photo_derives': urls_derives(freelancer.photo_profil.name, freelancer.photo_derives, construire_url),
                         'cv': cv_url,  # Ajout du champ CV
                         'specialisation': freelancer.specialisation,
                         'intitule_poste': freelancer.intitule_poste,  # Ajout de l'intitulé de poste
@@ -536,8 +661,12 @@ class PostulationCreateView(generics.CreateAPIView):
     serializer_class = CreatePostulationSerializer
     permission_classes = [permissions.IsAuthenticated]
     def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Le client est chargé avec le projet : notification et réponse n'y reviennent pas
         try:
-            projet = Projet.objects.get(pk=kwargs['projet_id'])
+            projet = Projet.objects.select_related('client').get(pk=kwargs['projet_id'])
         except Projet.DoesNotExist:
             return Response(
                 {"detail": "Projet non trouvé ou non actif"},
@@ -546,30 +675,33 @@ class PostulationCreateView(generics.CreateAPIView):
         
         # Vérification que l'utilisateur est bien un freelancer
         try:
-            freelancer = Freelancer.objects.get(utilisateur_ptr=request.user)
+            freelancer = Freelancer.objects.only('nom_complet', 'email').get(pk=request.user.pk)
         except Freelancer.DoesNotExist:
             return Response(
                 {"detail": "Seuls les freelancers peuvent postuler à des projets"},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if Postulation.objects.filter(projet=projet, freelancer=freelancer).exists():
+        # Insertion directe : la contrainte unique (projet, freelancer) tranche entre
+        # deux envois simultanés, sans vérification préalable sujette aux courses
+        try:
+            with transaction.atomic():
+                postulation = Postulation.objects.create(
+                    projet=projet,
+                    freelancer=freelancer,
+                    message=serializer.validated_data['message']
+                )
+                Notification.creer_en_lot([Notification(
+                    utilisateur_id=projet.client_id,
+                    type_notification='nouvelle_candidature',
+                    content_object=postulation
+                )])
+        except IntegrityError:
             return Response(
                 {"detail": "Vous avez déjà postulé à ce projet"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        
-        postulation = Postulation.objects.create(
-            projet=projet,
-            freelancer=freelancer,  # Utilisation de l'instance Freelancer
-            message=serializer.validated_data['message']
-        )
-        
-        create_notification(projet.client, 'nouvelle_candidature', postulation)
-        
         headers = self.get_success_headers(serializer.data)
         return Response(
             PostulationSerializer(postulation).data,
@@ -577,37 +709,23 @@ class PostulationCreateView(generics.CreateAPIView):
             headers=headers
         )
 
-class PostulationAcceptView(generics.UpdateAPIView):
-    swagger_schema = None
-    queryset = Postulation.objects.all()
-    serializer_class = PostulationSerializer
-    permission_classes = [IsAuthenticated]
-
-    def patch(self, request, *args, **kwargs):
-        postulation = self.get_object()
-        
-        # Vérification des permissions
-        if request.user != postulation.projet.client:
-            raise PermissionDenied("Seul le client peut accepter une postulation")
-        
-        # Mise à jour du statut
-        postulation.statut = 'accepte'
-        postulation.save()
-        
-        # Notification au freelancer
-        Notification.objects.create(
-            utilisateur=postulation.freelancer,
-            type_notification='postulation_acceptee',
-            content_object=postulation
-        )
-        
-        # Emails de confirmation
-        self.envoyer_emails_confirmation(postulation)
-        
-        return Response(
-            {"detail": "Postulation acceptée avec succès"},
-            status=status.HTTP_200_OK
-        )
+class DecisionPostulationMixin:
+    """Notifications et emails qui suivent l'acceptation ou le refus de candidatures."""
+    TYPES_NOTIFICATION = {
+        'accepte': 'postulation_acceptee',
+        'refuse': 'postulation_refusee',
+    }
+
+    def notifier(self, postulations):
+        # Une insertion groupée, quel que soit le nombre de candidats
+        Notification.creer_en_lot([
+            Notification(
+                utilisateur_id=postulation.freelancer_id,
+                type_notification=self.TYPES_NOTIFICATION[postulation.statut],
+                content_object=postulation
+            )
+            for postulation in postulations
+        ])
 
     def envoyer_emails_confirmation(self, postulation):
         # Données pour les emails
@@ -637,12 +755,10 @@ class PostulationAcceptView(generics.UpdateAPIView):
 
 📌 Après vérification, le responsable supprimera tout utilisateur impliqué dans une fraude.
         """
-        send_mail(
+        mettre_en_file(
             sujet_client,
             message_client,
-            settings.EMAIL_HOST_USER,
-            [client_email],
-            fail_silently=False,
+            [client_email]
         )
 
         # Email au freelancer
@@ -663,17 +779,15 @@ class PostulationAcceptView(generics.UpdateAPIView):
 
 📌 Après vérification, toute fraude confirmée entraînera la suppression définitive de l'utilisateur responsable.
         """
-        send_mail(
+        mettre_en_file(
             sujet_freelancer,
             message_freelancer,
-            settings.EMAIL_HOST_USER,
-            [freelancer_email],
-            fail_silently=False,
+            [freelancer_email]
         )
 
-class PostulationRefuseView(generics.UpdateAPIView):
+class PostulationAcceptView(DecisionPostulationMixin, generics.UpdateAPIView):
     swagger_schema = None
-    queryset = Postulation.objects.all()
+    queryset = Postulation.objects.select_related('projet__client', 'freelancer')
     serializer_class = PostulationSerializer
     permission_classes = [IsAuthenticated]
 
@@ -681,25 +795,103 @@ class PostulationRefuseView(generics.UpdateAPIView):
         postulation = self.get_object()
         
         # Vérification des permissions
-        if request.user != postulation.projet.client:
-            raise PermissionDenied("Seul le client peut refuser une postulation")
+        if request.user.pk != postulation.projet.client_id:
+            raise PermissionDenied("Seul le client peut accepter une postulation")
         
-        # Mise à jour du statut
-        postulation.statut = 'refuse'
-        postulation.save()
+        # Acceptation, refus des autres candidatures en attente et notifications
+        # dans une seule transaction
+        try:
+            with transaction.atomic():
+                _, modifiees = Postulation.decider(
+                    postulation.projet_id,
+                    acceptee=postulation.pk,
+                    refuser_autres=True
+                )
+                self.notifier(modifiees)
+                # Emails de confirmation
+                if any(p.pk == postulation.pk for p in modifiees):
+                    self.envoyer_emails_confirmation(postulation)
+        except DjangoValidationError as e:
+            return Response(
+                {"detail": e.messages[0]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Notification au freelancer
-        Notification.objects.create(
-            utilisateur=postulation.freelancer,
-            type_notification='postulation_refusee',
-            content_object=postulation
+        return Response(
+            {"detail": "Postulation acceptée avec succès"},
+            status=status.HTTP_200_OK
         )
+
+class PostulationRefuseView(DecisionPostulationMixin, generics.UpdateAPIView):
+    swagger_schema = None
+    queryset = Postulation.objects.select_related('projet')
+    serializer_class = PostulationSerializer
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, *args, **kwargs):
+        postulation = self.get_object()
+        
+        # Vérification des permissions
+        if request.user.pk != postulation.projet.client_id:
+            raise PermissionDenied("Seul le client peut refuser une postulation")
+        
+        # Mise à jour du statut, libération éventuelle du projet et notification
+        with transaction.atomic():
+            _, modifiees = Postulation.decider(postulation.projet_id, refusees=[postulation.pk])
+            self.notifier(modifiees)
         
         return Response(
             {"detail": "Postulation refusée avec succès"},
             status=status.HTTP_200_OK
         )
 
+class PostulationsDecisionView(DecisionPostulationMixin, generics.GenericAPIView):
+    """
+    Décisions groupées sur les candidatures d'un projet du client connecté :
+    {"accepter": id, "refuser": [ids], "refuser_autres": true}. Statuts,
+    projet, notifications et emails sont écrits dans une seule transaction,
+    par lots, sans aller-retour par candidature.
+    """
+    serializer_class = DecisionsPostulationsSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, projet_id):
+        projet = get_object_or_404(Projet.objects.only('client_id'), pk=projet_id)
+        if request.user.pk != projet.client_id:
+            raise PermissionDenied("Seul le client peut décider des candidatures de ce projet")
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        decisions = serializer.validated_data
+        acceptee = decisions.get('accepter')
+
+        try:
+            with transaction.atomic():
+                _, modifiees = Postulation.decider(
+                    projet.pk,
+                    acceptee=acceptee,
+                    refusees=decisions['refuser'],
+                    refuser_autres=acceptee is not None and decisions['refuser_autres']
+                )
+                self.notifier(modifiees)
+                if any(p.pk == acceptee for p in modifiees):
+                    self.envoyer_emails_confirmation(
+                        Postulation.objects.select_related('projet__client', 'freelancer').get(pk=acceptee)
+                    )
+        except DjangoValidationError as e:
+            return Response(
+                {"detail": e.messages[0]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            {
+                "acceptee": acceptee,
+                "refusees": sorted(p.pk for p in modifiees if p.statut == 'refuse'),
+            },
+            status=status.HTTP_200_OK
+        )
+
 # Evaluation Views
 class EvaluationCreateUpdateView(generics.CreateAPIView):
     swagger_schema = None
@@ -715,7 +907,7 @@ class EvaluationCreateUpdateView(generics.CreateAPIView):
         
         # Vérification que le client a un projet accepté avec ce freelancer
         postulation = Postulation.objects.filter(
-            projet__client=request.user,
+            projet__client_id=request.user.pk,
             freelancer=freelancer,
             statut='accepte'
         ).first()
@@ -724,25 +916,30 @@ class EvaluationCreateUpdateView(generics.CreateAPIView):
             raise PermissionDenied("Vous ne pouvez évaluer que les freelancers que vous avez engagés")
         
         # Validation de la note
-        note = request.data.get('note')
-        if not note or not (1 <= int(note) <= 5):
+        try:
+            note = int(request.data.get('note'))
+        except (TypeError, ValueError):
+            note = None
+        if not note or not (1 <= note <= 5):
             return Response(
                 {"note": "Une note valide entre 1 et 5 est requise"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Création ou mise à jour de l'évaluation
-        evaluation, created = Evaluation.objects.update_or_create(
-            freelancer=freelancer,
-            defaults={'note': note}
-        )
-        
-        # Création de la notification
-        Notification.objects.create(
-            utilisateur=freelancer,
-            type_notification='evaluation_recue',
-            content_object=evaluation
-        )
+        # Création ou mise à jour de l'évaluation ; Evaluation.save() met à jour
+        # FreelancerRatingStats dans la même transaction
+        with transaction.atomic():
+            evaluation, created = Evaluation.objects.update_or_create(
+                freelancer=freelancer,
+                defaults={'note': note}
+            )
+            
+            # Création de la notification
+            Notification.objects.create(
+                utilisateur=freelancer,
+                type_notification='evaluation_recue',
+                content_object=evaluation
+            )
         
         return Response(
             EvaluationSerializer(evaluation).data,
@@ -754,15 +951,23 @@ class FreelancerAccepteView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, projet_id):
-        projet = get_object_or_404(Projet, pk=projet_id)
+        # Clé par utilisateur : seul le client du projet obtient une réponse 200
+        return reponse_en_cache(
+            request, 'freelancer_accepte',
+            lambda: self.calculer(request, projet_id),
+            par_utilisateur=True
+        )
+
+    def calculer(self, request, projet_id):
+        projet = get_object_or_404(
+            Projet.objects.select_related('postulation_acceptee__freelancer'),
+            pk=projet_id
+        )
         
-        if request.user != projet.client:
+        if request.user.pk != projet.client_id:
             raise PermissionDenied("Vous ne pouvez voir que les freelancers de vos projets")
         
-        postulation = Postulation.objects.filter(
-            projet=projet,
-            statut='accepte'
-        ).first()
+        postulation = projet.postulation_acceptee
         
         if not postulation:
             return Response(
@@ -773,23 +978,152 @@ class FreelancerAccepteView(generics.RetrieveAPIView):
         serializer = FreelancerSerializer(postulation.freelancer)
         return Response(serializer.data)
 
+# Recommandations par compétences
+def charger_projets_ouverts():
+    return Projet.objects.filter(postulation_acceptee__isnull=True).values_list(
+        'pk', 'competences_requises'
+    ).iterator(chunk_size=5000)
+
+def charger_freelancers_actifs():
+    return Freelancer.objects.filter(is_active=True).values_list('pk', 'competences').iterator(chunk_size=5000)
+
+def limite_recommandations(request):
+    try:
+        limite = int(request.query_params.get('limite', settings.PAGINATION_PAGE_SIZE))
+    except ValueError:
+        raise ValidationError({'limite': "Doit être un entier"})
+    return max(1, min(limite, settings.PAGINATION_MAX_PAGE_SIZE))
+
+class ProjetsRecommandesView(LectureReplicaMixin, APIView):
+    """
+    Projets ouverts les mieux couverts par les compétences du freelancer connecté
+    (part des compétences requises qu'il possède), hors projets déjà postulés.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if request.user.type_utilisateur != 'freelancer':
+            raise PermissionDenied("Seuls les freelancers reçoivent des recommandations de projets")
+
+        competences = Freelancer.objects.filter(pk=request.user.pk).values_list('competences', flat=True).first()
+        deja_postules = set(
+            Postulation.objects.filter(freelancer_id=request.user.pk).values_list('projet_id', flat=True)
+        )
+        index = obtenir_index('correspondance_projets', charger_projets_ouverts)
+        meilleurs = index.meilleurs(
+            competences or [],
+            limite_recommandations(request),
+            cle=lambda communes, taille_requete, taille_projet: (communes / taille_projet, communes),
+            exclure=deja_postules,
+        )
+
+        projets = Projet.objects.select_related('client').in_bulk([pk for pk, _, _ in meilleurs])
+        resultats = []
+        for pk, score, communes in meilleurs:
+            projet = projets.get(pk)
+            # L'index peut avoir quelques secondes de retard
+            if projet is None or projet.est_attribue:
+                continue
+            resultats.append({
+                **ProjetSerializer(projet).data,
+                'score': round(score, 3),
+                'competences_communes': communes,
+            })
+        return Response(resultats)
+
+class FreelancersRecommandesView(LectureReplicaMixin, APIView):
+    """
+    Freelancers actifs qui couvrent le mieux les compétences requises d'un projet
+    du client connecté ; à couverture égale, les profils les plus ciblés d'abord.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, projet_id):
+        projet = get_object_or_404(Projet.objects.only('client_id', 'competences_requises'), pk=projet_id)
+        if request.user.pk != projet.client_id:
+            raise PermissionDenied("Vous ne pouvez voir que les recommandations de vos projets")
+
+        index = obtenir_index('correspondance_freelancers', charger_freelancers_actifs)
+        meilleurs = index.meilleurs(
+            projet.competences_requises,
+            limite_recommandations(request),
+            cle=lambda communes, taille_requete, taille_profil: (
+                communes / taille_requete,
+                communes / (taille_requete + taille_profil - communes),
+            ),
+        )
+
+        freelancers = Freelancer.objects.in_bulk([pk for pk, _, _ in meilleurs])
+        resultats = []
+        for pk, score, communes in meilleurs:
+            freelancer = freelancers.get(pk)
+            if freelancer is None:
+                continue
+            resultats.append({
+                **FreelancerRecommandeSerializer(freelancer).data,
+                'score': round(score, 3),
+                'competences_communes': communes,
+            })
+        return Response(resultats)
+
 # Notification Views
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(LectureReplicaMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CurseurPagination
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return Notification.objects.none()  # Retourne un queryset vide pour Swagger
         return Notification.objects.filter(
-            utilisateur=self.request.user
+            utilisateur_id=self.request.user.pk
         ).order_by('-date_creation')
 
 class NotificationDestroyView(generics.DestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Notification.objects.filter(utilisateur=self.request.user)
+        return Notification.objects.filter(utilisateur_id=self.request.user.pk)
+
+class NotificationNonVuesCountView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # Couvert par l'index partiel notif_non_vue_idx
+        non_vues = Notification.objects.filter(
+            utilisateur_id=request.user.pk,
+            est_vue=False
+        ).count()
+        return Response({'non_vues': non_vues}, status=status.HTTP_200_OK)
+
+class NotificationMarquerVueView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, pk):
+        mises_a_jour = Notification.objects.filter(
+            pk=pk,
+            utilisateur_id=request.user.pk
+        ).update(est_vue=True)
+
+        if not mises_a_jour:
+            return Response(
+                {"detail": "Notification non trouvée"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({"detail": "Notification marquée comme vue"}, status=status.HTTP_200_OK)
+
+class NotificationsMarquerToutesVuesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        mises_a_jour = Notification.objects.filter(
+            utilisateur_id=request.user.pk,
+            est_vue=False
+        ).update(est_vue=True)
+        return Response(
+            {"detail": "Notifications marquées comme vues", "mises_a_jour": mises_a_jour},
+            status=status.HTTP_200_OK
+        )
 
 #Supprimer un projet forcement en commencant par tous ces postulations utiliser dans le processus de termination d'un projet
 class ProjetDeleteView(generics.DestroyAPIView):
@@ -801,7 +1135,7 @@ class ProjetDeleteView(generics.DestroyAPIView):
         projet = get_object_or_404(Projet, pk=projet_id)
         
         # Vérifier que l'utilisateur est bien le client propriétaire du projet
-        if request.user != projet.client:
+        if request.user.pk != projet.client_id:
             return Response(
                 {"detail": "Vous n'êtes pas autorisé à supprimer ce projet"},
                 status=status.HTTP_403_FORBIDDEN
@@ -821,24 +1155,32 @@ class ProjetDeleteView(generics.DestroyAPIView):
             status=status.HTTP_204_NO_CONTENT
         )
         
-class AdminStatisticsView(APIView):
+class AdminStatisticsView(LectureReplicaMixin, APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
+        return reponse_en_cache(request, 'statistiques', self.calculer)
+
+    def calculer(self):
         try:
-            # Compter les différents types d'utilisateurs en filtrant par type_utilisateur
-            clients_count = Utilisateur.objects.filter(type_utilisateur='client').count()
-            freelancers_count = Utilisateur.objects.filter(type_utilisateur='freelancer').count()
-            admins_count = Utilisateur.objects.filter(type_utilisateur='administrateur').count()
-            
-            # Compter les projets
-            projects_count = Projet.objects.count()
+            if settings.STATISTIQUES_COMPTEURS:
+                # Totaux tenus à jour par les signaux : une lecture de quelques lignes
+                totaux = dict(CompteurStatistique.objects.values_list('cle', 'valeur'))
+            else:
+                # Un seul aller-retour : comptage groupé par type + comptage des projets
+                utilisateurs = Utilisateur.objects.order_by().annotate(
+                    cle=Concat(Value('utilisateurs:'), 'type_utilisateur')
+                ).values('cle').annotate(n=Count('pk'))
+                projets = Projet.objects.order_by().annotate(
+                    cle=Value('projets')
+                ).values('cle').annotate(n=Count('pk'))
+                totaux = {ligne['cle']: ligne['n'] for ligne in utilisateurs.union(projets, all=True)}
 
             statistics = {
-                'clients': clients_count,
-                'freelancers': freelancers_count,
-                'admins': admins_count,
-                'projects': projects_count
+                'clients': totaux.get('utilisateurs:client', 0),
+                'freelancers': totaux.get('utilisateurs:freelancer', 0),
+                'admins': totaux.get('utilisateurs:administrateur', 0),
+                'projects': totaux.get('projets', 0)
             }
 
             return Response(statistics, status=status.HTTP_200_OK)
@@ -848,39 +1190,169 @@ class AdminStatisticsView(APIView):
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class AdminStatistiquesEvolutionView(LectureReplicaMixin, APIView):
+    """
+    Séries temporelles du tableau de bord (inscriptions, projets, postulations,
+    taux d'acceptation) par jour, semaine ou mois, lues dans la table de
+    cumuls StatistiqueQuotidienne.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    PERIODES = {'jour': None, 'semaine': TruncWeek, 'mois': TruncMonth}
+
+    def get(self, request):
+        periode = request.query_params.get('periode', 'jour')
+        if periode not in self.PERIODES:
+            raise ValidationError({'periode': f"Valeurs possibles : {', '.join(self.PERIODES)}"})
+        try:
+            jours = min(int(request.query_params.get('jours', 30)), 366)
+        except ValueError:
+            raise ValidationError({'jours': "Doit être un entier"})
+        if jours < 1:
+            raise ValidationError({'jours': "Doit être supérieur ou égal à 1"})
+
+        debut = timezone.localdate() - timedelta(days=jours - 1)
+        troncature = self.PERIODES[periode]
+        lignes = StatistiqueQuotidienne.objects.filter(jour__gte=debut).annotate(
+            periode=troncature('jour') if troncature else F('jour')
+        ).values('periode', 'indicateur').annotate(total=Sum('valeur')).order_by('periode')
+
+        series = {}
+        for ligne in lignes:
+            serie = series.setdefault(ligne['periode'], {
+                indicateur: 0 for indicateur, _ in StatistiqueQuotidienne.INDICATEUR_CHOICES
+            })
+            serie[ligne['indicateur']] = ligne['total']
+
+        resultats = []
+        for debut_periode, serie in series.items():
+            taux = serie['acceptations'] / serie['postulations'] if serie['postulations'] else None
+            resultats.append({'periode': debut_periode, **serie, 'taux_acceptation': taux})
+        return Response(resultats)
             
 User = get_user_model()
 
-class ListeUtilisateursNonAdminView(APIView):
+class Echo:
+    """Pseudo-fichier pour csv.writer : renvoie la ligne au lieu de l'écrire."""
+    def write(self, valeur):
+        return valeur
+
+def cellule_csv(valeur):
+    """Neutralise les cellules qu'un tableur interpréterait comme une formule."""
+    if isinstance(valeur, str) and valeur.startswith(('=', '+', '-', '@', '\t', '\r')):
+        return "'" + valeur
+    return valeur
+
+class ListeUtilisateursNonAdminView(LectureReplicaMixin, APIView):
     """
-    Vue qui retourne les informations de base de tous les utilisateurs sauf les administrateurs
+    Vue qui retourne les informations de base de tous les utilisateurs sauf les administrateurs.
+
+    Filtres : ?type=client|freelancer, ?email=<préfixe> et ?competences=a,b
+    (freelancers ayant toutes ces compétences). La liste est paginée
+    par curseur si `cursor` ou `page_size` est fourni ; ?export=ndjson|csv
+    renvoie toute la sélection en flux, lue par lots, à mémoire constante.
     """
-    
-    def get(self, request, format=None):
-        Utilisateur = get_user_model()
-        
-        # Récupérer tous les utilisateurs sauf les administrateurs
+    CHAMPS = ('id', 'nom_complet', 'email', 'type_utilisateur', 'photo_profil', 'photo_derives', 'numero_telephone')
+    TYPES = ('client', 'freelancer')
+    EXPORTS = ('ndjson', 'csv')
+    TAILLE_LOT_EXPORT = 2000
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_queryset(self, request):
         utilisateurs = Utilisateur.objects.exclude(type_utilisateur='administrateur')
-        
-        # Préparer les données à retourner
-        data = []
-        for utilisateur in utilisateurs:
-            # Construire l'URL de la photo de profil si elle existe
-            photo_profil_url = None
-            if utilisateur.photo_profil:
-                photo_profil_url = request.build_absolute_uri(utilisateur.photo_profil.url)
-            
-            data.append({
-                'id': utilisateur.id,
-                'nom_complet': utilisateur.nom_complet,
-                'email': utilisateur.email,
-                'type_utilisateur': utilisateur.get_type_utilisateur_display(),
-                'photo_profil': photo_profil_url,
-                'numero_telephone': utilisateur.numero_telephone,
-            })
-        
+
+        type_utilisateur = request.query_params.get('type')
+        if type_utilisateur:
+            if type_utilisateur not in self.TYPES:
+                raise ValidationError({'type': f"Valeurs possibles : {', '.join(self.TYPES)}"})
+            utilisateurs = utilisateurs.filter(type_utilisateur=type_utilisateur)
+
+        email = request.query_params.get('email')
+        if email:
+            utilisateurs = utilisateurs.filter(email__istartswith=email)
+
+        competences = request.query_params.get('competences')
+        if competences:
+            utilisateurs = filtrer_competences(
+                utilisateurs.filter(type_utilisateur='freelancer'),
+                competences,
+                champ='freelancer__competences_normalisees',
+            )
+
+        return utilisateurs
+
+    def get_formateur(self, request):
+        # Calculés une fois par requête plutôt qu'à chaque ligne
+        racine = request.build_absolute_uri('/')
+        libelles = dict(Utilisateur.TYPE_UTILISATEUR_CHOICES)
+        stockage = Utilisateur._meta.get_field('photo_profil').storage
+
+        def construire_url(nom):
+            return urljoin(racine, stockage.url(nom))
+
+        def formater(pk, nom_complet, email, type_utilisateur, photo_profil, photo_derives, numero_telephone):
+            return {
+                'id': pk,
+                'nom_complet': nom_complet,
+                'email': email,
+                'type_utilisateur': libelles.get(type_utilisateur, type_utilisateur),
+                'photo_profil': construire_url(photo_profil) if photo_profil else None,
+                # Vignettes : ce que la liste doit afficher plutôt que l'original
+                'photo_derives': urls_derives(photo_profil, photo_derives, construire_url),
+                'numero_telephone': numero_telephone,
+            }
+        return formater
+
+    def get(self, request, format=None):
+        utilisateurs = self.get_queryset(request)
+        formater = self.get_formateur(request)
+
+        export = request.query_params.get('export')
+        if export:
+            if export not in self.EXPORTS:
+                raise ValidationError({'export': f"Valeurs possibles : {', '.join(self.EXPORTS)}"})
+            # Le flux est consommé après la fin de la vue : l'alias de lecture est fixé ici
+            utilisateurs = utilisateurs.using(router.db_for_read(Utilisateur))
+            lignes = (
+                formater(*valeurs)
+                for valeurs in utilisateurs.order_by('pk').values_list(*self.CHAMPS).iterator(
+                    chunk_size=self.TAILLE_LOT_EXPORT
+                )
+            )
+            return self.exporter(export, lignes)
+
+        utilisateurs = utilisateurs.only(*self.CHAMPS, 'date_creation').order_by('-date_creation', '-id')
+        pagination = CurseurPagination()
+        page = pagination.paginate_queryset(utilisateurs, request, view=self)
+        data = [
+            formater(
+                u.pk, u.nom_complet, u.email, u.type_utilisateur,
+                u.photo_profil.name, u.photo_derives, u.numero_telephone
+            )
+            for u in (utilisateurs if page is None else page)
+        ]
+        if page is not None:
+            return pagination.get_paginated_response(data)
         return Response(data, status=status.HTTP_200_OK)
 
+    def exporter(self, export, lignes):
+        if export == 'ndjson':
+            return StreamingHttpResponse(
+                (json.dumps(ligne, ensure_ascii=False) + '\n' for ligne in lignes),
+                content_type='application/x-ndjson'
+            )
+
+        ecrivain = csv.writer(Echo())
+        entete = ['id', 'nom_complet', 'email', 'type_utilisateur', 'photo_profil', 'numero_telephone']
+        contenu = itertools.chain(
+            [ecrivain.writerow(entete)],
+            (ecrivain.writerow([cellule_csv(ligne[champ]) for champ in entete]) for ligne in lignes)
+        )
+        reponse = StreamingHttpResponse(contenu, content_type='text/csv; charset=utf-8')
+        reponse['Content-Disposition'] = 'attachment; filename="utilisateurs.csv"'
+        return reponse
+
 # Initialisation du logger
 logger = logging.getLogger(__name__)
 